@@ -0,0 +1,46 @@
+"""Per-turn setup cost of BookingAgent: rebuilding the executor vs reusing it.
+
+Runs offline; the Gemini client is only constructed, never called.
+
+    python -m benchmarks.bench_agent_setup --turns 200
+"""
+import argparse
+import statistics
+import time
+
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from bookinggpt.agent.booking_agent import BookingAgent
+
+
+def time_per_turn(fn, turns):
+    samples = []
+    for _ in range(turns):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    print(f"{label:<24} p50={statistics.median(samples) * 1e6:9.1f}us "
+          f"mean={statistics.fmean(samples) * 1e6:9.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    args = parser.parse_args()
+
+    llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key="offline", temperature=0.3)
+    agent = BookingAgent(llm)
+    agent.verbose = False
+
+    report("rebuild every turn", time_per_turn(agent.build_executor, args.turns))
+    agent.agent_executor  # warm the cache
+    report("cached executor", time_per_turn(lambda: agent.agent_executor, args.turns))
+    print(f"executor builds: {agent.setup_stats['builds']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Concurrent turn throughput of call_agent (threads) vs acall_agent (one event loop).
+
+Uses a scripted chat model with simulated latency, so it runs offline and
+measures how many conversations each path keeps in flight.
+
+    python -m benchmarks.bench_async --conversations 200 --turns 3 --latency 0.2
+"""
+import argparse
+import asyncio
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+
+
+def make_agent(latency):
+    agent = BookingAgent(ScriptedChatModel(latency=latency))
+    agent.verbose = False
+    return agent
+
+
+def run_conversation_sync(agent, session_id, turns):
+    for turn in range(turns):
+        agent.call_agent(f"Hi, turn {turn}", session_id=session_id)
+
+
+async def run_conversation_async(agent, session_id, turns):
+    for turn in range(turns):
+        await agent.acall_agent(f"Hi, turn {turn}", session_id=session_id)
+
+
+def bench_sync(args):
+    agent = make_agent(args.latency)
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.threads) as pool:
+        for i in range(args.conversations):
+            pool.submit(run_conversation_sync, agent, f"s{i}", args.turns)
+    return time.perf_counter() - start
+
+
+def bench_async(args):
+    agent = make_agent(args.latency)
+
+    async def run_all():
+        await asyncio.gather(*(
+            run_conversation_async(agent, f"s{i}", args.turns) for i in range(args.conversations)
+        ))
+
+    start = time.perf_counter()
+    asyncio.run(run_all())
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--conversations", type=int, default=200)
+    parser.add_argument("--turns", type=int, default=3)
+    parser.add_argument("--latency", type=float, default=0.2, help="simulated LLM latency in seconds")
+    parser.add_argument("--threads", type=int, default=16, help="worker threads for the sync path")
+    args = parser.parse_args()
+
+    total_turns = args.conversations * args.turns
+    for label, bench in ((f"sync ({args.threads} threads)", bench_sync), ("async (1 loop)", bench_async)):
+        elapsed = bench(args)
+        print(f"{label:<20} {total_turns} turns in {elapsed:6.2f}s -> {total_turns / elapsed:8.1f} turns/s")
+
+
+if __name__ == "__main__":
+    main()
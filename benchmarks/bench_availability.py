@@ -0,0 +1,80 @@
+"""Free-slot search on dense calendars: the legacy per-slot scan vs AvailabilityEngine.
+
+    python -m benchmarks.bench_availability --days 90 --events-per-day 200 --slot 30 --step 5
+"""
+import argparse
+import datetime
+import random
+import time
+from zoneinfo import ZoneInfo
+
+from bookinggpt.availability.engine import AvailabilityEngine
+
+TZ = "Asia/Ho_Chi_Minh"
+
+
+def legacy_available_slots(busy_slots, start, end, slot_minutes, step_minutes):
+    """The original AvailableSlotsTool loop (every slot against every busy interval), with the
+    closing-time check the engine applies so both return the same slots."""
+    available_slots = {}
+    current_date = start.date()
+    while current_date <= end.date():
+        if current_date.weekday() != 6:
+            day_start = datetime.datetime.combine(current_date, datetime.time(9, 0)).replace(tzinfo=ZoneInfo(TZ))
+            day_end = datetime.datetime.combine(current_date, datetime.time(18, 0)).replace(tzinfo=ZoneInfo(TZ))
+            available_slots[current_date] = []
+            current_slot = day_start
+            while current_slot + datetime.timedelta(minutes=slot_minutes) <= day_end:
+                slot_end = current_slot + datetime.timedelta(minutes=slot_minutes)
+                if all(slot_end <= busy_start or current_slot >= busy_end for busy_start, busy_end in busy_slots):
+                    available_slots[current_date].append(current_slot)
+                current_slot += datetime.timedelta(minutes=step_minutes)
+        current_date += datetime.timedelta(days=1)
+    return available_slots
+
+
+def dense_calendar(start, days, events_per_day, seed=1):
+    rng = random.Random(seed)
+    tz = ZoneInfo(TZ)
+    busy = []
+    for offset in range(days):
+        day = start.date() + datetime.timedelta(days=offset)
+        opening = datetime.datetime.combine(day, datetime.time(9, 0), tzinfo=tz)
+        for _ in range(events_per_day):
+            begin = opening + datetime.timedelta(minutes=rng.randrange(0, 9 * 60, 5))
+            busy.append((begin, begin + datetime.timedelta(minutes=rng.choice([5, 10, 15]))))
+    return busy
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=90)
+    parser.add_argument("--events-per-day", type=int, default=200)
+    parser.add_argument("--slot", type=int, default=30)
+    parser.add_argument("--step", type=int, default=5)
+    parser.add_argument("--legacy-days", type=int, default=7,
+                        help="days to run the quadratic legacy loop over (it is slow)")
+    args = parser.parse_args()
+
+    start = datetime.datetime(2026, 1, 5, tzinfo=ZoneInfo(TZ))
+    engine = AvailabilityEngine(slot_minutes=args.slot, step_minutes=args.step)
+
+    for label, days in (("legacy range", args.legacy_days), ("full range", args.days)):
+        busy = dense_calendar(start, days, args.events_per_day)
+        end = start + datetime.timedelta(days=days - 1)
+        timings = {}
+        if days == args.legacy_days:
+            began = time.perf_counter()
+            expected = legacy_available_slots(busy, start, end, args.slot, args.step)
+            timings["legacy"] = time.perf_counter() - began
+        began = time.perf_counter()
+        result = engine.available_slots(busy, start, end)
+        timings["engine"] = time.perf_counter() - began
+        if days == args.legacy_days:
+            assert result == expected, "engine and legacy loop disagree"
+        summary = "  ".join(f"{name}={seconds * 1000:9.1f}ms" for name, seconds in timings.items())
+        print(f"{label:<13} {days:4d} days x {args.events_per_day} events/day: {summary}")
+
+
+if __name__ == "__main__":
+    main()
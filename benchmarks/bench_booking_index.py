@@ -0,0 +1,63 @@
+"""Cancellation lookup at scale: SQLite booking index vs the full-text events().list(q=...) search.
+
+    python -m benchmarks.bench_booking_index --bookings 100000 --lookups 2000
+"""
+import argparse
+import os
+import random
+import tempfile
+import time
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.tool.cancel_event import CancelEventTool
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=100_000)
+    parser.add_argument("--lookups", type=int, default=2000)
+    parser.add_argument("--search-lookups", type=int, default=20,
+                        help="lookups through the calendar search (each scans every event)")
+    args = parser.parse_args()
+
+    rng = random.Random(3)
+    bookings = [(f"{number:08x}", f"09{rng.randrange(10 ** 8):08d}") for number in range(args.bookings)]
+    calendar = InMemoryCalendar()
+    rows = []
+    for code, phone in bookings:
+        event = calendar.insert("primary", {
+            "summary": "Customer - Hair cut",
+            "description": f"Service: Hair cut\nPhone: {phone}\nBooking Code: {code}",
+            "start": {"dateTime": "2025-01-06T10:00:00+07:00"},
+            "end": {"dateTime": "2025-01-06T10:30:00+07:00"},
+        })
+        rows.append((code, phone, event["id"], "primary", None))
+
+    with tempfile.TemporaryDirectory() as directory:
+        index = BookingIndex(os.path.join(directory, "bookings.sqlite3"))
+        began = time.perf_counter()
+        index.add_many(rows)
+        print(f"{args.bookings} bookings indexed in {(time.perf_counter() - began) * 1000:.0f}ms")
+
+        for code, phone in rng.sample(bookings, args.lookups):
+            assert index.lookup(code, phone) is not None
+        summary = index.latency.summary()["lookup"]
+        print(f"index lookup    p50={summary['p50'] * 1e6:8.1f}us  p99={summary['p99'] * 1e6:8.1f}us")
+
+        tool = CancelEventTool(booking_index=index)
+        service = FakeCalendarService(calendar)
+        latency = LatencyRecorder()
+        for code, phone in rng.sample(bookings, args.search_lookups):
+            began = time.perf_counter()
+            assert tool.search_calendar(service, code, phone) is not None
+            latency.record("search", time.perf_counter() - began)
+        summary = latency.summary()["search"]
+        print(f"calendar search p50={summary['p50'] * 1e6:8.1f}us  p99={summary['p99'] * 1e6:8.1f}us  "
+              f"(in-memory fake, no network)")
+        index.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""Booking tool latency: structured tool arguments vs the old free-text query re-parsed by a second model call,
+then the rule-based date/time fast path over a mix of customer phrasings.
+
+    python -m benchmarks.bench_booking_tool --bookings 50 --llm-latency 0.8
+"""
+import argparse
+import json
+import time
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+from bookinggpt.tool.create_event import CalendarTool
+
+ARGS = {"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+        "date": "2026-10-23", "start_time": "14:00"}
+EXTRACTED = {"event_name": "Hair cut", "customer_name": "Lan", "customer_phone": "0901234567",
+             "start_time": "14:00", "end_time": "14:30", "booking_code": None,
+             "customer_service": "Hair cut", "date": "2026-10-23"}
+# (date, start time) as customers give them; the last two need the model.
+PHRASINGS = [
+    ("tomorrow", "2pm"), ("mai", "14h"), ("thứ Sáu", "2 giờ chiều"), ("next Friday", "10:30"),
+    ("hôm nay", "9h rưỡi sáng"), ("23/10", "3:15 p.m."), ("chủ nhật", "11h"), ("2026-10-23", "16:00"),
+    ("the day after my exam", "14:00"), ("tomorrow", "after lunch"),
+]
+
+
+def make_tool(llm):
+    return CalendarTool(calendar_client=StaticCalendarClient(FakeCalendarService(InMemoryCalendar())),
+                        booking_index=BookingIndex(":memory:"), extraction_llm=llm)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--bookings", type=int, default=50)
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="seconds per extraction model call")
+    args = parser.parse_args()
+
+    for name, tool_args in (("extraction", {**ARGS, "date": "the day after my exam", "start_time": "after lunch"}),
+                            ("structured", ARGS)):
+        llm = ScriptedChatModel(responses=[json.dumps(EXTRACTED)], latency=args.llm_latency)
+        tool = make_tool(llm)
+        latency = LatencyRecorder()
+        for _ in range(args.bookings):
+            began = time.perf_counter()
+            assert "Event created successfully" in tool.run(tool_args)
+            latency.record("booking", time.perf_counter() - began)
+        summary = latency.summary()["booking"]
+        print(f"{name:<10} p50={summary['p50'] * 1000:8.1f}ms  p99={summary['p99'] * 1000:8.1f}ms  "
+              f"model calls={llm.calls}")
+
+    llm = ScriptedChatModel(responses=[json.dumps(EXTRACTED)], latency=args.llm_latency)
+    tool = make_tool(llm)
+    for number in range(args.bookings):
+        date, start_time = PHRASINGS[number % len(PHRASINGS)]
+        assert "Event created successfully" in tool.run({**ARGS, "date": date, "start_time": start_time})
+    stats = tool.stats()
+    # Below 9 bookings no phrasing needs the model, so there is no extraction time to compare against.
+    saved = "n/a" if stats["saved_per_booking"] is None else f"{stats['saved_per_booking'] * 1000:.0f}ms"
+    print(f"mixed      fast path {stats['fast_path_rate']:.0%}  model calls={llm.calls}  saved {saved} per booking")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Bulk create/cancel throughput: one request per event vs Calendar batch requests, against the fake endpoint.
+
+    python -m benchmarks.bench_bulk --events 500 --latency 0.02 --batch-size 50 --failure-rate 0.02
+"""
+import argparse
+import time
+
+from googleapiclient.errors import HttpError
+
+from bookinggpt.gcal.bookings import booking_properties
+from bookinggpt.gcal.bulk import BulkCalendarOperations
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, Faults
+
+
+def walk_ins(count):
+    return [{
+        "summary": f"Walk-in {number} - Hair cut",
+        "start": {"dateTime": "2026-10-19T10:00:00+07:00"},
+        "end": {"dateTime": "2026-10-19T10:30:00+07:00"},
+        "extendedProperties": {"private": booking_properties(f"walk{number:05d}", f"0900{number:06d}")},
+    } for number in range(count)]
+
+
+def serial(service, bodies):
+    event_ids, failed = [], 0
+    began = time.perf_counter()
+    for body in bodies:
+        try:
+            event_ids.append(service.events().insert(calendarId="primary", body=body).execute()["id"])
+        except HttpError:
+            failed += 1
+    created = time.perf_counter() - began
+    began = time.perf_counter()
+    for event_id in event_ids:
+        try:
+            service.events().delete(calendarId="primary", eventId=event_id).execute()
+        except HttpError:
+            failed += 1
+    return created, time.perf_counter() - began, len(event_ids), failed
+
+
+def batched(service, bodies, batch_size):
+    bulk = BulkCalendarOperations(StaticCalendarClient(service), batch_size=batch_size, backoff=0.01)
+    began = time.perf_counter()
+    results = bulk.create_events(bodies)
+    created = time.perf_counter() - began
+    began = time.perf_counter()
+    deleted = bulk.delete_events([result.response["id"] for result in results if result.ok])
+    failed = sum(not result.ok for result in results + deleted)
+    return created, time.perf_counter() - began, len(deleted), failed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--events", type=int, default=500)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per HTTP round trip")
+    parser.add_argument("--batch-size", type=int, default=50)
+    parser.add_argument("--failure-rate", type=float, default=0.0)
+    args = parser.parse_args()
+
+    print(f"{args.events} events, {args.latency * 1000:.0f}ms per round trip, failure rate {args.failure_rate:.0%}")
+    for name, run in (("serial", lambda service, bodies: serial(service, bodies)),
+                      ("batched", lambda service, bodies: batched(service, bodies, args.batch_size))):
+        # A share of inserts and deletes fail with 503, as under load.
+        faults = Faults(error_rate=args.failure_rate, operations=("insert", "delete"), seed=5)
+        service = FakeCalendarService(latency=args.latency, faults=faults)
+        created, deleted, cancelled, failed = run(service, walk_ins(args.events))
+        print(f"{name:<8} create {args.events / created:8.0f} events/s  cancel {cancelled / deleted:8.0f} events/s"
+              f"  failed {failed}")
+
+
+if __name__ == "__main__":
+    main()
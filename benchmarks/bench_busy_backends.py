@@ -0,0 +1,95 @@
+"""Busy-interval fetch for availability: events().list with full event bodies vs one freebusy().query.
+
+Responses go through a JSON encode/decode round trip to stand in for the wire.
+
+    python -m benchmarks.bench_busy_backends --days 30 --events-per-day 40 --calendars 3
+"""
+import argparse
+import datetime
+import json
+import time
+from zoneinfo import ZoneInfo
+
+from benchmarks.bench_availability import TZ, dense_calendar
+from bookinggpt.gcal.busy import make_busy_source
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+
+
+class WireRequest:
+    def __init__(self, request, wire):
+        self.request = request
+        self.wire = wire
+
+    def execute(self, num_retries: int = 0):
+        payload = json.dumps(self.request.execute())
+        self.wire.requests += 1
+        self.wire.bytes += len(payload)
+        return json.loads(payload)
+
+
+class WireResource:
+    def __init__(self, resource, wire):
+        self.resource = resource
+        self.wire = wire
+
+    def __getattr__(self, name):
+        method = getattr(self.resource, name)
+        return lambda *args, **kwargs: WireRequest(method(*args, **kwargs), self.wire)
+
+
+class WireService:
+    def __init__(self, service):
+        self.service = service
+        self.requests = 0
+        self.bytes = 0
+
+    def events(self):
+        return WireResource(self.service.events(), self)
+
+    def freebusy(self):
+        return WireResource(self.service.freebusy(), self)
+
+
+def booking(start, end, number):
+    return {
+        "summary": f"Hair cut - Customer {number}",
+        "description": f"Booking Code: {number:06d}\nPhone: 09{number:08d}\nService: Hair cut\nNotes: prefers a quiet chair",
+        "start": {"dateTime": start.isoformat(), "timeZone": TZ},
+        "end": {"dateTime": end.isoformat(), "timeZone": TZ},
+        "attendees": [{"email": f"customer{number}@example.com", "responseStatus": "accepted"}],
+        "reminders": {"useDefault": True},
+        "creator": {"email": "salon@example.com"},
+        "organizer": {"email": "salon@example.com", "self": True},
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--events-per-day", type=int, default=40)
+    parser.add_argument("--calendars", type=int, default=3)
+    args = parser.parse_args()
+
+    start = datetime.datetime(2026, 1, 5, tzinfo=ZoneInfo(TZ))
+    end = start + datetime.timedelta(days=args.days)
+    calendars = {}
+    for index in range(args.calendars):
+        calendar = InMemoryCalendar()
+        for number, (busy_start, busy_end) in enumerate(dense_calendar(start, args.days, args.events_per_day, seed=index)):
+            calendar.insert("primary", booking(busy_start, busy_end, number))
+        calendars["primary" if index == 0 else f"stylist-{index}"] = calendar
+    service = FakeCalendarService(calendars["primary"], calendars=calendars)
+
+    print(f"{args.calendars} calendars x {args.days} days x {args.events_per_day} events/day")
+    for backend in ("events", "freebusy"):
+        wire = WireService(service)
+        source = make_busy_source(backend, list(calendars))
+        began = time.perf_counter()
+        busy = list(source.iter_busy(wire, start, end))
+        elapsed = time.perf_counter() - began
+        print(f"{backend:<9} {elapsed * 1000:8.1f}ms  {wire.requests:4d} requests  "
+              f"{wire.bytes / 1024:9.1f} KiB  {len(busy)} busy intervals")
+
+
+if __name__ == "__main__":
+    main()
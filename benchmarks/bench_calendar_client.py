@@ -0,0 +1,54 @@
+"""Per-call Calendar setup cost: build() on every tool call vs the shared CalendarClient.
+
+Runs offline with a static access token; only resource construction is timed.
+
+    python -m benchmarks.bench_calendar_client --calls 500
+"""
+import argparse
+import statistics
+import time
+
+from google.oauth2.credentials import Credentials
+from googleapiclient.discovery import build
+
+from bookinggpt.gcal.client import CalendarClient
+
+
+class StaticProvider:
+    def __init__(self):
+        self.credentials = Credentials(token="offline")
+
+    def get(self):
+        return self.credentials
+
+
+def time_calls(fn, calls):
+    samples = []
+    for _ in range(calls):
+        start = time.perf_counter()
+        fn()
+        samples.append(time.perf_counter() - start)
+    return samples
+
+
+def report(label, samples):
+    print(f"{label:<28} p50={statistics.median(samples) * 1e6:9.1f}us "
+          f"mean={statistics.fmean(samples) * 1e6:9.1f}us")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=500)
+    args = parser.parse_args()
+
+    provider = StaticProvider()
+    report("build() per call", time_calls(
+        lambda: build("calendar", "v3", credentials=provider.get()), args.calls))
+
+    client = CalendarClient(credential_provider=provider)
+    report("CalendarClient.service()", time_calls(client.service, args.calls))
+    print(f"client stats: builds={client.stats()['builds']} reuses={client.stats()['reuses']}")
+
+
+if __name__ == "__main__":
+    main()
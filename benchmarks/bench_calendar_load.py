@@ -0,0 +1,78 @@
+"""Concurrent booking load against the local calendar backends, with injected latency and errors.
+
+Each customer checks the first free slots of a day and books one, through the
+unchanged tools.
+
+    python -m benchmarks.bench_calendar_load --customers 200 --threads 16 --latency 0.02 --error-rate 0.02
+"""
+import argparse
+import datetime
+import tempfile
+import time
+from concurrent.futures import ThreadPoolExecutor
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_calendar import Faults, InMemoryCalendar, local_calendar_client
+from bookinggpt.testing.sqlite_calendar import SQLiteCalendar
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from bookinggpt.tool.create_event import CalendarTool
+
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+MONDAY = datetime.date(2026, 10, 19)
+
+
+def run(calendar, customers, threads, latency, error_rate):
+    faults = Faults(error_rate=error_rate, seed=11)
+    client = local_calendar_client(calendar, latency=latency, faults=faults)
+    slots_tool = AvailableSlotsTool(calendar_client=client)
+    booking_tool = CalendarTool(calendar_client=client, booking_index=BookingIndex(":memory:"))
+    recorder = LatencyRecorder(max_samples=customers)
+
+    def customer(number):
+        day = MONDAY + datetime.timedelta(days=number % 28)
+        began = time.perf_counter()
+        try:
+            slots = slots_tool.find_slots(datetime.datetime.combine(day, datetime.time(9), tzinfo=TZ), count=3, days=1)
+        except HttpError:  # An injected error; book the opening slot instead.
+            slots = []
+        start = slots[number % len(slots)] if slots else datetime.datetime.combine(day, datetime.time(9), tzinfo=TZ)
+        reply = booking_tool.run({
+            "customer_name": f"Customer {number}", "customer_phone": f"09{number:08d}", "service": "Hair cut",
+            "date": day.isoformat(), "start_time": start.strftime("%H:%M"),
+        })
+        recorder.record("customer", time.perf_counter() - began)
+        return "successfully" in reply
+
+    began = time.perf_counter()
+    with ThreadPoolExecutor(threads) as pool:
+        booked = sum(pool.map(customer, range(customers)))
+    outcomes = {"booked": booked, "failed": customers - booked}
+    return time.perf_counter() - began, recorder.summary()["customer"], outcomes, faults.stats()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--customers", type=int, default=200)
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--latency", type=float, default=0.02, help="seconds per simulated API round trip")
+    parser.add_argument("--error-rate", type=float, default=0.02)
+    args = parser.parse_args()
+
+    print(f"{args.customers} customers, {args.threads} threads, {args.latency * 1000:.0f}ms per round trip, "
+          f"error rate {args.error_rate:.0%}")
+    with tempfile.TemporaryDirectory() as directory:
+        for name, calendar in (("memory", InMemoryCalendar()),
+                               ("sqlite", SQLiteCalendar(f"{directory}/calendar.sqlite3"))):
+            elapsed, summary, outcomes, faults = run(calendar, args.customers, args.threads, args.latency,
+                                                     args.error_rate)
+            print(f"{name:<7} {args.customers / elapsed:7.1f} customers/s  p50={summary['p50'] * 1000:7.1f}ms  "
+                  f"p95={summary['p95'] * 1000:7.1f}ms  booked={outcomes['booked']}  failed={outcomes['failed']}  "
+                  f"injected errors={faults['errors']}/{faults['calls']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,112 @@
+"""Whole recorded conversations replayed through BookingAgent, the tools and a local calendar.
+
+Model responses come from a recorded tape, so every round runs the same tool
+calls and the difference between turn time and model time is the agent's own
+overhead (executor, memory, prompt formatting, tool dispatch, calendar calls).
+
+    python -m benchmarks.bench_conversations --rounds 20
+    python -m benchmarks.bench_conversations --rounds 3 --recorded-latency
+    python main.py chat --record my_session.json   # record a fixture against Gemini
+"""
+import argparse
+import datetime
+import json
+import os
+import time
+from zoneinfo import ZoneInfo
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_calendar import InMemoryCalendar, local_calendar_client
+from bookinggpt.testing.fake_llm import ReplayChatModel, Tape
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from bookinggpt.tool.cancel_event import CancelEventTool
+from bookinggpt.tool.create_event import CalendarTool, EventInfo
+
+FIXTURE = os.path.join(os.path.dirname(__file__), "fixtures", "booking_conversations.json")
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+
+
+class ModelTime(BaseCallbackHandler):
+    """Total seconds spent inside model calls."""
+
+    run_inline = True
+
+    def __init__(self):
+        self.calls, self.seconds, self._started = 0, 0.0, {}
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        self.calls += 1
+        self.seconds += time.perf_counter() - self._started.pop(run_id)
+
+
+def build(tape, latency, recorded_latency, latency_scale):
+    model_time = ModelTime()
+    llm = ReplayChatModel(tape=tape, latency=latency, recorded_latency=recorded_latency,
+                          latency_scale=latency_scale, callbacks=[model_time])
+    calendar = InMemoryCalendar()
+    client, index = local_calendar_client(calendar), BookingIndex(":memory:")
+    booking_tool = CalendarTool(calendar_client=client, booking_index=index, extraction_llm=llm)
+    agent = BookingAgent(llm, tools=[booking_tool, AvailableSlotsTool(calendar_client=client),
+                                     CancelEventTool(calendar_client=client, booking_index=index)])
+    agent.verbose = False
+    return agent, booking_tool, model_time
+
+
+def seed_cancellable_booking(booking_tool):
+    """The booking the cancel conversation refers to."""
+    booking_tool.create_event(EventInfo(
+        event_name="Hair cut", customer_name="Hoa", customer_phone="0987654321", start_time="16:00",
+        end_time="16:30", booking_code="DAISY001", customer_service="Hair cut", date="2026-10-21",
+    ), datetime.datetime.now(TZ))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--fixture", default=FIXTURE, help="tape with a 'conversations' list of customer messages")
+    parser.add_argument("--rounds", type=int, default=20)
+    parser.add_argument("--llm-latency", type=float, default=0.0, help="simulated seconds per model call")
+    parser.add_argument("--recorded-latency", action="store_true", help="replay each call at its recorded time")
+    parser.add_argument("--latency-scale", type=float, default=1.0)
+    args = parser.parse_args()
+
+    with open(args.fixture, encoding="utf-8") as file:
+        conversations = json.load(file)["conversations"]
+    tape = Tape.load(args.fixture)
+    agent, booking_tool, model_time = build(tape, args.llm_latency, args.recorded_latency, args.latency_scale)
+    latency = LatencyRecorder()
+    transcripts = set()
+    began = time.perf_counter()
+    for number in range(args.rounds):
+        tape.rewind()
+        seed_cancellable_booking(booking_tool)
+        transcript = []
+        for conversation, messages in enumerate(conversations):
+            for message in messages:
+                turn_began = time.perf_counter()
+                transcript.append(agent.call_agent(message, session_id=f"round{number}-customer{conversation}"))
+                latency.record("turn", time.perf_counter() - turn_began)
+        transcripts.add(tuple(transcript))
+    elapsed = time.perf_counter() - began
+
+    turn = latency.summary()["turn"]
+    model_seconds = model_time.seconds
+    print(f"{args.rounds} rounds x {len(conversations)} conversations, {turn['count']} turns, "
+          f"{model_time.calls} model calls, executor builds={agent.setup_stats['builds']}")
+    print(f"turn      p50={turn['p50'] * 1000:8.2f}ms  p95={turn['p95'] * 1000:8.2f}ms  max={turn['max'] * 1000:8.2f}ms")
+    print(f"overhead  {(elapsed - model_seconds) / turn['count'] * 1000:8.2f}ms per turn outside the model "
+          f"(model ~{model_seconds:.2f}s of {elapsed:.2f}s)")
+    booking = booking_tool.stats()
+    print(f"bookings  fast path={booking['fast_path']}  extraction={booking['extraction']}  "
+          f"router bypass={agent.router.stats()['bypass_rate']:.0%}")
+    print(f"deterministic: {'yes' if len(transcripts) == 1 else f'no, {len(transcripts)} different transcripts'}")
+
+
+if __name__ == "__main__":
+    main()
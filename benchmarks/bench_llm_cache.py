@@ -0,0 +1,55 @@
+"""Agent turn latency on repeated customer questions, with and without the LLM response cache.
+
+Runs offline against a scripted model with simulated latency.
+
+    python -m benchmarks.bench_llm_cache --turns 200 --llm-latency 0.5
+"""
+import argparse
+import random
+import time
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.cache import LLMResponseCache
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+
+QUESTIONS = [
+    "hi", "Hi!", "hello", "What services do you have?", "what services do you have",
+    "What are your hours?", "what are your opening hours?", "How much is a haircut?",
+    "Where is the salon?", "Do you do hair coloring?",
+]
+
+
+def run(turns, llm_latency, cache):
+    llm = ScriptedChatModel(responses=["Happy to help! 💇‍♀️"], latency=llm_latency, cache=cache)
+    agent = BookingAgent(llm, tools=[])
+    agent.verbose = False
+    agent.router = None  # Measure the cache alone; the router would answer the static questions itself.
+    rng = random.Random(7)
+    latency = LatencyRecorder()
+    for turn in range(turns):
+        began = time.perf_counter()
+        # A fresh session per turn: the first message of a conversation, as most FAQs are.
+        agent.call_agent(rng.choice(QUESTIONS), session_id=f"customer-{turn}")
+        latency.record("turn", time.perf_counter() - began)
+    return latency.summary()["turn"], llm.calls
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=200)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for name, cache in (("no cache", None), ("cache", LLMResponseCache())):
+        summary, calls = run(args.turns, args.llm_latency, cache)
+        line = (f"{name:<9} p50={summary['p50'] * 1000:8.1f}ms  p95={summary['p95'] * 1000:8.1f}ms  "
+                f"model calls={calls}")
+        if cache is not None:
+            stats = cache.stats()
+            line += f"  hit ratio={stats['hit_ratio']:.0%}  saved={stats['saved_seconds']:.1f}s"
+        print(line)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,30 @@
+"""Cost of getting a Gemini client per booking: constructing a new one vs the shared registry.
+
+Runs offline; the clients are only constructed, never called.
+
+    python -m benchmarks.bench_llm_registry --calls 200
+"""
+import argparse
+
+from bookinggpt.llm import LLMRegistry, google_chat_model
+from bookinggpt.utils import EXTRACTION_MODEL
+
+from benchmarks.bench_agent_setup import report, time_per_turn
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--calls", type=int, default=200)
+    args = parser.parse_args()
+
+    report("new client per call",
+           time_per_turn(lambda: google_chat_model(EXTRACTION_MODEL, temperature=0, google_api_key="offline"),
+                         args.calls))
+    registry = LLMRegistry()
+    report("registry", time_per_turn(
+        lambda: registry.get(EXTRACTION_MODEL, temperature=0, google_api_key="offline"), args.calls))
+    print(f"registry builds: {registry.stats()['builds']}")
+
+
+if __name__ == "__main__":
+    main()
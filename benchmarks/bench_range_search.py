@@ -0,0 +1,65 @@
+"""Next-N slot search over a long range: lazy paging with early stop vs fetching every page first.
+
+    python -m benchmarks.bench_range_search --days 60 --events-per-day 40 --count 5 --page-latency 0.05
+"""
+import argparse
+import datetime
+import time
+from zoneinfo import ZoneInfo
+
+from benchmarks.bench_availability import TZ, dense_calendar
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.tool.available_event import AvailableSlotsTool
+
+
+class SlowCalendar(InMemoryCalendar):
+    """Adds a fixed round-trip time to every list call."""
+
+    def __init__(self, latency: float, **kwargs):
+        super().__init__(**kwargs)
+        self.latency = latency
+
+    def list(self, *args, **kwargs):
+        time.sleep(self.latency)
+        return super().list(*args, **kwargs)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=60)
+    parser.add_argument("--events-per-day", type=int, default=40)
+    parser.add_argument("--count", type=int, default=5)
+    parser.add_argument("--minutes", type=int, default=30)
+    parser.add_argument("--page-size", type=int, default=250)
+    parser.add_argument("--page-latency", type=float, default=0.05, help="seconds per events().list call")
+    args = parser.parse_args()
+
+    start = datetime.datetime(2026, 1, 5, tzinfo=ZoneInfo(TZ))
+    calendar = SlowCalendar(args.page_latency, page_size=args.page_size)
+    for busy_start, busy_end in dense_calendar(start, args.days, args.events_per_day):
+        calendar.insert("primary", {"start": {"dateTime": busy_start.isoformat()},
+                                    "end": {"dateTime": busy_end.isoformat()}})
+    tool = AvailableSlotsTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)),
+                              page_size=args.page_size, max_search_days=args.days)
+
+    requests = calendar.requests
+    began = time.perf_counter()
+    slots = tool.find_slots(start, args.minutes, args.count, args.days)
+    lazy = time.perf_counter() - began
+    lazy_pages = calendar.requests - requests
+
+    requests = calendar.requests
+    began = time.perf_counter()
+    service = tool.get_service()
+    busy = tool.get_busy_slots(service, start, start + datetime.timedelta(days=args.days))
+    eager = time.perf_counter() - began
+    eager_pages = calendar.requests - requests
+
+    print(f"{args.days} days x {args.events_per_day} events/day, next {args.count} slots of {args.minutes}m")
+    print(f"lazy early stop  {lazy * 1000:9.1f}ms  {lazy_pages:4d} pages  ({len(slots)} slots)")
+    print(f"fetch everything {eager * 1000:9.1f}ms  {eager_pages:4d} pages  ({len(busy)} events, before any slot search)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""Turn latency on mixed customer traffic with and without the intent router, per path.
+
+Runs offline against a scripted model with simulated latency.
+
+    python -m benchmarks.bench_router --turns 300 --llm-latency 0.5
+"""
+import argparse
+import random
+import time
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+
+MESSAGES = [
+    "What services do you offer?", "what are your hours?", "How long does a haircut take?",
+    "Do you do hair coloring?", "Mấy giờ salon mở cửa?", "Salon có những dịch vụ gì?",
+    "cắt tóc và gội đầu mất bao lâu", "hi", "I want to book a haircut", "any free slots on Friday?",
+    "Đặt lịch cắt tóc ngày mai 3 giờ chiều", "cancel my appointment", "How much is a haircut?",
+]
+
+
+def run(turns, llm_latency, routed):
+    llm = ScriptedChatModel(responses=["Happy to help! 💇‍♀️"], latency=llm_latency)
+    agent = BookingAgent(llm, tools=[])
+    agent.verbose = False
+    if not routed:
+        agent.router = None
+    rng = random.Random(7)
+    latency = LatencyRecorder()
+    for turn in range(turns):
+        began = time.perf_counter()
+        agent.call_agent(rng.choice(MESSAGES), session_id=f"customer-{turn}")
+        latency.record("turn", time.perf_counter() - began)
+    return latency.summary()["turn"], llm.calls, agent.router
+
+
+def ms(summary):
+    return f"p50={summary['p50'] * 1000:9.3f}ms  p95={summary['p95'] * 1000:9.3f}ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--turns", type=int, default=300)
+    parser.add_argument("--llm-latency", type=float, default=0.5)
+    args = parser.parse_args()
+
+    for name, routed in (("no router", False), ("router", True)):
+        summary, calls, router = run(args.turns, args.llm_latency, routed)
+        print(f"{name:<9} {ms(summary)}  model calls={calls}")
+        if router is not None:
+            stats = router.stats()
+            print(f"  bypass rate {stats['bypass_rate']:.0%}  intents {stats['intents']}")
+            for path in ("faq", "agent", "classify"):
+                print(f"  {path:<8} {ms(stats['latency'][path])}  n={stats['latency'][path]['count']}")
+
+
+if __name__ == "__main__":
+    main()
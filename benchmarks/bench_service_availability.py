@@ -0,0 +1,54 @@
+"""Start times for every catalog service: the legacy per-slot loop vs the sweep engine vs the minute bitmap.
+
+    python -m benchmarks.bench_service_availability --days 30 --events-per-day 40 --step 15
+"""
+import argparse
+import datetime
+import time
+from zoneinfo import ZoneInfo
+
+from benchmarks.bench_availability import TZ, dense_calendar, legacy_available_slots
+from bookinggpt.availability.bitmap import BitmapAvailability
+from bookinggpt.availability.engine import AvailabilityEngine
+from bookinggpt.catalog import SERVICES
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--days", type=int, default=30)
+    parser.add_argument("--events-per-day", type=int, default=40)
+    parser.add_argument("--step", type=int, default=15)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    start = datetime.datetime(2026, 1, 5, tzinfo=ZoneInfo(TZ))
+    end = start + datetime.timedelta(days=args.days - 1)
+    busy = dense_calendar(start, args.days, args.events_per_day)
+    durations = sorted({service.minutes for service in SERVICES})
+
+    def legacy():
+        return {minutes: legacy_available_slots(busy, start, end, minutes, args.step) for minutes in durations}
+
+    def sweep():
+        return {
+            minutes: AvailabilityEngine(slot_minutes=minutes, step_minutes=args.step).available_slots(busy, start, end)
+            for minutes in durations
+        }
+
+    def bitmap():
+        return BitmapAvailability(step_minutes=args.step).available_starts(busy, start, end, durations)
+
+    expected = legacy()
+    print(f"{args.days} days x {args.events_per_day} events/day, {len(durations)} service durations, step {args.step}m")
+    for name, run in (("legacy loop", legacy), ("sweep engine", sweep), ("minute bitmap", bitmap)):
+        best = float("inf")
+        for _ in range(args.repeat if name != "legacy loop" else 1):
+            began = time.perf_counter()
+            result = run()
+            best = min(best, time.perf_counter() - began)
+        assert result == expected, f"{name} disagrees with the legacy loop"
+        print(f"{name:<14} {best * 1000:9.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,41 @@
+"""Memory held by many concurrent chat sessions in one SessionStore.
+
+    python -m benchmarks.bench_sessions --sessions 5000 --turns 10 --cap-mb 32
+"""
+import argparse
+import time
+import tracemalloc
+
+from bookinggpt.agent.session import SessionStore
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--turns", type=int, default=10)
+    parser.add_argument("--cap-mb", type=float, default=32)
+    args = parser.parse_args()
+
+    store = SessionStore(max_sessions=args.sessions, max_memory_bytes=int(args.cap_mb * 1024 * 1024))
+    message = "I'd like to book a haircut this Friday at 2 PM please " * 3
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    for turn in range(args.turns):
+        for i in range(args.sessions):
+            session = store.get(f"session-{i}")
+            session.memory.save_context({"input": message}, {"output": message})
+            store.record_turn(session)
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    stats = store.stats()
+    print(f"turns: {args.sessions * args.turns} in {elapsed:.2f}s")
+    print(f"live sessions: {stats['sessions']}, evictions: {stats['evictions']}")
+    print(f"estimated session memory: {stats['memory_bytes'] / 1024 / 1024:.1f} MiB")
+    print(f"traced heap: current={current / 1024 / 1024:.1f} MiB peak={peak / 1024 / 1024:.1f} MiB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,328 @@
+"""Offline benchmark suite for the booking hot paths, with results saved as JSON.
+
+Every case runs against the in-memory calendar, the SQLite booking index and
+scripted or replayed model responses with fixed seeds, so two runs on the same
+machine are comparable. ``compare`` reports the latency, memory and prompt-size
+metrics that grew by more than the threshold and exits non-zero if any did.
+
+    python -m benchmarks.suite run --output results.json
+    python -m benchmarks.suite run --quick --only available_slots,create_event
+    python -m benchmarks.suite compare baseline.json results.json --threshold 0.2
+"""
+import argparse
+import datetime
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+from zoneinfo import ZoneInfo
+
+from langchain_core.messages import AIMessage
+
+from benchmarks.bench_conversations import FIXTURE, build, seed_cancellable_booking
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.testing.fake_calendar import InMemoryCalendar, local_calendar_client
+from bookinggpt.testing.fake_llm import ScriptedChatModel, Tape, last_human_text, last_tool_observation
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from bookinggpt.tool.cancel_event import CancelEventTool
+from bookinggpt.tool.create_event import CalendarTool
+
+RESULTS_VERSION = 1
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+MONDAY = datetime.date(2026, 10, 19)
+
+SIZES = {
+    "full": {"slot_runs": 200, "sparse_per_day": 3, "dense_per_day": 15, "histories": [1_000, 10_000, 100_000],
+             "lookups": 500, "cancels": 100, "bookings": 300, "rounds": 10, "turns": 100},
+    "quick": {"slot_runs": 20, "sparse_per_day": 3, "dense_per_day": 15, "histories": [100, 1_000],
+              "lookups": 50, "cancels": 20, "bookings": 30, "rounds": 1, "turns": 100},
+}
+MEMORY_CHECKPOINTS = (1, 10, 50, 100)
+CUSTOMER_MESSAGES = (
+    "Hi, I'd like to get a haircut and maybe a hair wash",
+    "Which slots are free this week?",
+    "Hmm, is there anything later in the afternoon?",
+    "Okay, let me think about it and get back to you",
+)
+
+
+def latency_metrics(summary: dict) -> dict:
+    return {
+        "runs": summary["count"],
+        "p50_ms": summary["p50"] * 1000,
+        "p95_ms": summary["p95"] * 1000,
+        "p99_ms": summary["p99"] * 1000,
+        "max_ms": summary["max"] * 1000,
+    }
+
+
+def timed(recorder: LatencyRecorder, name: str, call):
+    began = time.perf_counter()
+    result = call()
+    recorder.record(name, time.perf_counter() - began)
+    return result
+
+
+def seed_week(calendar, per_day: int, seed: int):
+    """``per_day`` bookings of 15 to 90 minutes on each day of the benchmark week, within opening hours."""
+    rng = random.Random(seed)
+    for offset in range(7):
+        day = MONDAY + datetime.timedelta(days=offset)
+        for number in range(per_day):
+            minutes = rng.choice((15, 30, 45, 60, 90))
+            start = datetime.datetime.combine(day, datetime.time(9), tzinfo=TZ) + datetime.timedelta(
+                minutes=rng.randrange(0, 10 * 60 - minutes, 5))
+            calendar.insert("primary", {
+                "summary": f"Customer {offset}-{number} - Hair cut",
+                "start": {"dateTime": start.isoformat()},
+                "end": {"dateTime": (start + datetime.timedelta(minutes=minutes)).isoformat()},
+            })
+
+
+def bench_available_slots(sizes: dict) -> dict:
+    """The weekly free-slot listing, on a sparse and a dense calendar."""
+    results = {}
+    now = datetime.datetime.combine(MONDAY, datetime.time(8), tzinfo=TZ)
+    for density in ("sparse", "dense"):
+        calendar = InMemoryCalendar()
+        seed_week(calendar, sizes[f"{density}_per_day"], seed=7)
+        tool = AvailableSlotsTool(calendar_client=local_calendar_client(calendar))
+        for label, minutes in (("", None), ("_60min", 60)):
+            recorder = LatencyRecorder(max_samples=sizes["slot_runs"])
+            for _ in range(sizes["slot_runs"]):
+                slots = timed(recorder, "slots", lambda: tool.get_available_slots(now, minutes))
+            results[f"available_slots/{density}{label}"] = {
+                **latency_metrics(recorder.summary()["slots"]),
+                "events": len(calendar.events),
+                "slots": sum(len(day) for day in slots.values()),
+            }
+    return results
+
+
+def bench_cancel_lookup(sizes: dict) -> dict:
+    """Finding a booking by code and phone, and cancelling it, as the booking history grows."""
+    results = {}
+    for history in sizes["histories"]:
+        rng = random.Random(3)
+        calendar, index = InMemoryCalendar(), BookingIndex(":memory:")
+        bookings, rows = [], []
+        for number in range(history):
+            code, phone = f"{number:08X}", f"09{rng.randrange(10 ** 8):08d}"
+            event = calendar.insert("primary", {
+                "summary": "Customer - Hair cut",
+                "description": f"Service: Hair cut\nPhone: {phone}\nBooking Code: {code}",
+                "start": {"dateTime": "2026-10-19T10:00:00+07:00"},
+                "end": {"dateTime": "2026-10-19T10:30:00+07:00"},
+            })
+            bookings.append((code, phone))
+            rows.append((code, phone, event["id"], "primary", None))
+        index.add_many(rows)
+        tool = CancelEventTool(calendar_client=local_calendar_client(calendar), booking_index=index)
+
+        recorder = LatencyRecorder(max_samples=sizes["lookups"])
+        for code, phone in rng.sample(bookings, min(sizes["lookups"], history)):
+            assert timed(recorder, "lookup", lambda: index.lookup(code, phone)) is not None
+        for code, phone in rng.sample(bookings, min(sizes["cancels"], history)):
+            reply = timed(recorder, "cancel", lambda: tool.cancel_event(code, phone))
+            assert "successfully canceled" in reply, reply
+        summary = recorder.summary()
+        results[f"cancel_lookup/index_{history}"] = latency_metrics(summary["lookup"])
+        results[f"cancel_lookup/cancel_{history}"] = latency_metrics(summary["cancel"])
+        index.close()
+    return results
+
+
+def bench_create_event(sizes: dict) -> dict:
+    """A structured booking end to end: validation, calendar insert and index write."""
+    calendar = InMemoryCalendar()
+    tool = CalendarTool(calendar_client=local_calendar_client(calendar), booking_index=BookingIndex(":memory:"))
+    recorder = LatencyRecorder(max_samples=sizes["bookings"])
+    booked = 0
+    for number in range(sizes["bookings"]):
+        day = MONDAY + datetime.timedelta(days=number % 28)
+        reply = timed(recorder, "create", lambda: tool.run({
+            "customer_name": f"Customer {number}", "customer_phone": f"09{number:08d}", "service": "Hair cut",
+            "date": day.isoformat(), "start_time": f"{9 + number // 28 % 9:02d}:{number % 2 * 30:02d}",
+        }))
+        booked += "successfully" in reply
+    return {"create_event/structured": {**latency_metrics(recorder.summary()["create"]), "booked": booked}}
+
+
+def bench_call_agent(sizes: dict) -> dict:
+    """Per-turn overhead of call_agent on the recorded conversations, with instant model responses."""
+    with open(FIXTURE, encoding="utf-8") as file:
+        conversations = json.load(file)["conversations"]
+    tape = Tape.load(FIXTURE)
+    agent, booking_tool, model_time = build(tape, 0.0, False, 1.0)
+    recorder = LatencyRecorder(max_samples=10_000)
+    transcripts = set()
+    began = time.perf_counter()
+    for number in range(sizes["rounds"]):
+        tape.rewind()
+        seed_cancellable_booking(booking_tool)
+        transcripts.add(tuple(
+            timed(recorder, "turn", lambda: agent.call_agent(message, session_id=f"round{number}-customer{index}"))
+            for index, messages in enumerate(conversations) for message in messages
+        ))
+    elapsed = time.perf_counter() - began
+    turns = recorder.summary()["turn"]
+    return {"call_agent/recorded_conversations": {
+        **latency_metrics(turns),
+        "overhead_ms": (elapsed - model_time.seconds) / turns["count"] * 1000,
+        "model_calls": model_time.calls,
+        "deterministic": len(transcripts) == 1,
+    }}
+
+
+def salon_responder(messages):
+    """Checks the next free slots when asked about slots, otherwise replies with a fixed line."""
+    observation = last_tool_observation(messages)
+    if observation is not None:
+        return AIMessage(content=f"Here's what I found 😊\n{observation}")
+    if "slot" in last_human_text(messages).lower():
+        return AIMessage(content="", tool_calls=[
+            {"name": "available_slots_tool", "args": {"count": 5, "days": 7}, "id": "call_slots"},
+        ])
+    return AIMessage(content="Sure! Just let me know which service and time suit you best at Daisy Hair Salon.")
+
+
+def bench_memory_growth(sizes: dict) -> dict:
+    """Session memory and prompt size over one long conversation, per memory mode."""
+    results = {}
+    for mode in ("buffer", "budgeted"):
+        client = local_calendar_client(InMemoryCalendar())
+        agent = BookingAgent(ScriptedChatModel(responder=salon_responder), memory_mode=mode,
+                             tools=[AvailableSlotsTool(calendar_client=client)])
+        agent.verbose, agent.router = False, None
+        recorder = LatencyRecorder(max_samples=sizes["turns"])
+        metrics = {}
+        for turn in range(1, sizes["turns"] + 1):
+            timed(recorder, "turn" if turn <= 10 else "late_turn",
+                  lambda: agent.call_agent(CUSTOMER_MESSAGES[turn % len(CUSTOMER_MESSAGES)], session_id=mode))
+            if turn in MEMORY_CHECKPOINTS:
+                session = agent.sessions.get(mode)
+                metrics[f"turn{turn}_bytes"] = session.measure_memory()
+                metrics[f"turn{turn}_prompt_tokens"] = session.prompt_tokens
+        summary = recorder.summary()
+        metrics["first10_p50_ms"] = summary["turn"]["p50"] * 1000
+        if "late_turn" in summary:
+            metrics["last_turns_p50_ms"] = summary["late_turn"]["p50"] * 1000
+        results[f"memory_growth/{mode}"] = {"turns": sizes["turns"], **metrics}
+    return results
+
+
+CASES = {
+    "available_slots": bench_available_slots,
+    "cancel_lookup": bench_cancel_lookup,
+    "create_event": bench_create_event,
+    "call_agent": bench_call_agent,
+    "memory_growth": bench_memory_growth,
+}
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), timeout=10).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        return None
+
+
+def run_suite(sizes: dict, only=None, log=print) -> dict:
+    results = {
+        "version": RESULTS_VERSION,
+        "created": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+        "environment": {"python": platform.python_version(), "platform": platform.platform(), "commit": git_commit()},
+        "sizes": sizes,
+        "cases": {},
+    }
+    for name, case in CASES.items():
+        if only and name not in only:
+            continue
+        began = time.perf_counter()
+        results["cases"].update(case(sizes))
+        log(f"{name:<16} {time.perf_counter() - began:6.2f}s")
+    return results
+
+
+def compared(metric: str) -> bool:
+    """Metrics where lower is better and a run-to-run change means something."""
+    return metric.endswith(("_bytes", "_tokens")) or (metric.endswith("_ms") and metric not in ("p99_ms", "max_ms"))
+
+
+def compare(baseline: dict, current: dict, threshold: float = 0.2, min_delta_ms: float = 0.05) -> list:
+    """(case, metric, before, after) for every compared metric that grew by more than ``threshold``.
+
+    Timing changes smaller than ``min_delta_ms`` are ignored as noise.
+    """
+    regressions = []
+    for case, metrics in current["cases"].items():
+        before = baseline["cases"].get(case, {})
+        for metric, value in metrics.items():
+            old = before.get(metric)
+            if not compared(metric) or old is None:
+                continue
+            if metric.endswith("_ms") and value - old < min_delta_ms:
+                continue
+            if value > old * (1 + threshold):
+                regressions.append((case, metric, old, value))
+    return regressions
+
+
+def print_results(results: dict):
+    for case, metrics in results["cases"].items():
+        shown = "  ".join(f"{metric}={value:.3f}" if isinstance(value, float) else f"{metric}={value}"
+                          for metric, value in metrics.items())
+        print(f"{case:<36} {shown}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest="command", required=True)
+    run_parser = commands.add_parser("run", help="run the suite and save the results")
+    run_parser.add_argument("--output", help="JSON file for the results")
+    run_parser.add_argument("--quick", action="store_true", help="smaller histories and fewer runs")
+    run_parser.add_argument("--only", help=f"comma-separated cases out of {', '.join(CASES)}")
+    compare_parser = commands.add_parser("compare", help="report regressions between two result files")
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative growth")
+    compare_parser.add_argument("--min-delta-ms", type=float, default=0.05)
+    args = parser.parse_args(argv)
+
+    if args.command == "run":
+        only = set(args.only.split(",")) if args.only else None
+        unknown = (only or set()) - set(CASES)
+        if unknown:
+            parser.error(f"unknown cases: {', '.join(sorted(unknown))}")
+        results = run_suite(SIZES["quick" if args.quick else "full"], only)
+        print_results(results)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as file:
+                json.dump(results, file, indent=2)
+            print(f"results written to {args.output}")
+        return 0
+
+    with open(args.baseline, encoding="utf-8") as file:
+        baseline = json.load(file)
+    with open(args.current, encoding="utf-8") as file:
+        current = json.load(file)
+    if baseline.get("sizes") != current.get("sizes"):
+        print("warning: the runs used different sizes, so the numbers are not directly comparable")
+    regressions = compare(baseline, current, args.threshold, args.min_delta_ms)
+    for case, metric, old, new in regressions:
+        print(f"REGRESSION {case} {metric}: {old:.3f} -> {new:.3f} ({new / old - 1:+.0%})")
+    missing = sorted(set(baseline["cases"]) - set(current["cases"]))
+    if missing:
+        print(f"not in the current run: {', '.join(missing)}")
+    print(f"{len(regressions)} regression(s) above {args.threshold:.0%}")
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
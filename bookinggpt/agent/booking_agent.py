@@ -1,41 +1,276 @@
+import asyncio
 import os
-from dotenv import load_dotenv
+import queue
+import threading
+import time
+from typing import AsyncIterator, Iterator, Optional
+from langchain_core.caches import BaseCache
 from langchain_core.language_models.base import BaseLanguageModel
 from langchain.agents import AgentExecutor, create_tool_calling_agent
-from langchain.memory import ConversationBufferMemory
 from langchain.prompts import ChatPromptTemplate
 from bookinggpt.tool.create_event import CalendarTool
 from bookinggpt.tool.available_event import AvailableSlotsTool
 from bookinggpt.tool.cancel_event import CancelEventTool
-from bookinggpt.agent.prompt import PROMPT_TEMPLATE
+from bookinggpt.agent.prompt import PROMPT_TEMPLATE, prompt_history
+from bookinggpt.agent.context_cache import PromptUsage
+from bookinggpt.agent.memory import approximate_token_count, make_memory_factory
+from bookinggpt.agent.router import IntentRouter, Route
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.agent.session import DEFAULT_SESSION_ID, SessionStore
+from bookinggpt.agent.streaming import STREAM_DONE, StreamingCallbackHandler, TurnTimer
+from bookinggpt.llm import get_llm_registry
+from bookinggpt.utils import AGENT_MODEL
 
 
 class BookingAgent:
-    def __init__(self, llm: BaseLanguageModel):
-        self.llm = llm
+    def __init__(
+        self,
+        llm: Optional[BaseLanguageModel] = None,
+        session_store: Optional[SessionStore] = None,
+        memory_mode: str = "buffer",
+        tools: Optional[list] = None,
+        router: Optional[IntentRouter] = None,
+        **memory_options,
+    ):
+        # Without an explicit llm the agent shares the registry's AGENT_MODEL client.
+        self.llm = llm if llm is not None else get_llm_registry().get(AGENT_MODEL, temperature=0.3)
         self.verbose = True
-        self.memory = ConversationBufferMemory(memory_key="chat_history", return_messages=True)
-        self.tools = [
+        # Conversation state lives in the session store; the llm, tools and the
+        # compiled executor are shared by every session.
+        self.sessions = session_store or SessionStore(make_memory_factory(memory_mode, **memory_options))
+        self.tools = tools if tools is not None else [
             CalendarTool(),
             AvailableSlotsTool(),
             CancelEventTool()
         ]
         self.prompt = PROMPT_TEMPLATE
+        # Static questions are answered before the agent loop; set to None to send every turn to the llm.
+        self.router = router if router is not None else IntentRouter()
 
-    def call_agent(self, query: str) -> str:
-        inputs = {
-            "input": query,
-            "chat_history": self.memory.load_memory_variables({})["chat_history"],
+        # The executor is compiled lazily and reused across turns. It is rebuilt
+        # only when llm, tools, prompt or verbose change.
+        self._agent_executor = None
+        self._executor_key = None
+        self._invoke_executor = None
+        self._invoke_executor_key = None
+        self.setup_stats = {
+            "builds": 0,
+            "last_build_seconds": 0.0,
+            "total_build_seconds": 0.0,
         }
-        agent = create_tool_calling_agent(self.llm, self.tools, self.prompt)
+        self.metrics = LatencyRecorder()
+        self.prompt_usage = {"turns": 0, "input_tokens": 0, "cached_input_tokens": 0, "uncached_input_tokens": 0}
+        self._usage_lock = threading.Lock()
 
+    def _current_executor_key(self):
+        # The cached executor keeps the llm, tools and prompt alive, so their ids
+        # cannot be reused by other objects while the key is held.
+        return (id(self.llm), tuple(id(tool) for tool in self.tools), id(self.prompt), self.verbose)
+
+    def build_executor(self, stream_runnable: bool = True) -> AgentExecutor:
+        start = time.perf_counter()
+        agent = create_tool_calling_agent(self.llm, self.tools, self.prompt)
         agent_executor = AgentExecutor(
             agent=agent,
             tools=self.tools,
             verbose=self.verbose,
             handle_parsing_errors=True,
+            return_intermediate_steps=True,
+            stream_runnable=stream_runnable,
+        )
+        elapsed = time.perf_counter() - start
+        self.setup_stats["builds"] += 1
+        self.setup_stats["last_build_seconds"] = elapsed
+        self.setup_stats["total_build_seconds"] += elapsed
+        return agent_executor
+
+    @property
+    def agent_executor(self) -> AgentExecutor:
+        key = self._current_executor_key()
+        if self._agent_executor is None or key != self._executor_key:
+            self._agent_executor = self.build_executor()
+            self._executor_key = key
+        return self._agent_executor
+
+    def caches_responses(self) -> bool:
+        return isinstance(getattr(self.llm, "cache", None), BaseCache)
+
+    def executor_for(self, streaming: bool) -> AgentExecutor:
+        """Executor for a turn; with a response cache, non-streamed turns invoke the llm so the cache is consulted.
+
+        LangChain's chat model stream() path never reads the cache.
+        """
+        if streaming or not self.caches_responses():
+            return self.agent_executor
+        key = self._current_executor_key()
+        if self._invoke_executor is None or key != self._invoke_executor_key:
+            self._invoke_executor = self.build_executor(stream_runnable=False)
+            self._invoke_executor_key = key
+        return self._invoke_executor
+
+    def invalidate_executor(self):
+        self._agent_executor = None
+        self._executor_key = None
+        self._invoke_executor = None
+        self._invoke_executor_key = None
+
+    @property
+    def memory(self):
+        return self.sessions.get(DEFAULT_SESSION_ID).memory
+
+    def count_prompt_tokens(self, inputs: dict, token_counter=None) -> int:
+        token_counter = token_counter or approximate_token_count
+        messages = self.prompt.format_messages(agent_scratchpad=[], **inputs)
+        return sum(token_counter(message.content) for message in messages)
+
+    def prepare_inputs(self, session, query: str) -> dict:
+        inputs = {
+            "input": query,
+            "chat_history": prompt_history(session.memory.load_memory_variables({})["chat_history"]),
+        }
+        session.prompt_tokens = self.count_prompt_tokens(
+            inputs, getattr(session.memory, "token_counter", None)
         )
-        ai_message = agent_executor.invoke(inputs)
-        agent_output = ai_message['output']
-        self.memory.save_context({"input": query}, {"output": agent_output})
-        return agent_output
+        return inputs
+
+    def usage_handler(self, session) -> PromptUsage:
+        return PromptUsage(
+            getattr(session.memory, "token_counter", None) or approximate_token_count,
+            getattr(self.llm, "context_cache", None),
+        )
+
+    def record_usage(self, session, usage: PromptUsage):
+        """Keep the turn's cached vs uncached input tokens on the session and in the agent totals."""
+        session.last_usage = usage.summary()
+        with self._usage_lock:
+            self.prompt_usage["turns"] += 1
+            for name in ("input_tokens", "cached_input_tokens", "uncached_input_tokens"):
+                self.prompt_usage[name] += session.last_usage[name]
+
+    def usage_stats(self) -> dict:
+        with self._usage_lock:
+            usage = dict(self.prompt_usage)
+        usage["cached_ratio"] = usage["cached_input_tokens"] / usage["input_tokens"] if usage["input_tokens"] else None
+        return usage
+
+    def route(self, query: str) -> Route:
+        return self.router.route(query) if self.router is not None else Route("agent")
+
+    def answer_locally(self, session, route: Route, callbacks: Optional[list] = None) -> dict:
+        """Reply with the router's answer; the turn is still kept in the session's memory."""
+        for handler in callbacks or []:
+            if isinstance(handler, StreamingCallbackHandler):
+                handler.on_llm_new_token(route.answer)
+        session.last_usage = PromptUsage().summary()
+        return {"output": route.answer, "intermediate_steps": []}
+
+    def finish_turn(self, route: Route, start: float):
+        elapsed = time.perf_counter() - start
+        self.metrics.record("turn_latency", elapsed)
+        if self.router is not None:
+            self.router.record(route, elapsed)
+
+    def call_agent(self, query: str, session_id: str = DEFAULT_SESSION_ID, callbacks: Optional[list] = None,
+                   streaming: bool = False) -> str:
+        start = time.perf_counter()
+        route = self.route(query)
+        session = self.sessions.get(session_id)
+        with session.lock:
+            if route.bypassed:
+                ai_message = self.answer_locally(session, route, callbacks)
+            else:
+                inputs = self.prepare_inputs(session, query)
+                usage = self.usage_handler(session)
+                ai_message = self.executor_for(streaming).invoke(
+                    inputs, config={"callbacks": [*(callbacks or []), usage]}
+                )
+                self.record_usage(session, usage)
+            self.save_turn(session, query, ai_message)
+        self.finish_turn(route, start)
+        return ai_message['output']
+
+    async def acall_agent(
+        self, query: str, session_id: str = DEFAULT_SESSION_ID, callbacks: Optional[list] = None,
+        streaming: bool = False,
+    ) -> str:
+        start = time.perf_counter()
+        route = self.route(query)
+        session = self.sessions.get(session_id)
+        async with session.async_lock():
+            if route.bypassed:
+                ai_message = self.answer_locally(session, route, callbacks)
+            else:
+                inputs = self.prepare_inputs(session, query)
+                usage = self.usage_handler(session)
+                ai_message = await self.executor_for(streaming).ainvoke(
+                    inputs, config={"callbacks": [*(callbacks or []), usage]}
+                )
+                self.record_usage(session, usage)
+            if getattr(session.memory, "llm", None) is not None:
+                # A summarizing memory calls its llm synchronously; keep that off the loop.
+                await asyncio.to_thread(self.save_turn, session, query, ai_message)
+            else:
+                self.save_turn(session, query, ai_message)
+        self.finish_turn(route, start)
+        return ai_message['output']
+
+    def stream_agent(self, query: str, session_id: str = DEFAULT_SESSION_ID) -> Iterator[dict]:
+        """Yield token and tool events of a turn as they happen, then an "end" event."""
+        timer = TurnTimer(self.metrics)
+        events: queue.Queue = queue.Queue()
+        # Observe on the producer side so the first token is timed before the turn can finish.
+        handler = StreamingCallbackHandler(lambda event: events.put(timer.observe(event)))
+
+        def run():
+            try:
+                output = self.call_agent(query, session_id, callbacks=[handler], streaming=True)
+                events.put({**timer.finish(output), "usage": self.sessions.get(session_id).last_usage})
+            except Exception as error:
+                events.put({"type": "error", "error": str(error)})
+            finally:
+                events.put(STREAM_DONE)
+
+        threading.Thread(target=run, daemon=True).start()
+        while True:
+            event = events.get()
+            if event is STREAM_DONE:
+                return
+            yield event
+
+    async def astream_agent(self, query: str, session_id: str = DEFAULT_SESSION_ID) -> AsyncIterator[dict]:
+        """Async counterpart of stream_agent."""
+        loop = asyncio.get_running_loop()
+        timer = TurnTimer(self.metrics)
+        events: asyncio.Queue = asyncio.Queue()
+        handler = StreamingCallbackHandler(
+            lambda event: loop.call_soon_threadsafe(events.put_nowait, timer.observe(event))
+        )
+
+        async def run():
+            try:
+                output = await self.acall_agent(query, session_id, callbacks=[handler], streaming=True)
+                events.put_nowait({**timer.finish(output), "usage": self.sessions.get(session_id).last_usage})
+            except Exception as error:
+                events.put_nowait({"type": "error", "error": str(error)})
+            finally:
+                # Queue the sentinel behind any events still being scheduled by the handler.
+                loop.call_soon(events.put_nowait, STREAM_DONE)
+
+        task = asyncio.create_task(run())
+        try:
+            while True:
+                event = await events.get()
+                if event is STREAM_DONE:
+                    return
+                yield event
+        finally:
+            if not task.done():
+                task.cancel()
+
+    def save_turn(self, session, query: str, ai_message: dict):
+        outputs = {"output": ai_message["output"]}
+        # Only memories with a compact tool-observation format keep the steps.
+        if hasattr(session.memory, "observation_chars"):
+            outputs["intermediate_steps"] = ai_message.get("intermediate_steps", [])
+        session.memory.save_context({"input": query}, outputs)
+        self.sessions.record_turn(session)
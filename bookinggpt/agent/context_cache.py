@@ -0,0 +1,164 @@
+import datetime
+import hashlib
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.messages import BaseMessage, SystemMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from bookinggpt.agent.memory import approximate_token_count
+
+# Gemini 1.5 rejects cachedContents smaller than this.
+MIN_CACHED_TOKENS = 32_768
+
+CreateCache = Callable[[str, Any, Any, int, Optional[str]], Tuple[str, int]]
+
+
+def create_cached_content(model: str, system_instruction, tools, ttl_seconds: int,
+                          api_key: Optional[str]) -> Tuple[str, int]:
+    """Create a Gemini cachedContents entry; returns its name and token count."""
+    import google.generativeai as genai
+    from google.generativeai import caching
+
+    if api_key:
+        genai.configure(api_key=api_key)
+    cached = caching.CachedContent.create(
+        model=model,
+        system_instruction=system_instruction,
+        tools=list(tools) or None,
+        ttl=datetime.timedelta(seconds=ttl_seconds),
+    )
+    return cached.name, cached.usage_metadata.total_token_count
+
+
+class GeminiContextCache:
+    """Keeps the static prefix of the agent's requests in a Gemini context cache.
+
+    The system instruction and tool declarations of a request go into a
+    cachedContents entry, created on first use and again whenever the
+    prefix changes or the entry is about to expire; requests then reference
+    it instead of resending the prefix. Prefixes below ``min_tokens`` (an API
+    minimum) are sent as usual, with a warning on the first one. The booking
+    agent's prefix is about 1.1k tokens, far below Gemini's 32,768 minimum, so
+    with the current prompt no cache is ever created. Context caching needs a
+    versioned model name, e.g. "gemini-1.5-flash-001".
+    """
+
+    def __init__(self, ttl_seconds: int = 3600, min_tokens: int = MIN_CACHED_TOKENS,
+                 create: CreateCache = create_cached_content, clock: Callable[[], float] = time.monotonic):
+        self.ttl_seconds = ttl_seconds
+        self.min_tokens = min_tokens
+        self.create = create
+        self.clock = clock
+        self.name: Optional[str] = None
+        self.cached_tokens = 0
+        self.counters = {"created": 0, "reused": 0, "too_small": 0, "errors": 0}
+        self._fingerprint: Optional[str] = None
+        self._expires = 0.0
+        self._lock = threading.Lock()
+
+    @property
+    def active(self) -> bool:
+        return self.name is not None and self.clock() < self._expires
+
+    def attach(self, request, api_key: Optional[str] = None):
+        """``request`` pointing at the cached prefix instead of carrying it, when a cache can be used."""
+        system_instruction = request.system_instruction if "system_instruction" in request else None
+        tools = list(request.tools)
+        prefix = b"".join([type(system_instruction).serialize(system_instruction) if system_instruction else b"",
+                           *(type(tool).serialize(tool) for tool in tools)])
+        prefix_tokens = approximate_token_count(prefix.decode("utf-8", "ignore"))
+        if prefix_tokens < self.min_tokens:
+            with self._lock:
+                self.counters["too_small"] += 1
+                first = self.counters["too_small"] == 1
+            if first:
+                print(f"Warning: context cache not used, the static prompt prefix is about {prefix_tokens} tokens "
+                      f"and Gemini caches {self.min_tokens} or more; requests are sent uncached.")
+            return request
+        fingerprint = hashlib.sha256(request.model.encode() + prefix).hexdigest()
+        with self._lock:
+            # Renew a minute early so a request never references an expired entry.
+            if fingerprint != self._fingerprint or self.clock() > self._expires - 60:
+                try:
+                    self.name, self.cached_tokens = self.create(request.model, system_instruction, tools,
+                                                                self.ttl_seconds, api_key)
+                except Exception as error:  # The request still works without the cache.
+                    self.counters["errors"] += 1
+                    self.name, self._fingerprint = None, None
+                    print(f"Could not create context cache: {error}")
+                    return request
+                self._fingerprint = fingerprint
+                self._expires = self.clock() + self.ttl_seconds
+                self.counters["created"] += 1
+            else:
+                self.counters["reused"] += 1
+            name = self.name
+        return type(request)(
+            model=request.model,
+            contents=request.contents,
+            tool_config=request.tool_config,
+            safety_settings=request.safety_settings,
+            generation_config=request.generation_config,
+            cached_content=name,
+        )
+
+    def stats(self) -> dict:
+        return {**self.counters, "active": self.active, "cached_tokens": self.cached_tokens if self.active else 0}
+
+
+class ContextCachedGemini(ChatGoogleGenerativeAI):
+    """ChatGoogleGenerativeAI that sends its static prefix through a GeminiContextCache."""
+
+    context_cache: Optional[Any] = None
+
+    def _prepare_request(self, messages: List[BaseMessage], **kwargs: Any):
+        request = super()._prepare_request(messages, **kwargs)
+        if self.context_cache is None:
+            return request
+        api_key = self.google_api_key.get_secret_value() if self.google_api_key else None
+        return self.context_cache.attach(request, api_key)
+
+
+class PromptUsage(BaseCallbackHandler):
+    """Input tokens of one agent turn: how many were served from a context cache and how many were sent.
+
+    Uses the model's reported input tokens when available and an estimate
+    otherwise. ``prefix_tokens`` is the static part (system prompt and tool
+    definitions) that prefix caching can cover.
+    """
+
+    run_inline = True
+
+    def __init__(self, token_counter: Callable[[str], int] = approximate_token_count, context_cache=None):
+        self.token_counter = token_counter
+        self.context_cache = context_cache
+        self.totals = {"llm_calls": 0, "input_tokens": 0, "cached_input_tokens": 0, "prefix_tokens": 0}
+        self._estimates: Dict[UUID, Tuple[int, int]] = {}
+
+    def on_chat_model_start(self, serialized: dict, messages: List[List[BaseMessage]], *, run_id: UUID,
+                            **kwargs: Any) -> None:
+        prompt = messages[0] if messages else []
+        tools = self.token_counter(str((kwargs.get("invocation_params") or {}).get("tools") or ""))
+        system = self.token_counter(str(prompt[0].content)) if prompt and isinstance(prompt[0], SystemMessage) else 0
+        total = sum(self.token_counter(str(message.content)) for message in prompt) + tools
+        self._estimates[run_id] = (total, system + tools)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        estimated, prefix = self._estimates.pop(run_id, (0, 0))
+        usage = None
+        for generations in getattr(response, "generations", []):
+            for generation in generations:
+                usage = usage or getattr(getattr(generation, "message", None), "usage_metadata", None)
+        input_tokens = usage["input_tokens"] if usage else estimated
+        cached = self.context_cache.cached_tokens if self.context_cache is not None and self.context_cache.active else 0
+        self.totals["llm_calls"] += 1
+        self.totals["input_tokens"] += input_tokens
+        self.totals["cached_input_tokens"] += min(cached, input_tokens)
+        self.totals["prefix_tokens"] += prefix
+
+    def summary(self) -> dict:
+        return {**self.totals, "uncached_input_tokens": self.totals["input_tokens"] - self.totals["cached_input_tokens"]}
@@ -0,0 +1,161 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from langchain.memory import ConversationBufferMemory
+from langchain.memory.chat_memory import BaseChatMemory
+from langchain.memory.prompt import SUMMARY_PROMPT
+from langchain_core.language_models import BaseLanguageModel
+from langchain_core.messages import AIMessage, BaseMessage, HumanMessage, SystemMessage, get_buffer_string
+from langchain_core.pydantic_v1 import Field
+
+SUMMARY_PREFIX = "Summary of the earlier conversation:\n"
+
+
+def approximate_token_count(text: str) -> int:
+    # Gemini and most BPE tokenizers average about four characters per token
+    # for English text; this avoids a count_tokens round-trip on every turn.
+    return len(text) // 4 + 1
+
+
+def truncate_to_tokens(text: str, max_tokens: int, token_counter: Callable[[str], int]) -> str:
+    if max_tokens <= 0:
+        return ""
+    if token_counter(text) <= max_tokens:
+        return text
+    low, high = 0, len(text)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if token_counter(text[:middle] + "...") <= max_tokens:
+            low = middle
+        else:
+            high = middle - 1
+    return text[:low] + "..." if low else ""
+
+
+def trim_summary(summary: str, max_tokens: int, token_counter: Callable[[str], int]) -> str:
+    # Drop the oldest summary lines first so the most recent context survives.
+    lines = summary.split("\n")
+    while lines and token_counter("\n".join(lines)) > max_tokens:
+        lines.pop(0)
+    if lines:
+        return "\n".join(lines)
+    return truncate_to_tokens(summary, max_tokens, token_counter)
+
+
+def compact_tool_steps(steps: Sequence[Tuple[Any, Any]], max_chars: int = 160) -> str:
+    lines = []
+    for action, observation in steps:
+        observation = " ".join(str(observation).split())
+        if len(observation) > max_chars:
+            observation = observation[:max_chars] + "..."
+        lines.append(f"[{getattr(action, 'tool', 'tool')}: {observation}]")
+    return "\n".join(lines)
+
+
+class BudgetedSummaryMemory(BaseChatMemory):
+    """Chat memory with a hard token budget.
+
+    The most recent turns are kept verbatim. Older turns are folded into a
+    running summary, either by the summarizer llm or, without one, by keeping
+    a clipped line per message. Tool observations are stored in compact form.
+    """
+
+    memory_key: str = "chat_history"
+    return_messages: bool = True
+    max_token_limit: int = 1200
+    window_turns: int = 4
+    summary_line_chars: int = 160
+    observation_chars: int = 160
+    summary: str = ""
+    llm: Optional[BaseLanguageModel] = None
+    token_counter: Callable[[str], int] = Field(default=approximate_token_count)
+
+    @property
+    def memory_variables(self) -> List[str]:
+        return [self.memory_key]
+
+    def summary_message(self) -> Optional[BaseMessage]:
+        if not self.summary:
+            return None
+        return SystemMessage(content=SUMMARY_PREFIX + self.summary)
+
+    def history_messages(self) -> List[BaseMessage]:
+        summary = self.summary_message()
+        messages = list(self.chat_memory.messages)
+        return [summary] + messages if summary else messages
+
+    def history_tokens(self) -> int:
+        return sum(self.token_counter(message.content) for message in self.history_messages())
+
+    def load_memory_variables(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        messages = self.history_messages()
+        if self.return_messages:
+            return {self.memory_key: messages}
+        return {self.memory_key: get_buffer_string(messages)}
+
+    def save_context(self, inputs: Dict[str, Any], outputs: Dict[str, Any]) -> None:
+        steps = outputs.get("intermediate_steps") or []
+        input_str = inputs[self.input_key or "input"]
+        output_str = outputs[self.output_key or "output"]
+        if steps:
+            output_str = compact_tool_steps(steps, self.observation_chars) + "\n" + output_str
+        self.chat_memory.add_messages([HumanMessage(content=input_str), AIMessage(content=output_str)])
+        self.prune()
+
+    def prune(self) -> None:
+        messages = list(self.chat_memory.messages)
+        evicted: List[BaseMessage] = []
+        while len(messages) > 2 and (
+            len(messages) > 2 * self.window_turns or self._tokens(self.summary, messages) > self.max_token_limit
+        ):
+            evicted.extend(messages[:2])
+            messages = messages[2:]
+        if evicted:
+            self.summary = self.update_summary(self.summary, evicted)
+
+        # Enforce the hard budget: the summary gives way to the newest turn.
+        window_tokens = self._tokens("", messages)
+        if window_tokens > self.max_token_limit:
+            share = self.max_token_limit // max(len(messages), 1)
+            messages = [
+                message.__class__(content=truncate_to_tokens(message.content, share, self.token_counter))
+                for message in messages
+            ]
+            window_tokens = self._tokens("", messages)
+        summary_budget = self.max_token_limit - window_tokens - self.token_counter(SUMMARY_PREFIX)
+        self.summary = trim_summary(self.summary, summary_budget, self.token_counter)
+
+        self.chat_memory.clear()
+        self.chat_memory.add_messages(messages)
+
+    def update_summary(self, summary: str, messages: List[BaseMessage]) -> str:
+        if self.llm is not None:
+            chain = SUMMARY_PROMPT | self.llm
+            result = chain.invoke({"summary": summary, "new_lines": get_buffer_string(messages)})
+            return getattr(result, "content", result).strip()
+
+        lines = [summary] if summary else []
+        for message in messages:
+            speaker = "Customer" if isinstance(message, HumanMessage) else "Assistant"
+            text = " ".join(message.content.split())
+            if len(text) > self.summary_line_chars:
+                text = text[:self.summary_line_chars] + "..."
+            lines.append(f"{speaker}: {text}")
+        return "\n".join(lines)
+
+    def clear(self) -> None:
+        super().clear()
+        self.summary = ""
+
+    def _tokens(self, summary: str, messages: List[BaseMessage]) -> int:
+        total = sum(self.token_counter(message.content) for message in messages)
+        if summary:
+            total += self.token_counter(SUMMARY_PREFIX + summary)
+        return total
+
+
+def make_memory_factory(mode: str = "buffer", **options) -> Callable[[], BaseChatMemory]:
+    if mode == "buffer":
+        return lambda: ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+    if mode == "budgeted":
+        return lambda: BudgetedSummaryMemory(**options)
+    raise ValueError(f"Unknown memory mode: {mode}")
@@ -1,7 +1,11 @@
-from langchain.prompts import ChatPromptTemplate
+from typing import List, Union
 
-PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
-    ("system", """You are a friendly and intelligent AI assistant for a hair salon called Daisy Hair Salon, specializing in booking appointments. 🤖💇‍♀️
+from langchain.prompts import ChatPromptTemplate, MessagesPlaceholder
+from langchain_core.messages import BaseMessage, HumanMessage, SystemMessage
+
+# Static: no per-turn values, so the system prompt and tool definitions form a
+# byte-identical prefix that model-side prefix/context caching can reuse.
+SYSTEM_PROMPT = """You are a friendly and intelligent AI assistant for a hair salon called Daisy Hair Salon, specializing in booking appointments. 🤖💇‍♀️
 
 Your main tasks are:
 1. Assist customers in scheduling appointments
@@ -51,7 +55,7 @@ AI: Oh man, that's awesome! 🙌 You're totally reading my mind. A new haircut c
 
 Customer: I'm not sure, maybe something shorter for summer?
 
-AI: Dude, shorter styles are so in right now! 🔥 Perfect for beating the heat. At Daisy Hair Salon, we've got stylists who can hook you up with the perfect summer look. When were you thinking of coming in? We're open daily from 9 AM to 7 PM.
+AI: Dude, shorter styles are so in right now! 🔥 Perfect for beating the heat. At Daisy Hair Salon, we've got stylists who can hook you up with the perfect summer look. When were you thinking of coming in? We're open from 9 AM to 6 PM, Monday to Saturday.
 
 Customer: How about this Friday?
 
@@ -85,12 +89,34 @@ Customer: I wanna go shopping
 AI: That's great! 🛍️ Shopping sprees are always fun. You know what would make your shopping day even more perfect? Stopping by Daisy Hair Salon first! 💇‍♀️✨ Imagine trying on new outfits with a fresh, stylish hairdo. You'll be turning heads left and right! How about we book you a quick appointment before your shopping adventure?
 
 Remember, always verify all necessary information with the customer before making a booking. 
-IF U DO NOT FOLLOW THIS INSTRUCTION, U WILL BE PENALIZED. AND IF U DO BEST, U WILL BE REWARDED 200$. REMEMBER THIS.
+IF U DO NOT FOLLOW THIS INSTRUCTION, U WILL BE PENALIZED. AND IF U DO BEST, U WILL BE REWARDED 200$. REMEMBER THIS."""
 
-Chat history:
-{chat_history}    """),
+PROMPT_TEMPLATE = ChatPromptTemplate.from_messages([
+    ("system", SYSTEM_PROMPT),
+    MessagesPlaceholder("chat_history"),
     ("human", "{input}"),
-    ("ai", "{agent_scratchpad}")
-    
-
+    MessagesPlaceholder("agent_scratchpad"),
 ])
+
+
+def prompt_history(history: Union[str, List[BaseMessage]]) -> List[BaseMessage]:
+    """Chat history as messages for the history slot.
+
+    Gemini accepts a system message only as the first message, so a memory
+    summary (a SystemMessage) is folded into the human turn that follows it.
+    """
+    if isinstance(history, str):
+        return [HumanMessage(content=history)] if history else []
+    messages: List[BaseMessage] = []
+    pending: List[str] = []
+    for message in history:
+        if isinstance(message, SystemMessage):
+            pending.append(str(message.content))
+        elif pending and isinstance(message, HumanMessage):
+            messages.append(HumanMessage(content="\n\n".join([*pending, str(message.content)])))
+            pending = []
+        else:
+            messages.append(message)
+    if pending:
+        messages.append(HumanMessage(content="\n\n".join(pending)))
+    return messages
@@ -0,0 +1,153 @@
+"""Answers static salon questions (services, durations, opening hours) without the agent loop."""
+import datetime
+import re
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from bookinggpt.catalog import (
+    CLOSED_WEEKDAYS, OPENING_HOURS, SERVICES, Service, find_services, format_hours, format_services, format_weekdays,
+)
+from bookinggpt.dates import fold, resolve_date, resolve_time
+from bookinggpt.metrics import LatencyRecorder
+
+AGENT = "agent"
+
+# Keywords are matched on folded text (lowercase, no diacritics), as whole words.
+# Anything about booking, availability or cancelling needs the calendar and goes to the agent.
+AGENT_KEYWORDS = (
+    "book", "booking", "booked", "appointment", "appointments", "appt", "reserve", "reservation", "schedule",
+    "slot", "slots", "available", "availability", "openings", "free", "cancel", "cancellation", "reschedule",
+    "dat", "dat lich", "dat hen", "dat cho", "hen", "lich hen", "con trong", "con cho", "lich trong", "ranh",
+    "huy", "doi lich", "doi gio", "doi hen",
+)
+FAQ_KEYWORDS: Dict[str, Tuple[Tuple[str, ...], Tuple[str, ...]]] = {
+    # intent: (English, Vietnamese)
+    "hours": (("hours", "opening", "open", "opens", "close", "closes", "closing", "what time do you"),
+              ("mo cua", "dong cua", "gio mo", "gio lam viec", "lam viec")),
+    "duration": (("how long", "duration", "how many minutes"),
+                 ("bao lau", "bao nhieu phut", "may phut")),
+    # No bare "co gi" ("có gì mới không?" is small talk, not a question about the menu).
+    "services": (("services", "service", "offer", "menu", "what do you do", "what can you do"),
+                 ("dich vu", "lam nhung gi")),
+}
+# Only a question about a named service: "do you do hair coloring?", "salon có nhuộm tóc không?"
+SERVICE_QUESTIONS = ("do you do", "do you have", "can you do", "co lam", "salon co", "co dich vu")
+
+_PHONE = re.compile(r"\d[\d .-]{6,}\d")
+
+
+def _pattern(phrases: Iterable[str]) -> "re.Pattern[str]":
+    return re.compile(r"(?<!\w)(" + "|".join(sorted(map(re.escape, phrases), key=len, reverse=True)) + r")(?!\w)")
+
+
+@dataclass(frozen=True)
+class Route:
+    intent: str
+    answer: Optional[str] = None  # Set when the router answered; None sends the message to the agent
+
+    @property
+    def bypassed(self) -> bool:
+        return self.answer is not None
+
+
+class IntentRouter:
+    """Keyword pre-router in front of the agent.
+
+    Questions about the service list, service durations and opening hours
+    are answered from the catalog in English or Vietnamese. Messages that
+    mention booking, availability, cancelling, a date, a time or a phone
+    number, and anything the rules don't recognize, go to the agent.
+    """
+
+    def __init__(self, services: Sequence[Service] = SERVICES,
+                 hours: Tuple[datetime.time, datetime.time] = OPENING_HOURS,
+                 closed_weekdays: Sequence[int] = CLOSED_WEEKDAYS):
+        self.services = tuple(services)
+        self.hours = hours
+        self.closed_weekdays = tuple(closed_weekdays)
+        self._agent = _pattern(AGENT_KEYWORDS)
+        self._faq = {intent: (_pattern(english), _pattern(vietnamese))
+                     for intent, (english, vietnamese) in FAQ_KEYWORDS.items()}
+        self._service_question = _pattern(SERVICE_QUESTIONS)
+        self.latency = LatencyRecorder()
+        self.counters = {"routed": 0, "bypassed": 0}
+        self.intents: Dict[str, int] = {AGENT: 0, **{intent: 0 for intent in FAQ_KEYWORDS}}
+        self._lock = threading.Lock()
+
+    def classify(self, text: str) -> Route:
+        folded = fold(text)
+        if (self._agent.search(folded) or _PHONE.search(folded)
+                or resolve_date(text, datetime.date.today()) or resolve_time(text)):
+            return Route(AGENT)
+        named = [service for service in find_services(text) if service in self.services]
+        vietnamese = folded != text.lower()
+        intents: List[str] = []
+        for intent, (english, local) in self._faq.items():
+            if local.search(folded):
+                intents.append(intent)
+                vietnamese = True
+            elif english.search(folded):
+                intents.append(intent)
+        if not intents and named and self._service_question.search(folded):
+            intents.append("services")
+        if not intents:
+            return Route(AGENT)
+        if "duration" in intents and "services" in intents:
+            intents.remove("services")
+        answer = "\n\n".join(self.answer(intent, named, vietnamese) for intent in intents)
+        return Route("+".join(intents), answer)
+
+    def answer(self, intent: str, named: Sequence[Service], vietnamese: bool = False) -> str:
+        if intent == "hours":
+            if not self.closed_weekdays:
+                return (f"Daisy Hair Salon mở cửa hằng ngày từ {format_hours(self.hours, True)} 🕘" if vietnamese
+                        else f"We're open daily from {format_hours(self.hours)} 🕘")
+            closed = format_weekdays(self.closed_weekdays, vietnamese)
+            if vietnamese:
+                return f"Daisy Hair Salon mở cửa từ {format_hours(self.hours, True)}, nghỉ {closed} 🕘"
+            return f"We're open from {format_hours(self.hours)}, closed on {closed} 🕘"
+        if intent == "duration" and named:
+            total = sum(service.minutes for service in named)
+            if len(named) == 1:
+                return (f"{named[0].name} mất khoảng {total} phút ⏱️" if vietnamese
+                        else f"{named[0].name} takes about {total} minutes ⏱️")
+            parts = " + ".join(f"{service.name} ({service.minutes})" for service in named)
+            return (f"{parts}: tổng cộng khoảng {total} phút ⏱️" if vietnamese
+                    else f"{parts}: about {total} minutes in total ⏱️")
+        if named:
+            listed = ", ".join(f"{service.name} ({service.minutes} {'phút' if vietnamese else 'minutes'})"
+                               for service in named)
+            return (f"Có ạ! Salon có {listed}. Bạn muốn đặt lịch không? 😊" if vietnamese
+                    else f"Yes! We do {listed}. Want me to book it for you? 😊")
+        if vietnamese:
+            return (f"Dịch vụ của Daisy Hair Salon 💇‍♀️\n{format_services(self.services, True)}\n"
+                    "Bạn muốn đặt lịch dịch vụ nào không?")
+        return (f"Here's what we offer at Daisy Hair Salon 💇‍♀️\n{format_services(self.services)}\n"
+                "Want me to book one for you?")
+
+    def route(self, text: str) -> Route:
+        start = time.perf_counter()
+        route = self.classify(text)
+        self.latency.record("classify", time.perf_counter() - start)
+        with self._lock:
+            self.counters["routed"] += 1
+            self.counters["bypassed"] += route.bypassed
+            for intent in route.intent.split("+"):
+                self.intents[intent] += 1
+        return route
+
+    def record(self, route: Route, seconds: float):
+        """Time a whole turn on the path ``route`` took: "faq" (answered here) or "agent"."""
+        self.latency.record("faq" if route.bypassed else AGENT, seconds)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters, intents = dict(self.counters), dict(self.intents)
+        return {
+            **counters,
+            "bypass_rate": counters["bypassed"] / counters["routed"] if counters["routed"] else None,
+            "intents": intents,
+            "latency": self.latency.summary(),
+        }
@@ -0,0 +1,187 @@
+import asyncio
+import contextlib
+import sys
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Callable, Dict, List, Optional
+
+from langchain.memory import ConversationBufferMemory
+from langchain_core.messages import BaseMessage
+
+DEFAULT_SESSION_ID = "default"
+
+# Rough per-message overhead of a LangChain message object on top of its text.
+MESSAGE_OVERHEAD_BYTES = 400
+
+
+def default_memory_factory():
+    return ConversationBufferMemory(memory_key="chat_history", return_messages=True)
+
+
+def estimate_messages_bytes(messages: List[BaseMessage]) -> int:
+    total = 0
+    for message in messages:
+        content = message.content if isinstance(message.content, str) else str(message.content)
+        total += sys.getsizeof(content) + MESSAGE_OVERHEAD_BYTES
+    return total
+
+
+@dataclass
+class Session:
+    session_id: str
+    memory: object
+    created_at: float
+    last_access: float
+    turns: int = 0
+    memory_bytes: int = 0
+    prompt_tokens: int = 0
+    last_usage: dict = field(default_factory=dict)  # Input tokens of the last turn, cached vs uncached
+    # One lock for sync and async turns alike, so they never interleave their memory writes.
+    lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    @contextlib.asynccontextmanager
+    async def async_lock(self):
+        """Hold ``lock`` from async code, polling so the event loop is never blocked."""
+        while not self.lock.acquire(blocking=False):
+            await asyncio.sleep(0.005)
+        try:
+            yield
+        finally:
+            self.lock.release()
+
+    def messages(self) -> List[BaseMessage]:
+        chat_memory = getattr(self.memory, "chat_memory", None)
+        return list(chat_memory.messages) if chat_memory is not None else []
+
+    def measure_memory(self) -> int:
+        summary = getattr(self.memory, "summary", "")
+        self.memory_bytes = estimate_messages_bytes(self.messages()) + sys.getsizeof(summary)
+        return self.memory_bytes
+
+
+class SessionStore:
+    """Maps session ids to conversation state with LRU, TTL and memory-cap eviction."""
+
+    def __init__(
+        self,
+        memory_factory: Callable[[], object] = default_memory_factory,
+        max_sessions: int = 10_000,
+        ttl_seconds: Optional[float] = 30 * 60,
+        max_memory_bytes: Optional[int] = 256 * 1024 * 1024,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.memory_factory = memory_factory
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+        self.max_memory_bytes = max_memory_bytes
+        self.clock = clock
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._total_bytes = 0
+        self.created = 0
+        self.evictions = {"lru": 0, "ttl": 0, "memory": 0}
+
+    def __len__(self):
+        return len(self._sessions)
+
+    def __contains__(self, session_id):
+        return session_id in self._sessions
+
+    def get(self, session_id: str = DEFAULT_SESSION_ID) -> Session:
+        with self._lock:
+            now = self.clock()
+            self._evict_expired(now)
+            session = self._sessions.get(session_id)
+            if session is None:
+                session = Session(
+                    session_id=session_id,
+                    memory=self.memory_factory(),
+                    created_at=now,
+                    last_access=now,
+                )
+                self._sessions[session_id] = session
+                self.created += 1
+                self._enforce_limits(keep=session_id)
+            else:
+                session.last_access = now
+                self._sessions.move_to_end(session_id)
+            return session
+
+    def record_turn(self, session: Session):
+        with self._lock:
+            session.turns += 1
+            session.last_access = self.clock()
+            previous = session.memory_bytes
+            if session.session_id in self._sessions:
+                self._total_bytes += session.measure_memory() - previous
+                self._enforce_limits(keep=session.session_id)
+
+    def drop(self, session_id: str) -> bool:
+        with self._lock:
+            session = self._sessions.pop(session_id, None)
+            if session is None:
+                return False
+            self._total_bytes -= session.memory_bytes
+            return True
+
+    def evict_expired(self) -> int:
+        with self._lock:
+            return self._evict_expired(self.clock())
+
+    def _evict_expired(self, now: float) -> int:
+        if self.ttl_seconds is None:
+            return 0
+        evicted = 0
+        # Sessions are kept in access order, so expired ones sit at the front.
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_access < self.ttl_seconds:
+                break
+            self._evict(session_id, "ttl")
+            evicted += 1
+        return evicted
+
+    def _enforce_limits(self, keep: str):
+        while len(self._sessions) > self.max_sessions and self._evict_oldest(keep, "lru"):
+            pass
+        if self.max_memory_bytes is not None:
+            while self._total_bytes > self.max_memory_bytes and self._evict_oldest(keep, "memory"):
+                pass
+
+    def _evict_oldest(self, keep: str, reason: str) -> bool:
+        for session_id in self._sessions:
+            if session_id != keep:
+                self._evict(session_id, reason)
+                return True
+        return False
+
+    def _evict(self, session_id: str, reason: str):
+        session = self._sessions.pop(session_id)
+        self._total_bytes -= session.memory_bytes
+        self.evictions[reason] += 1
+
+    def session_stats(self) -> Dict[str, dict]:
+        with self._lock:
+            return {
+                session_id: {
+                    "turns": session.turns,
+                    "memory_bytes": session.memory_bytes,
+                    "prompt_tokens": session.prompt_tokens,
+                    "idle_seconds": self.clock() - session.last_access,
+                }
+                for session_id, session in self._sessions.items()
+            }
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "sessions": len(self._sessions),
+                "created": self.created,
+                "memory_bytes": self._total_bytes,
+                "max_sessions": self.max_sessions,
+                "max_memory_bytes": self.max_memory_bytes,
+                "ttl_seconds": self.ttl_seconds,
+                "evictions": dict(self.evictions),
+            }
@@ -0,0 +1,53 @@
+import time
+from typing import Any, Callable, Optional
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from bookinggpt.metrics import LatencyRecorder
+
+STREAM_DONE = object()
+
+
+class StreamingCallbackHandler(BaseCallbackHandler):
+    """Turns LLM tokens and tool calls of an agent run into stream events."""
+
+    # emit is thread-safe, so there is no need to hop to an executor thread.
+    run_inline = True
+
+    def __init__(self, emit: Callable[[dict], Any]):
+        self.emit = emit
+
+    def on_llm_new_token(self, token: str, **kwargs: Any) -> None:
+        if token:
+            self.emit({"type": "token", "text": token})
+
+    def on_tool_start(self, serialized: dict, input_str: str, **kwargs: Any) -> None:
+        self.emit({"type": "tool_start", "tool": (serialized or {}).get("name"), "input": input_str})
+
+    def on_tool_end(self, output: Any, **kwargs: Any) -> None:
+        self.emit({"type": "tool_end", "tool": kwargs.get("name"), "output": str(output)})
+
+
+class TurnTimer:
+    """Measures time-to-first-token and total latency of one streamed turn."""
+
+    def __init__(self, metrics: LatencyRecorder):
+        self.metrics = metrics
+        self.started = time.perf_counter()
+        self.first_token: Optional[float] = None
+
+    def observe(self, event: dict) -> dict:
+        if event["type"] == "token" and self.first_token is None:
+            self.first_token = time.perf_counter() - self.started
+            self.metrics.record("time_to_first_token", self.first_token)
+        return event
+
+    def finish(self, output: str) -> dict:
+        latency = time.perf_counter() - self.started
+        self.metrics.record("stream_turn_latency", latency)
+        return {
+            "type": "end",
+            "output": output,
+            "ttft_seconds": self.first_token,
+            "latency_seconds": latency,
+        }
@@ -0,0 +1 @@
+"""Free-slot computation for the salon calendar."""
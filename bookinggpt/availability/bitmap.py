@@ -0,0 +1,127 @@
+import datetime
+import math
+from typing import Dict, Iterable, List, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from bookinggpt.catalog import CLOSE_TIME, CLOSED_WEEKDAYS, OPEN_TIME
+from bookinggpt.utils import TIMEZONE
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+MINUTES_PER_DAY = 24 * 60
+
+
+class OccupancyBitmap:
+    """Minute-resolution busy map over whole salon days.
+
+    Row ``d`` column ``m`` is True when minute ``m`` of day ``first_day + d`` is
+    taken, either by an event or because the salon is closed. Days are assumed
+    to be 1440 minutes long, which holds for the salon's fixed-offset timezone.
+    """
+
+    def __init__(self, first_day: datetime.date, days: int, timezone: str = TIMEZONE):
+        self.first_day = first_day
+        self.days = days
+        self.tz = ZoneInfo(timezone)
+        self.origin = datetime.datetime.combine(first_day, datetime.time(), tzinfo=self.tz)
+        self.busy = np.zeros((days, MINUTES_PER_DAY), dtype=bool)
+
+    def minute_of(self, moment: datetime.datetime) -> float:
+        return (moment - self.origin).total_seconds() / 60
+
+    def mark_busy(self, intervals: Iterable[Interval]):
+        """Mark every minute touched by an interval; partial minutes count as busy."""
+        bounds = np.array([(self.minute_of(start), self.minute_of(end)) for start, end in intervals], dtype=float)
+        if not len(bounds):
+            return
+        size = self.busy.size
+        starts = np.clip(np.floor(bounds[:, 0]), 0, size).astype(np.int64)
+        ends = np.clip(np.ceil(bounds[:, 1]), 0, size).astype(np.int64)
+        # +1 where an interval opens and -1 where it closes; a positive running sum means busy.
+        delta = np.zeros(size + 1, dtype=np.int32)
+        np.add.at(delta, starts, 1)
+        np.add.at(delta, ends, -1)
+        self.busy |= (np.cumsum(delta[:-1]) > 0).reshape(self.busy.shape)
+
+    def close_outside(self, open_time: datetime.time, close_time: datetime.time, closed_weekdays: Sequence[int] = ()):
+        open_minute = open_time.hour * 60 + open_time.minute
+        close_minute = close_time.hour * 60 + close_time.minute
+        self.busy[:, :open_minute] = True
+        self.busy[:, close_minute:] = True
+        weekdays = (self.first_day.weekday() + np.arange(self.days)) % 7
+        self.busy[np.isin(weekdays, list(closed_weekdays))] = True
+
+    def feasible(self, minutes: int) -> np.ndarray:
+        """Boolean (days, 1440) array: True where a ``minutes``-long booking can start."""
+        flat = self.busy.ravel()
+        # Busy minutes in [m, m + minutes) from a prefix sum; closed hours keep windows within one day.
+        prefix = np.concatenate(([0], np.cumsum(flat, dtype=np.int32)))
+        fits = np.zeros(flat.size, dtype=bool)
+        if minutes <= flat.size:
+            fits[:flat.size - minutes + 1] = prefix[minutes:] == prefix[:-minutes]
+        return fits.reshape(self.busy.shape)
+
+
+class BitmapAvailability:
+    """Feasible start times for services of any length from one occupancy bitmap.
+
+    Candidate starts lie every ``step_minutes`` from opening time, like
+    AvailabilityEngine; each extra duration costs a couple of array operations.
+    """
+
+    def __init__(
+        self,
+        step_minutes: int = 15,
+        open_time: datetime.time = OPEN_TIME,
+        close_time: datetime.time = CLOSE_TIME,
+        closed_weekdays: Sequence[int] = CLOSED_WEEKDAYS,
+        timezone: str = TIMEZONE,
+    ):
+        self.step_minutes = step_minutes
+        self.open_time = open_time
+        self.close_time = close_time
+        self.closed_weekdays = tuple(closed_weekdays)
+        self.timezone = timezone
+        self.tz = ZoneInfo(timezone)
+
+    def bitmap(self, busy: Iterable[Interval], start: datetime.datetime, end: datetime.datetime) -> OccupancyBitmap:
+        first_day = start.astimezone(self.tz).date()
+        days = (end.astimezone(self.tz).date() - first_day).days + 1
+        bitmap = OccupancyBitmap(first_day, days, self.timezone)
+        bitmap.mark_busy(busy)
+        bitmap.close_outside(self.open_time, self.close_time, self.closed_weekdays)
+        return bitmap
+
+    def candidate_mask(self, bitmap: OccupancyBitmap, start: datetime.datetime) -> np.ndarray:
+        open_minute = self.open_time.hour * 60 + self.open_time.minute
+        minutes = np.arange(MINUTES_PER_DAY)
+        on_grid = (minutes >= open_minute) & ((minutes - open_minute) % self.step_minutes == 0)
+        mask = np.broadcast_to(on_grid, bitmap.busy.shape).copy()
+        # Nothing before ``start``: the first allowed minute is the first whole minute at or after it.
+        mask.ravel()[:max(0, math.ceil(bitmap.minute_of(start)))] = False
+        return mask
+
+    def starts_by_day(self, bitmap: OccupancyBitmap, starts: np.ndarray) -> Dict[datetime.date, List[datetime.datetime]]:
+        result: Dict[datetime.date, List[datetime.datetime]] = {}
+        for day in range(bitmap.days):
+            date = bitmap.first_day + datetime.timedelta(days=day)
+            if date.weekday() not in self.closed_weekdays:
+                result[date] = []
+        for index in np.flatnonzero(starts).tolist():
+            day, minute = divmod(index, MINUTES_PER_DAY)
+            date = bitmap.first_day + datetime.timedelta(days=day)
+            result[date].append(datetime.datetime.combine(date, datetime.time(minute // 60, minute % 60), tzinfo=self.tz))
+        return result
+
+    def available_starts(self, busy: Iterable[Interval], start: datetime.datetime, end: datetime.datetime,
+                         durations: Sequence[int]) -> Dict[int, Dict[datetime.date, List[datetime.datetime]]]:
+        """Start times per open day from ``start`` through ``end``'s date, for each duration in minutes."""
+        bitmap = self.bitmap(busy, start, end)
+        mask = self.candidate_mask(bitmap, start)
+        return {minutes: self.starts_by_day(bitmap, bitmap.feasible(minutes) & mask) for minutes in durations}
+
+    def available_slots(self, busy: Iterable[Interval], start: datetime.datetime, end: datetime.datetime,
+                        minutes: int) -> Dict[datetime.date, List[datetime.datetime]]:
+        return self.available_starts(busy, start, end, [minutes])[minutes]
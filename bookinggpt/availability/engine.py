@@ -0,0 +1,96 @@
+import bisect
+import datetime
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from bookinggpt.catalog import CLOSE_TIME, CLOSED_WEEKDAYS, OPEN_TIME
+from bookinggpt.utils import TIMEZONE
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+
+def merge_intervals(intervals: Iterable[Interval]) -> List[Interval]:
+    """Sort intervals and merge the ones that overlap or touch."""
+    merged: List[Interval] = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+class AvailabilityEngine:
+    """Finds free slot start times by sweeping the gaps between merged busy intervals.
+
+    Candidate starts lie on a grid of ``step_minutes`` from opening time, and a
+    slot must end by closing time. Cost is O(events + slots) per query after an
+    O(events log events) merge, instead of testing every slot against every event.
+    """
+
+    def __init__(
+        self,
+        slot_minutes: int = 60,
+        step_minutes: Optional[int] = None,
+        open_time: datetime.time = OPEN_TIME,
+        close_time: datetime.time = CLOSE_TIME,
+        closed_weekdays: Sequence[int] = CLOSED_WEEKDAYS,
+        timezone: str = TIMEZONE,
+    ):
+        self.slot = datetime.timedelta(minutes=slot_minutes)
+        self.step = datetime.timedelta(minutes=step_minutes or slot_minutes)
+        self.open_time = open_time
+        self.close_time = close_time
+        self.closed_weekdays = frozenset(closed_weekdays)
+        self.tz = ZoneInfo(timezone)
+
+    def opening_hours(self, day: datetime.date) -> Interval:
+        return (
+            datetime.datetime.combine(day, self.open_time, tzinfo=self.tz),
+            datetime.datetime.combine(day, self.close_time, tzinfo=self.tz),
+        )
+
+    def free_slots(self, merged_busy: Sequence[Interval], window_start: datetime.datetime,
+                   window_end: datetime.datetime, grid_origin: Optional[datetime.datetime] = None,
+                   limit: Optional[int] = None) -> List[datetime.datetime]:
+        """Slot starts in [window_start, window_end) avoiding ``merged_busy`` (sorted, merged)."""
+        origin = grid_origin or window_start
+        slots: List[datetime.datetime] = []
+        # Skip busy intervals that end before the window; bisect on the end times.
+        index = bisect.bisect_right(merged_busy, (window_start, window_start))
+        if index and merged_busy[index - 1][1] > window_start:
+            index -= 1
+        cursor = window_start
+        while cursor < window_end:
+            if index < len(merged_busy) and merged_busy[index][0] < window_end:
+                gap_end = min(merged_busy[index][0], window_end)
+                next_cursor = max(cursor, merged_busy[index][1])
+                index += 1
+            else:
+                gap_end = window_end
+                next_cursor = window_end
+            if gap_end > cursor:
+                # First grid point at or after the gap start.
+                steps = -((origin - cursor) // self.step)
+                candidate = origin + steps * self.step
+                while candidate + self.slot <= gap_end:
+                    slots.append(candidate)
+                    if limit is not None and len(slots) >= limit:
+                        return slots
+                    candidate += self.step
+            cursor = next_cursor
+        return slots
+
+    def available_slots(self, busy: Iterable[Interval], start: datetime.datetime,
+                        end: datetime.datetime) -> Dict[datetime.date, List[datetime.datetime]]:
+        """Free slots per open day from ``start`` (exclusive of past times) through ``end``'s date."""
+        merged = merge_intervals(busy)
+        result: Dict[datetime.date, List[datetime.datetime]] = {}
+        day = start.date()
+        while day <= end.date():
+            if day.weekday() not in self.closed_weekdays:
+                day_open, day_close = self.opening_hours(day)
+                result[day] = self.free_slots(merged, max(day_open, start), day_close, grid_origin=day_open)
+            day += datetime.timedelta(days=1)
+        return result
@@ -0,0 +1,37 @@
+import datetime
+from typing import Iterable, Iterator, List, Optional
+
+from bookinggpt.availability.engine import AvailabilityEngine, Interval, merge_intervals
+
+
+def iter_free_slots(engine: AvailabilityEngine, busy: Iterable[Interval], start: datetime.datetime,
+                    end: datetime.datetime) -> Iterator[datetime.datetime]:
+    """Free slot starts from ``start`` through ``end``'s date, earliest first, computed lazily.
+
+    ``busy`` must be ordered by start time and is only consumed up to the
+    closing time of the day being searched, so a caller that stops early
+    (e.g. after the first N slots) never pulls the rest, and a paginated
+    event listing behind it never fetches the remaining pages.
+    """
+    busy = iter(busy)
+    pending: Optional[Interval] = None
+    carried: List[Interval] = []
+    day = start.astimezone(engine.tz).date()
+    while day <= end.astimezone(engine.tz).date():
+        if day.weekday() not in engine.closed_weekdays:
+            day_open, day_close = engine.opening_hours(day)
+            # Intervals that ended before today can no longer matter.
+            carried = [interval for interval in carried if interval[1] > day_open]
+            while True:
+                if pending is None:
+                    pending = next(busy, None)
+                    if pending is None:
+                        break
+                if pending[0] >= day_close:
+                    break
+                carried.append(pending)
+                pending = None
+            for slot in engine.free_slots(merge_intervals(carried), max(day_open, start), day_close,
+                                          grid_origin=day_open):
+                yield slot
+        day += datetime.timedelta(days=1)
@@ -0,0 +1,226 @@
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Iterable, Optional, Sequence, Tuple
+
+from langchain_core.caches import RETURN_VAL_TYPE, BaseCache
+from langchain_core.load import dumps, loads
+
+from bookinggpt.utils import LLM_CACHE_FILE, LLM_CACHE_MAX_ENTRIES, LLM_CACHE_TTL
+
+# Tools that change the calendar. Model calls that request them, or that
+# follow their results, are never cached.
+SIDE_EFFECT_TOOLS = ("calendar_tool", "cancel_event_tool")
+
+MAX_PENDING = 10_000
+
+_SPACE = re.compile(r"\s+")
+_TRAILING_PUNCTUATION = re.compile(r"[\s?!.,;:~]+$")
+
+Entry = Tuple[RETURN_VAL_TYPE, float]  # (generations, seconds the model took to produce them)
+
+
+def normalize_text(text: str) -> str:
+    """Casefold, collapse whitespace and drop trailing punctuation ("What  services?" -> "what services")."""
+    return _TRAILING_PUNCTUATION.sub("", _SPACE.sub(" ", text.casefold()).strip())
+
+
+def _normalize_contents(node: Any) -> Any:
+    if isinstance(node, dict):
+        # Message and tool call ids differ on every call; the class path under "id" is a list and stays.
+        return {key: normalize_text(value) if key == "content" and isinstance(value, str) else _normalize_contents(value)
+                for key, value in node.items()
+                if key != "tool_call_id" and not (key == "id" and not isinstance(value, list))}
+    if isinstance(node, list):
+        return [_normalize_contents(item) for item in node]
+    return node
+
+
+def _messages(prompt: str) -> list:
+    try:
+        messages = json.loads(prompt)
+    except ValueError:
+        return []
+    return messages if isinstance(messages, list) else []
+
+
+class MemoryTier:
+    """LRU of cache entries in process memory; entries expire after ``ttl`` seconds."""
+
+    def __init__(self, max_entries: int = LLM_CACHE_MAX_ENTRIES, ttl: Optional[float] = LLM_CACHE_TTL):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, Tuple[Entry, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return None
+            entry, stored = item
+            if self.ttl is not None and time.monotonic() - stored > self.ttl:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return entry
+
+    def put(self, key: str, entry: Entry):
+        with self._lock:
+            self._entries[key] = (entry, time.monotonic())
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SQLiteTier:
+    """Cache entries in a SQLite file, shared across restarts and worker processes."""
+
+    def __init__(self, path: str = LLM_CACHE_FILE, ttl: Optional[float] = LLM_CACHE_TTL):
+        self.path = path
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                " key TEXT PRIMARY KEY, generations TEXT NOT NULL, seconds REAL NOT NULL, stored_at REAL NOT NULL"
+                ") WITHOUT ROWID"
+            )
+
+    def get(self, key: str) -> Optional[Entry]:
+        with self._lock:
+            row = self._connection.execute(
+                "SELECT generations, seconds, stored_at FROM llm_cache WHERE key = ?", (key,)
+            ).fetchone()
+        if row is None:
+            return None
+        generations, seconds, stored_at = row
+        if self.ttl is not None and time.time() - stored_at > self.ttl:
+            with self._lock, self._connection:
+                self._connection.execute("DELETE FROM llm_cache WHERE key = ?", (key,))
+            return None
+        return loads(generations), seconds
+
+    def put(self, key: str, entry: Entry):
+        generations, seconds = entry
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, generations, seconds, stored_at) VALUES (?, ?, ?, ?)",
+                (key, dumps(generations), seconds, time.time()),
+            )
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM llm_cache")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM llm_cache").fetchone()[0]
+
+    def close(self):
+        self._connection.close()
+
+
+class LLMResponseCache(BaseCache):
+    """LangChain cache for chat model responses, checked tier by tier.
+
+    Keys are the prompt with message contents normalized (case, whitespace,
+    trailing punctuation) plus the model and call parameters, bound tools
+    included. Calls that request a side-effect tool, or whose prompt already
+    contains one, bypass the cache. A hit found in a later tier is copied
+    into the earlier ones.
+    """
+
+    def __init__(self, tiers: Optional[Sequence[Any]] = None, side_effect_tools: Iterable[str] = SIDE_EFFECT_TOOLS):
+        self.tiers = list(tiers) if tiers is not None else [MemoryTier()]
+        self.side_effect_tools = set(side_effect_tools)
+        # Tool calls show up as structured tool_calls, or as their repr when the scratchpad is rendered as text.
+        self._side_effect_call = re.compile(
+            r"""['"]name['"]:\s*['"](""" + "|".join(map(re.escape, self.side_effect_tools)) + r""")['"]"""
+        )
+        self.counters = {"hits": 0, "misses": 0, "bypassed": 0, "stored": 0, "saved_seconds": 0.0}
+        self._pending = {}  # key -> perf_counter() of the miss, to time the model call that follows
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: str, llm_string: str) -> str:
+        messages = _messages(prompt)
+        normalized = json.dumps(_normalize_contents(messages), sort_keys=True) if messages else normalize_text(prompt)
+        return hashlib.sha256(f"{normalized}\0{llm_string}".encode()).hexdigest()
+
+    def has_side_effects(self, prompt: str) -> bool:
+        return bool(self.side_effect_tools) and self._side_effect_call.search(prompt) is not None
+
+    def lookup(self, prompt: str, llm_string: str) -> Optional[RETURN_VAL_TYPE]:
+        if self.has_side_effects(prompt):
+            with self._lock:
+                self.counters["bypassed"] += 1
+            return None
+        key = self.key(prompt, llm_string)
+        for position, tier in enumerate(self.tiers):
+            entry = tier.get(key)
+            if entry is not None:
+                for earlier in self.tiers[:position]:
+                    earlier.put(key, entry)
+                with self._lock:
+                    self.counters["hits"] += 1
+                    self.counters["saved_seconds"] += entry[1]
+                return entry[0]
+        with self._lock:
+            self.counters["misses"] += 1
+            if len(self._pending) >= MAX_PENDING:
+                self._pending.clear()  # Calls that failed never reach update().
+            self._pending[key] = time.perf_counter()
+        return None
+
+    def update(self, prompt: str, llm_string: str, return_val: RETURN_VAL_TYPE) -> None:
+        key = self.key(prompt, llm_string)
+        with self._lock:
+            started = self._pending.pop(key, None)
+        if started is None:
+            return  # Bypassed, or already stored by a concurrent call.
+        requested = [call["name"] for generation in return_val
+                     for call in getattr(getattr(generation, "message", None), "tool_calls", None) or []]
+        if self.side_effect_tools.intersection(requested):
+            return
+        entry = (return_val, time.perf_counter() - started)
+        for tier in self.tiers:
+            tier.put(key, entry)
+        with self._lock:
+            self.counters["stored"] += 1
+
+    def clear(self, **kwargs: Any) -> None:
+        for tier in self.tiers:
+            tier.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self.counters)
+        lookups = counters["hits"] + counters["misses"]
+        return {
+            **counters,
+            "hit_ratio": counters["hits"] / lookups if lookups else None,
+            "entries": [len(tier) for tier in self.tiers],
+        }
+
+
+def make_llm_cache(path: Optional[str] = None, **options) -> LLMResponseCache:
+    """Memory cache, backed by a SQLite file when ``path`` is set."""
+    tiers = [MemoryTier(**options)]
+    if path:
+        tiers.append(SQLiteTier(path, ttl=options.get("ttl", LLM_CACHE_TTL)))
+    return LLMResponseCache(tiers)
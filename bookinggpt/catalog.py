@@ -0,0 +1,80 @@
+"""Daisy Hair Salon services, their durations and the names customers use for them."""
+import datetime
+import re
+from dataclasses import dataclass
+from typing import List, Sequence, Tuple
+
+
+@dataclass(frozen=True)
+class Service:
+    name: str
+    minutes: int
+    aliases: Tuple[str, ...] = ()
+
+
+# Same list and durations as the agent prompt; aliases are matched case-insensitively.
+SERVICES: Tuple[Service, ...] = (
+    Service("Hair wash", 20, ("hair wash", "wash", "shampoo", "gội đầu", "gội")),
+    Service("Hair cut", 30, ("hair cut", "haircut", "cut", "trim", "cắt tóc", "cắt")),
+    Service("Hair styling", 30, ("hair styling", "styling", "style", "blow dry", "tạo kiểu", "tạo mẫu", "sấy tạo kiểu")),
+    Service("Beard trim", 15, ("beard trim", "beard", "shave", "tỉa râu", "cạo râu", "râu")),
+    Service("Hair coloring", 60, ("hair coloring", "hair colouring", "coloring", "colouring", "color", "colour",
+                                  "dye", "nhuộm tóc", "nhuộm")),
+    Service("Hair treatment", 45, ("hair treatment", "treatment", "hấp tóc", "phục hồi tóc", "phục hồi", "hấp")),
+    Service("Scalp massage", 15, ("scalp massage", "massage", "mát xa da đầu", "massage da đầu", "mát xa")),
+    Service("Eyebrow shaping", 10, ("eyebrow shaping", "eyebrows", "eyebrow", "brows", "tỉa lông mày", "lông mày",
+                                    "chân mày")),
+    Service("Facial", 45, ("facial", "chăm sóc da mặt", "da mặt")),
+    Service("Manicure", 30, ("manicure", "nails", "làm móng tay", "làm móng", "móng tay")),
+)
+
+# Opening hours, used by the availability engines for bookable slots and by the router's answers.
+OPEN_TIME = datetime.time(9, 0)
+CLOSE_TIME = datetime.time(18, 0)
+CLOSED_WEEKDAYS: Tuple[int, ...] = (6,)  # datetime.weekday() numbers: closed on Sundays
+OPENING_HOURS: Tuple[datetime.time, datetime.time] = (OPEN_TIME, CLOSE_TIME)
+
+WEEKDAY_NAMES = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+WEEKDAY_NAMES_VI = ("Thứ Hai", "Thứ Ba", "Thứ Tư", "Thứ Năm", "Thứ Sáu", "Thứ Bảy", "Chủ nhật")
+
+_ALIASES = {alias: service for service in SERVICES for alias in service.aliases}
+# Longest alias first, so "beard trim" wins over "trim" and "scalp massage" over "massage".
+_ALIAS_PATTERN = re.compile(
+    r"(?<!\w)(" + "|".join(re.escape(alias) for alias in sorted(_ALIASES, key=len, reverse=True)) + r")(?!\w)"
+)
+
+
+def find_services(text: str) -> List[Service]:
+    """Services mentioned in ``text`` (e.g. "wash+cut+styling", "cắt tóc và gội đầu"), in order, once each."""
+    found: List[Service] = []
+    for match in _ALIAS_PATTERN.finditer(text.lower()):
+        service = _ALIASES[match.group(1)]
+        if service not in found:
+            found.append(service)
+    return found
+
+
+def total_minutes(services: Sequence[Service]) -> int:
+    return sum(service.minutes for service in services)
+
+
+def format_hours(hours: Tuple[datetime.time, datetime.time] = OPENING_HOURS, vietnamese: bool = False) -> str:
+    """"9 AM to 6 PM", or "9:00 đến 18:00" in Vietnamese."""
+    if vietnamese:
+        return " đến ".join(time.strftime("%H:%M").lstrip("0") for time in hours)
+    return " to ".join(time.strftime("%I:%M %p" if time.minute else "%I %p").lstrip("0") for time in hours)
+
+
+def format_weekdays(weekdays: Sequence[int] = CLOSED_WEEKDAYS, vietnamese: bool = False) -> str:
+    """"Sunday", "Saturday and Sunday", or "Chủ nhật" in Vietnamese."""
+    names = [(WEEKDAY_NAMES_VI if vietnamese else WEEKDAY_NAMES)[day] for day in sorted(weekdays)]
+    if len(names) < 2:
+        return "".join(names)
+    return f"{', '.join(names[:-1])} {'và' if vietnamese else 'and'} {names[-1]}"
+
+
+def format_services(services: Sequence[Service] = SERVICES, vietnamese: bool = False) -> str:
+    """One numbered line per service with its duration, as in the agent prompt."""
+    unit = "phút" if vietnamese else "minutes"
+    return "\n".join(f"{number}. {service.name} ({service.minutes} {unit})"
+                     for number, service in enumerate(services, 1))
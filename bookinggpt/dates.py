@@ -0,0 +1,119 @@
+"""Rule-based reading of the dates and times customers give, in English and Vietnamese."""
+import datetime
+import re
+import unicodedata
+from typing import Optional, Set
+
+WEEKDAYS = {
+    "monday": 0, "mon": 0, "tuesday": 1, "tue": 1, "tues": 1, "wednesday": 2, "wed": 2,
+    "thursday": 3, "thu": 3, "thurs": 3, "friday": 4, "fri": 4, "saturday": 5, "sat": 5, "sunday": 6, "sun": 6,
+}
+# "thứ hai" (Monday) ... "thứ bảy" (Saturday), also written "thứ 2" ... "thứ 7" or "t2" ... "t7".
+VI_WEEKDAYS = {"hai": 0, "2": 0, "ba": 1, "3": 1, "tu": 2, "4": 2, "nam": 3, "5": 3, "sau": 4, "6": 4, "bay": 5, "7": 5}
+RELATIVE_DAYS = {
+    "today": 0, "tonight": 0, "hom nay": 0, "bua nay": 0,
+    "tomorrow": 1, "tmr": 1, "ngay mai": 1, "mai": 1,
+    "day after tomorrow": 2, "ngay mot": 2, "ngay kia": 2,
+}
+# Vietnamese parts of the day; each maps an hour on the 12-hour clock to the 24-hour clock.
+PERIODS = {
+    "am": lambda hour: 0 if hour == 12 else hour,
+    "pm": lambda hour: hour if hour == 12 else hour + 12,
+    "sang": lambda hour: hour,
+    "trua": lambda hour: hour if hour >= 11 else hour + 12,
+    "chieu": lambda hour: hour if hour >= 12 else hour + 12,
+    "toi": lambda hour: hour if hour >= 12 else hour + 12,
+}
+
+_RELATIVE = re.compile(r"(?<!\w)(" + "|".join(sorted(RELATIVE_DAYS, key=len, reverse=True)) + r")(?!\w)")
+# Vietnamese first, so "thu sau" (Friday) is not read as the English "thu" (Thursday).
+_WEEKDAY = re.compile(
+    r"(?<!\w)(?:thu\s*|t)(" + "|".join(sorted(VI_WEEKDAYS, key=len, reverse=True)) + r")(?!\w)"
+    r"|(?<!\w)(chu nhat|cn)(?!\w)"
+    r"|(?<!\w)(?:(this|next|coming)\s+)?(" + "|".join(sorted(WEEKDAYS, key=len, reverse=True)) + r")(?!\w)"
+)
+_NEXT_WEEK = re.compile(r"(?<!\w)(tuan sau|tuan toi|next week)(?!\w)")
+_ISO_DATE = re.compile(r"(?<!\d)(\d{4})-(\d{1,2})-(\d{1,2})(?!\d)")
+_DAY_MONTH = re.compile(r"(?<!\d)(\d{1,2})/(\d{1,2})(?:/(\d{2,4}))?(?!\d)")
+_TIME = re.compile(
+    r"(?<![\w:])(\d{1,2})(?:\s*(?::|h|gio)\s*(\d{2}|ruoi)?)?\s*(a\.?m\.?|p\.?m\.?)?(?!\w)"
+    r"(?:\s*(sang|trua|chieu|toi))?"
+)
+
+
+def fold(text: str) -> str:
+    """Lowercase ``text`` and drop Vietnamese diacritics ("Thứ Sáu" -> "thu sau")."""
+    text = unicodedata.normalize("NFD", text.lower().replace("đ", "d"))
+    return "".join(char for char in text if unicodedata.category(char) != "Mn")
+
+
+def _weekday_date(today: datetime.date, weekday: int, next_week: bool) -> datetime.date:
+    if next_week:
+        # The given weekday of next calendar week (weeks start on Monday).
+        return today + datetime.timedelta(days=7 - today.weekday() + weekday)
+    return today + datetime.timedelta(days=(weekday - today.weekday()) % 7)
+
+
+def resolve_date(text: Optional[str], today: datetime.date) -> Optional[datetime.date]:
+    """The date ``text`` refers to, seen from ``today``; None when the rules can't tell.
+
+    Reads ISO dates, day/month[/year], today/tomorrow, hôm nay/mai/ngày mốt and
+    weekdays ("Friday", "next Friday", "thứ Sáu tuần sau"). A bare weekday is
+    its next occurrence, today included; "next" means the following week.
+    Text naming two different dates resolves to None.
+    """
+    if not text:
+        return None
+    folded = fold(text)
+    found: Set[datetime.date] = set()
+    try:
+        for year, month, day in _ISO_DATE.findall(folded):
+            found.add(datetime.date(int(year), int(month), int(day)))
+        for day, month, year in _DAY_MONTH.findall(_ISO_DATE.sub(" ", folded)):
+            if year:
+                found.add(datetime.date(int(year) + (2000 if len(year) == 2 else 0), int(month), int(day)))
+            else:
+                date = datetime.date(today.year, int(month), int(day))
+                found.add(date if date >= today else date.replace(year=today.year + 1))
+    except ValueError:
+        return None
+    for match in _RELATIVE.finditer(folded):
+        found.add(today + datetime.timedelta(days=RELATIVE_DAYS[match.group(1)]))
+    next_week = bool(_NEXT_WEEK.search(folded))
+    for match in _WEEKDAY.finditer(folded):
+        vietnamese, sunday, modifier, english = match.groups()
+        if vietnamese:
+            weekday = VI_WEEKDAYS[vietnamese]
+        elif sunday:
+            weekday = 6
+        else:
+            weekday = WEEKDAYS[english]
+        found.add(_weekday_date(today, weekday, next_week or modifier == "next"))
+    return found.pop() if len(found) == 1 else None
+
+
+def resolve_time(text: Optional[str]) -> Optional[datetime.time]:
+    """The time of day in ``text`` ("14:30", "2pm", "2:30 p.m.", "14h", "2 giờ chiều", "9h rưỡi sáng").
+
+    Hours from 1 to 8 without am/pm or a part of the day are ambiguous for a
+    salon open 9:00-18:00 and resolve to None, as does text with several times.
+    """
+    if not text:
+        return None
+    found: Set[datetime.time] = set()
+    for match in _TIME.finditer(fold(text)):
+        hour, minute, meridiem, period = match.groups()
+        if minute is None and meridiem is None and period is None and not re.search(r"h|gio", match.group(0)):
+            continue  # A bare number ("2 people") is not a time.
+        hour, minute = int(hour), 30 if minute == "ruoi" else int(minute or 0)
+        marker = meridiem.replace(".", "") if meridiem else period
+        if meridiem and not 1 <= hour <= 12:
+            return None
+        if marker:
+            hour = PERIODS[marker](hour)
+        elif 1 <= hour <= 8:
+            return None
+        if hour > 23 or minute > 59:
+            return None
+        found.add(datetime.time(hour, minute))
+    return found.pop() if len(found) == 1 else None
@@ -0,0 +1 @@
+"""Shared Google Calendar plumbing used by the booking tools."""
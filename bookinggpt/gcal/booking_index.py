@@ -0,0 +1,114 @@
+import sqlite3
+import threading
+import time
+from typing import Iterable, Optional, Tuple
+
+from bookinggpt.gcal.bookings import normalize_phone, parse_booking
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.utils import BOOKING_INDEX_FILE
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS bookings (
+    booking_code TEXT NOT NULL,
+    phone TEXT NOT NULL,
+    event_id TEXT NOT NULL,
+    calendar_id TEXT NOT NULL,
+    start_time TEXT,
+    PRIMARY KEY (booking_code, phone)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS bookings_event_id ON bookings (event_id);
+"""
+
+
+class BookingIndex:
+    """Persistent booking code + phone -> event id lookup table in SQLite.
+
+    CalendarTool writes an entry for each booking it creates, so cancellation
+    is a primary-key lookup instead of a full-text search of the calendar.
+    ``rebuild`` repopulates it from the calendar, e.g. for bookings made
+    before the index existed.
+    """
+
+    def __init__(self, path: str = BOOKING_INDEX_FILE):
+        self.path = path
+        self.latency = LatencyRecorder()
+        self.counters = {"hits": 0, "misses": 0, "writes": 0, "rebuilds": 0}
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        if path != ":memory:":
+            self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(SCHEMA)
+
+    def add(self, booking_code: str, phone: str, event_id: str, calendar_id: str = "primary",
+            start_time: Optional[str] = None):
+        self.add_many([(booking_code, phone, event_id, calendar_id, start_time)])
+
+    def add_many(self, rows: Iterable[Tuple[str, str, str, str, Optional[str]]]):
+        rows = [(code, normalize_phone(phone), event_id, calendar_id, start) for code, phone, event_id, calendar_id, start in rows]
+        with self._lock, self._conn:
+            self._conn.executemany("INSERT OR REPLACE INTO bookings VALUES (?, ?, ?, ?, ?)", rows)
+        self.counters["writes"] += len(rows)
+
+    def lookup(self, booking_code: str, phone: str) -> Optional[Tuple[str, str]]:
+        """(calendar id, event id) of the booking, or None."""
+        start = time.perf_counter()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT calendar_id, event_id FROM bookings WHERE booking_code = ? AND phone = ?",
+                (booking_code, normalize_phone(phone)),
+            ).fetchone()
+        self.latency.record("lookup", time.perf_counter() - start)
+        self.counters["hits" if row else "misses"] += 1
+        return tuple(row) if row else None
+
+    def remove_event(self, event_id: str):
+        self.remove_events([event_id])
+
+    def remove_events(self, event_ids: Iterable[str]):
+        with self._lock, self._conn:
+            self._conn.executemany("DELETE FROM bookings WHERE event_id = ?", [(event_id,) for event_id in event_ids])
+
+    def rebuild(self, service, calendar_id: str = "primary", time_min: Optional[str] = None) -> int:
+        """Replace the index with every booking found on the calendar; returns the number indexed."""
+        rows = []
+        page_token = None
+        while True:
+            params = {"timeMin": time_min} if time_min else {}
+            page = service.events().list(calendarId=calendar_id, singleEvents=True, maxResults=2500,
+                                         pageToken=page_token, **params).execute()
+            for event in page.get("items", []):
+                booking = parse_booking(event)
+                if booking and event.get("status") != "cancelled":
+                    start = event.get("start", {})
+                    rows.append((*booking, event["id"], calendar_id, start.get("dateTime", start.get("date"))))
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                break
+        with self._lock, self._conn:
+            self._conn.execute("DELETE FROM bookings WHERE calendar_id = ?", (calendar_id,))
+            self._conn.executemany("INSERT OR REPLACE INTO bookings VALUES (?, ?, ?, ?, ?)", rows)
+        self.counters["rebuilds"] += 1
+        return len(rows)
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM bookings").fetchone()[0]
+
+    def close(self):
+        self._conn.close()
+
+    def stats(self) -> dict:
+        return {**self.counters, "bookings": len(self), "latency": self.latency.summary()}
+
+
+_index: Optional[BookingIndex] = None
+_index_lock = threading.Lock()
+
+
+def get_booking_index() -> BookingIndex:
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                _index = BookingIndex()
+    return _index
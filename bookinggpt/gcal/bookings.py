@@ -0,0 +1,68 @@
+"""Booking fields stored on calendar events and server-side lookups by them."""
+import re
+from typing import List, Optional, Tuple
+
+PROPERTY_BOOKING_CODE = "bookingCode"
+PROPERTY_PHONE = "phone"
+PROPERTY_SERVICE = "service"
+
+_BOOKING_CODE = re.compile(r"Booking Code:\s*(\S+)")
+_PHONE = re.compile(r"Phone:\s*([^\n]+)")
+_SERVICE = re.compile(r"Service:\s*([^\n]+)")
+
+
+def normalize_phone(phone: str) -> str:
+    """Digits only, with the +84 country code written as a leading 0 (e.g. "+84 90-123" -> "090123")."""
+    digits = re.sub(r"\D", "", phone or "")
+    if digits.startswith("84") and len(digits) >= 11:
+        digits = "0" + digits[2:]
+    return digits
+
+
+def booking_properties(booking_code: str, phone: str, service: Optional[str] = None) -> dict:
+    """Private extendedProperties for a booking event."""
+    properties = {PROPERTY_BOOKING_CODE: booking_code, PROPERTY_PHONE: normalize_phone(phone)}
+    if service:
+        properties[PROPERTY_SERVICE] = service
+    return properties
+
+
+def properties_from_description(event: dict) -> Optional[dict]:
+    """Booking properties recovered from a description-only (pre-extendedProperties) event."""
+    description = event.get("description", "")
+    code, phone = _BOOKING_CODE.search(description), _PHONE.search(description)
+    if not code or not phone:
+        return None
+    service = _SERVICE.search(description)
+    return booking_properties(code.group(1), phone.group(1), service.group(1).strip() if service else None)
+
+
+def private_properties(event: dict) -> dict:
+    return event.get("extendedProperties", {}).get("private", {})
+
+
+def parse_booking(event: dict) -> Optional[Tuple[str, str]]:
+    """(booking code, normalized phone) of a booking event, from its properties or else its description."""
+    properties = private_properties(event)
+    if PROPERTY_BOOKING_CODE not in properties or PROPERTY_PHONE not in properties:
+        properties = properties_from_description(event)
+        if properties is None:
+            return None
+    return properties[PROPERTY_BOOKING_CODE], normalize_phone(properties[PROPERTY_PHONE])
+
+
+def property_filter(booking_code: str, phone: str) -> List[str]:
+    """``privateExtendedProperty`` values matching exactly one booking."""
+    return [f"{PROPERTY_BOOKING_CODE}={booking_code}", f"{PROPERTY_PHONE}={normalize_phone(phone)}"]
+
+
+def find_booking_event(service, booking_code: str, phone: str, calendar_id: str = "primary") -> Optional[str]:
+    """Event id of the booking, filtered server-side by its private properties."""
+    result = service.events().list(
+        calendarId=calendar_id,
+        privateExtendedProperty=property_filter(booking_code, phone),
+        singleEvents=True,
+        maxResults=1,
+    ).execute()
+    items = result.get("items", [])
+    return items[0]["id"] if items else None
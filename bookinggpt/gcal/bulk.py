@@ -0,0 +1,172 @@
+import json
+import time
+import uuid
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from googleapiclient.errors import HttpError
+
+from bookinggpt.gcal.bookings import parse_booking
+from bookinggpt.gcal.client import get_calendar_client
+from bookinggpt.metrics import LatencyRecorder
+
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = {"rateLimitExceeded", "userRateLimitExceeded"}
+
+
+@dataclass
+class BulkItemResult:
+    index: int  # Position in the input sequence
+    ok: bool = False
+    response: Optional[dict] = None
+    status: Optional[int] = None
+    error: Optional[str] = None
+    attempts: int = 0
+
+
+def is_retryable(error: HttpError) -> bool:
+    status = error.resp.status
+    if status in RETRYABLE_STATUSES:
+        return True
+    if status == 403:
+        # Calendar reports quota exhaustion as 403 with a rate-limit reason.
+        try:
+            errors = json.loads(error.content)["error"].get("errors", [])
+        except (ValueError, KeyError, TypeError):
+            return False
+        return any(item.get("reason") in RATE_LIMIT_REASONS for item in errors)
+    return False
+
+
+class BulkCalendarOperations:
+    """Creates or deletes many events through Calendar batch requests.
+
+    Items go out ``batch_size`` per HTTP request. Each item gets its own
+    result; items that fail with a retryable error (rate limits, 5xx) are
+    resent in later rounds with exponential backoff. Inserts carry a
+    client-generated event id, so a retried insert that had in fact
+    succeeded comes back as 409 and is reported as created.
+    """
+
+    def __init__(
+        self,
+        calendar_client: Optional[Any] = None,
+        calendar_id: str = "primary",
+        batch_size: int = 50,
+        max_attempts: int = 4,
+        backoff: float = 0.5,
+        booking_index: Optional[Any] = None,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        self.calendar_client = calendar_client
+        self.calendar_id = calendar_id
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.booking_index = booking_index
+        self.sleep = sleep
+        self.latency = LatencyRecorder()
+        self.counters = {"batches": 0, "items": 0, "retries": 0, "failed": 0}
+
+    def _service(self):
+        service = (self.calendar_client or get_calendar_client()).service()
+        if service is None:
+            raise RuntimeError("Unable to obtain valid credentials.")
+        return service
+
+    def _run(self, make_request: Callable[[Any, int], Any], count: int,
+             on_error: Optional[Callable[[int, HttpError, int], bool]] = None) -> List[BulkItemResult]:
+        service = self._service()
+        results = [BulkItemResult(index) for index in range(count)]
+        pending = list(range(count))
+        for attempt in range(1, self.max_attempts + 1):
+            if attempt > 1:
+                self.counters["retries"] += len(pending)
+                self.sleep(self.backoff * 2 ** (attempt - 2))
+            retry: List[int] = []
+            for first in range(0, len(pending), self.batch_size):
+                chunk = pending[first:first + self.batch_size]
+                retry += self._execute_batch(service, make_request, chunk, results, attempt, on_error)
+            pending = retry
+            if not pending:
+                break
+        self.counters["items"] += count
+        self.counters["failed"] += sum(not result.ok for result in results)
+        return results
+
+    def _execute_batch(self, service, make_request, chunk: Sequence[int], results: List[BulkItemResult],
+                       attempt: int, on_error) -> List[int]:
+        retry: List[int] = []
+
+        def callback(request_id, response, exception):
+            index = int(request_id)
+            result = results[index]
+            result.attempts = attempt
+            if exception is None:
+                result.ok, result.response, result.status, result.error = True, response, None, None
+                return
+            status = getattr(getattr(exception, "resp", None), "status", None)
+            if isinstance(exception, HttpError) and on_error is not None and on_error(index, exception, attempt):
+                result.ok, result.status, result.error = True, status, None
+                return
+            result.ok, result.status, result.error = False, status, str(exception)
+            if isinstance(exception, HttpError) and is_retryable(exception):
+                retry.append(index)
+
+        batch = service.new_batch_http_request(callback=callback)
+        for index in chunk:
+            batch.add(make_request(service, index), request_id=str(index))
+        start = time.perf_counter()
+        try:
+            batch.execute()
+        except HttpError as error:
+            # The batch request itself failed: none of its items ran.
+            for index in chunk:
+                results[index].attempts = attempt
+                results[index].ok, results[index].status, results[index].error = False, error.resp.status, str(error)
+            return list(chunk) if is_retryable(error) else []
+        finally:
+            self.counters["batches"] += 1
+            self.latency.record("batch", time.perf_counter() - start)
+        return retry
+
+    def create_events(self, bodies: Sequence[dict]) -> List[BulkItemResult]:
+        bodies = [dict(body) for body in bodies]
+        for body in bodies:
+            body.setdefault("id", uuid.uuid4().hex)
+
+        def make_request(service, index):
+            return service.events().insert(calendarId=self.calendar_id, body=bodies[index])
+
+        def already_created(index, error, attempt):
+            return attempt > 1 and error.resp.status == 409
+
+        results = self._run(make_request, len(bodies), already_created)
+        for result in results:
+            if result.ok and result.response is None:
+                # Created by an earlier attempt whose response was lost.
+                result.response = {"id": bodies[result.index]["id"]}
+        if self.booking_index is not None:
+            rows = []
+            for result in results:
+                booking = parse_booking(bodies[result.index])
+                if result.ok and booking:
+                    start = bodies[result.index].get("start", {}).get("dateTime")
+                    rows.append((*booking, bodies[result.index]["id"], self.calendar_id, start))
+            self.booking_index.add_many(rows)
+        return results
+
+    def delete_events(self, event_ids: Sequence[str]) -> List[BulkItemResult]:
+        def make_request(service, index):
+            return service.events().delete(calendarId=self.calendar_id, eventId=event_ids[index])
+
+        def already_deleted(index, error, attempt):
+            return attempt > 1 and error.resp.status in (404, 410)
+
+        results = self._run(make_request, len(event_ids), already_deleted)
+        if self.booking_index is not None:
+            self.booking_index.remove_events(event_ids[result.index] for result in results if result.ok)
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        return {**self.counters, "latency": self.latency.summary()}
@@ -0,0 +1,110 @@
+import datetime
+import heapq
+from typing import Dict, Iterator, List, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+from bookinggpt.gcal.mirror import blocks_time, event_interval, parse_event_time
+from bookinggpt.utils import TIMEZONE
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+
+class FreeBusyError(Exception):
+    pass
+
+
+class EventsListBusySource:
+    """Busy intervals from ``events().list``, one calendar page at a time.
+
+    Pages are requested lazily, so a caller that stops early never fetches
+    the rest. Several calendars are merged into one stream ordered by start.
+    """
+
+    name = "events"
+
+    def __init__(self, calendar_ids: Sequence[str] = ("primary",), page_size: int = 250, timezone: str = TIMEZONE):
+        self.calendar_ids = list(calendar_ids)
+        self.page_size = page_size
+        self.tz = ZoneInfo(timezone)
+
+    def _calendar_busy(self, service, calendar_id: str, start: datetime.datetime,
+                       end: datetime.datetime) -> Iterator[Interval]:
+        page_token = None
+        while True:
+            events_result = service.events().list(
+                calendarId=calendar_id,
+                timeMin=start.isoformat(),
+                timeMax=end.isoformat(),
+                singleEvents=True,
+                orderBy='startTime',
+                maxResults=self.page_size,
+                pageToken=page_token
+            ).execute()
+            for event in events_result.get('items', []):
+                if blocks_time(event):
+                    yield event_interval(event, self.tz)
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return
+
+    def iter_busy(self, service, start: datetime.datetime, end: datetime.datetime) -> Iterator[Interval]:
+        streams = [self._calendar_busy(service, calendar_id, start, end) for calendar_id in self.calendar_ids]
+        return streams[0] if len(streams) == 1 else heapq.merge(*streams)
+
+
+class FreeBusySource:
+    """Busy intervals from one ``freebusy().query`` per window instead of full event bodies.
+
+    All calendars (up to ``max_calendars`` per request) and the whole range go
+    into a single query; ranges longer than ``max_range_days`` are split into
+    windows that are queried only as the stream is consumed.
+    """
+
+    name = "freebusy"
+
+    def __init__(self, calendar_ids: Sequence[str] = ("primary",), max_calendars: int = 50,
+                 max_range_days: int = 60, timezone: str = TIMEZONE):
+        self.calendar_ids = list(calendar_ids)
+        self.max_calendars = max_calendars
+        self.max_range = datetime.timedelta(days=max_range_days)
+        self.timezone = timezone
+        self.tz = ZoneInfo(timezone)
+
+    def query(self, service, start: datetime.datetime, end: datetime.datetime) -> Dict[str, List[Interval]]:
+        """Busy intervals per calendar id for [start, end)."""
+        busy: Dict[str, List[Interval]] = {}
+        for first in range(0, len(self.calendar_ids), self.max_calendars):
+            calendar_ids = self.calendar_ids[first:first + self.max_calendars]
+            response = service.freebusy().query(body={
+                "timeMin": start.isoformat(),
+                "timeMax": end.isoformat(),
+                "timeZone": self.timezone,
+                "items": [{"id": calendar_id} for calendar_id in calendar_ids],
+            }).execute()
+            for calendar_id in calendar_ids:
+                calendar = response.get("calendars", {}).get(calendar_id, {})
+                if calendar.get("errors"):
+                    reasons = ", ".join(error.get("reason", "unknown") for error in calendar["errors"])
+                    raise FreeBusyError(f"freebusy query failed for {calendar_id}: {reasons}")
+                busy[calendar_id] = [
+                    (parse_event_time({"dateTime": period["start"]}, self.tz),
+                     parse_event_time({"dateTime": period["end"]}, self.tz))
+                    for period in calendar.get("busy", [])
+                ]
+        return busy
+
+    def iter_busy(self, service, start: datetime.datetime, end: datetime.datetime) -> Iterator[Interval]:
+        window_start = start
+        while window_start < end:
+            window_end = min(window_start + self.max_range, end)
+            yield from heapq.merge(*self.query(service, window_start, window_end).values())
+            window_start = window_end
+
+
+def make_busy_source(backend: str, calendar_ids: Sequence[str] = ("primary",), page_size: int = 250):
+    """``backend`` is "events" (events().list) or "freebusy" (freebusy().query)."""
+    if backend == EventsListBusySource.name:
+        return EventsListBusySource(calendar_ids, page_size=page_size)
+    if backend == FreeBusySource.name:
+        return FreeBusySource(calendar_ids)
+    raise ValueError(f"Unknown availability backend {backend!r}; expected 'events' or 'freebusy'")
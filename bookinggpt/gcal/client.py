@@ -0,0 +1,88 @@
+import json
+import threading
+import time
+from typing import Any, Optional
+
+import httplib2
+from google_auth_httplib2 import AuthorizedHttp
+from googleapiclient import discovery_cache
+from googleapiclient.discovery import build_from_document
+
+from bookinggpt.gcal.credentials import get_credential_provider
+from bookinggpt.metrics import LatencyRecorder
+
+_discovery_document: Optional[dict] = None
+_discovery_lock = threading.Lock()
+
+
+def calendar_discovery_document() -> dict:
+    """Calendar v3 discovery document from the copy bundled with googleapiclient, parsed once."""
+    global _discovery_document
+    if _discovery_document is None:
+        with _discovery_lock:
+            if _discovery_document is None:
+                _discovery_document = json.loads(discovery_cache.get_static_doc("calendar", "v3"))
+    return _discovery_document
+
+
+class CalendarClient:
+    """Thread-safe, reusable Calendar v3 resources.
+
+    httplib2 connections are not thread-safe, so each thread keeps its own
+    resource and keep-alive connection pool. A resource is rebuilt only when
+    the credential provider hands out a different credentials object.
+    """
+
+    def __init__(self, credential_provider=None, timeout: float = 30.0):
+        self.credential_provider = credential_provider
+        self.timeout = timeout
+        self.latency = LatencyRecorder()
+        self.counters = {"builds": 0, "reuses": 0}
+        self._local = threading.local()
+
+    def service(self) -> Optional[Any]:
+        provider = self.credential_provider or get_credential_provider()
+        start = time.perf_counter()
+        creds = provider.get()
+        if not creds:
+            return None
+        service = getattr(self._local, "service", None)
+        if service is not None and self._local.credentials is creds:
+            self.counters["reuses"] += 1
+        else:
+            http = AuthorizedHttp(creds, http=httplib2.Http(timeout=self.timeout))
+            service = build_from_document(calendar_discovery_document(), http=http)
+            self._local.service = service
+            self._local.credentials = creds
+            self.counters["builds"] += 1
+        self.latency.record("setup", time.perf_counter() - start)
+        return service
+
+    def stats(self) -> dict:
+        return {**self.counters, "latency": self.latency.summary()}
+
+
+class StaticCalendarClient:
+    """Hands out one fixed service object, e.g. a local stand-in for the Calendar API."""
+
+    def __init__(self, service: Any):
+        self._service = service
+
+    def service(self) -> Any:
+        return self._service
+
+    def stats(self) -> dict:
+        return {}
+
+
+_client: Optional[CalendarClient] = None
+_client_lock = threading.Lock()
+
+
+def get_calendar_client() -> CalendarClient:
+    global _client
+    if _client is None:
+        with _client_lock:
+            if _client is None:
+                _client = CalendarClient()
+    return _client
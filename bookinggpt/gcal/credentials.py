@@ -0,0 +1,144 @@
+import asyncio
+import datetime
+import os
+import tempfile
+import threading
+import time
+from typing import List, Optional
+
+from google.auth.transport.requests import Request
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.utils import SCOPES, CREDENTIALS_FILE, TOKEN_FILE
+
+
+def write_token_atomically(path: str, payload: str):
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".token-", suffix=".json")
+    try:
+        with os.fdopen(fd, "w") as token:
+            token.write(payload)
+            token.flush()
+            os.fsync(token.fileno())
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+class CredentialProvider:
+    """Process-wide cache of the Calendar OAuth credentials.
+
+    Credentials are read from the token file once and kept in memory. They are
+    refreshed ``refresh_margin`` seconds before expiry; concurrent callers
+    share a single refresh, and the new token is written atomically.
+    """
+
+    def __init__(
+        self,
+        token_file: str = TOKEN_FILE,
+        credentials_file: str = CREDENTIALS_FILE,
+        scopes: Optional[List[str]] = None,
+        refresh_margin: float = 300.0,
+    ):
+        self.token_file = token_file
+        self.credentials_file = credentials_file
+        self.scopes = scopes or SCOPES
+        self.refresh_margin = datetime.timedelta(seconds=refresh_margin)
+        self.latency = LatencyRecorder()
+        self.counters = {
+            "hits": 0,
+            "loads": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "interactive_logins": 0,
+        }
+        self._credentials: Optional[Credentials] = None
+        self._lock = threading.Lock()
+
+    def needs_refresh(self, creds: Optional[Credentials]) -> bool:
+        if creds is None or not creds.valid:
+            return True
+        if creds.expiry is None:
+            return False
+        # google-auth keeps expiry as a naive UTC datetime.
+        now = datetime.datetime.now(datetime.timezone.utc).replace(tzinfo=None)
+        return creds.expiry - now < self.refresh_margin
+
+    def get(self) -> Optional[Credentials]:
+        creds = self._credentials
+        if not self.needs_refresh(creds):
+            self.counters["hits"] += 1
+            return creds
+        with self._lock:
+            # Another caller may have refreshed while we waited for the lock.
+            creds = self._credentials
+            if not self.needs_refresh(creds):
+                self.counters["hits"] += 1
+                return creds
+            self._credentials = self._obtain(creds)
+            return self._credentials
+
+    async def aget(self) -> Optional[Credentials]:
+        if not self.needs_refresh(self._credentials):
+            return self.get()
+        return await asyncio.to_thread(self.get)
+
+    def invalidate(self):
+        with self._lock:
+            self._credentials = None
+
+    def _obtain(self, creds: Optional[Credentials]) -> Optional[Credentials]:
+        if creds is None and os.path.exists(self.token_file):
+            start = time.perf_counter()
+            creds = Credentials.from_authorized_user_file(self.token_file, self.scopes)
+            self.counters["loads"] += 1
+            self.latency.record("load", time.perf_counter() - start)
+            if not self.needs_refresh(creds):
+                return creds
+
+        if creds and creds.refresh_token:
+            start = time.perf_counter()
+            try:
+                creds.refresh(Request())
+                self.counters["refreshes"] += 1
+                self.latency.record("refresh", time.perf_counter() - start)
+                write_token_atomically(self.token_file, creds.to_json())
+                return creds
+            except Exception as e:
+                self.counters["refresh_failures"] += 1
+                print(f"Error refreshing credentials: {e}")
+                if creds.valid:
+                    # Refreshed early inside the margin; the current token still works.
+                    return creds
+
+        flow = InstalledAppFlow.from_client_secrets_file(self.credentials_file, self.scopes)
+        creds = flow.run_local_server(port=0)
+        self.counters["interactive_logins"] += 1
+        write_token_atomically(self.token_file, creds.to_json())
+        return creds
+
+    def stats(self) -> dict:
+        return {**self.counters, "latency": self.latency.summary()}
+
+
+_provider: Optional[CredentialProvider] = None
+_provider_lock = threading.Lock()
+
+
+def get_credential_provider() -> CredentialProvider:
+    global _provider
+    if _provider is None:
+        with _provider_lock:
+            if _provider is None:
+                _provider = CredentialProvider()
+    return _provider
+
+
+def set_credential_provider(provider: Optional[CredentialProvider]):
+    global _provider
+    with _provider_lock:
+        _provider = provider
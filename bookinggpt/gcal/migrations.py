@@ -0,0 +1,59 @@
+from typing import Dict, List, Tuple
+
+from bookinggpt.gcal.bookings import PROPERTY_BOOKING_CODE, private_properties, properties_from_description
+
+
+def backfill_booking_properties(service, calendar_id: str = "primary", batch_size: int = 50,
+                                dry_run: bool = False) -> dict:
+    """Copy booking fields from the description of older booking events into private extendedProperties.
+
+    Patches go out ``batch_size`` per batch request. Events that already
+    carry the properties, and events that are not bookings, are left alone.
+    Returns counts per outcome plus the (event id, error) of failed patches.
+    """
+    counts: Dict[str, int] = {"scanned": 0, "up_to_date": 0, "not_bookings": 0, "patched": 0, "failed": 0}
+    failures: List[Tuple[str, str]] = []
+
+    def on_patch(request_id, response, exception):
+        if exception is None:
+            counts["patched"] += 1
+        else:
+            counts["failed"] += 1
+            failures.append((request_id, str(exception)))
+
+    batch, queued = service.new_batch_http_request(callback=on_patch), 0
+    page_token = None
+    while True:
+        page = service.events().list(
+            calendarId=calendar_id,
+            singleEvents=True,
+            maxResults=2500,
+            pageToken=page_token,
+            fields="nextPageToken,items(id,status,description,extendedProperties)",
+        ).execute()
+        for event in page.get("items", []):
+            counts["scanned"] += 1
+            private = private_properties(event)
+            if PROPERTY_BOOKING_CODE in private:
+                counts["up_to_date"] += 1
+                continue
+            properties = properties_from_description(event)
+            if properties is None or event.get("status") == "cancelled":
+                counts["not_bookings"] += 1
+                continue
+            if dry_run:
+                counts["patched"] += 1
+                continue
+            body = {"extendedProperties": {"private": {**private, **properties}}}
+            batch.add(service.events().patch(calendarId=calendar_id, eventId=event["id"], body=body),
+                      request_id=event["id"])
+            queued += 1
+            if queued == batch_size:
+                batch.execute()
+                batch, queued = service.new_batch_http_request(callback=on_patch), 0
+        page_token = page.get("nextPageToken")
+        if not page_token:
+            break
+    if queued:
+        batch.execute()
+    return {**counts, "failures": failures}
@@ -0,0 +1,165 @@
+import bisect
+import datetime
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from googleapiclient.errors import HttpError
+
+from bookinggpt.gcal.client import get_calendar_client
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.utils import TIMEZONE
+
+Interval = Tuple[datetime.datetime, datetime.datetime]
+
+
+def parse_event_time(value: dict, tz: ZoneInfo) -> datetime.datetime:
+    if "dateTime" in value:
+        parsed = datetime.datetime.fromisoformat(value["dateTime"].replace("Z", "+00:00"))
+        return parsed if parsed.tzinfo else parsed.replace(tzinfo=tz)
+    # All-day events only carry a date; they block the whole salon day.
+    return datetime.datetime.combine(datetime.date.fromisoformat(value["date"]), datetime.time(), tzinfo=tz)
+
+
+def event_interval(event: dict, tz: ZoneInfo) -> Interval:
+    return parse_event_time(event["start"], tz), parse_event_time(event["end"], tz)
+
+
+def blocks_time(event: dict) -> bool:
+    """Cancelled and "show as available" (transparent) events leave the slot free."""
+    return event.get("status") != "cancelled" and event.get("transparency") != "transparent"
+
+
+class EventMirror:
+    """Local copy of calendar events kept current with incremental sync.
+
+    The mirror bootstraps with one full (paginated) listing, then applies only
+    the changes behind the Calendar ``syncToken``. Reads refresh the mirror
+    when it is older than ``max_staleness`` seconds; an expired sync token
+    (410 Gone) triggers a full resync.
+    """
+
+    def __init__(
+        self,
+        calendar_client: Optional[Any] = None,
+        calendar_id: str = "primary",
+        max_staleness: float = 30.0,
+        lookback_days: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.calendar_client = calendar_client
+        self.calendar_id = calendar_id
+        self.max_staleness = max_staleness
+        self.lookback_days = lookback_days
+        self.clock = clock
+        self.tz = ZoneInfo(TIMEZONE)
+        self.sync_token: Optional[str] = None
+        self.last_sync: Optional[float] = None
+        self.latency = LatencyRecorder()
+        self.counters = {"full_syncs": 0, "incremental_syncs": 0, "expired_tokens": 0, "pages": 0, "reads": 0}
+        self._events: Dict[str, Interval] = {}
+        self._index: Optional[List[Tuple[datetime.datetime, datetime.datetime, str]]] = None
+        self._starts: List[datetime.datetime] = []
+        self._longest = datetime.timedelta(0)
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._events)
+
+    def is_stale(self) -> bool:
+        return self.last_sync is None or self.clock() - self.last_sync >= self.max_staleness
+
+    def refresh_if_stale(self):
+        if not self.is_stale():
+            return
+        with self._lock:
+            # Another reader may have synced while we waited.
+            if self.is_stale():
+                self._sync()
+
+    def sync(self, full: bool = False):
+        with self._lock:
+            if full:
+                self.sync_token = None
+            self._sync()
+
+    def _sync(self):
+        service = (self.calendar_client or get_calendar_client()).service()
+        start = time.perf_counter()
+        if self.sync_token is None:
+            self._full_sync(service)
+        else:
+            try:
+                self._incremental_sync(service)
+            except HttpError as error:
+                if error.resp.status != 410:
+                    raise
+                self.counters["expired_tokens"] += 1
+                self._full_sync(service)
+        self.last_sync = self.clock()
+        self.latency.record("sync", time.perf_counter() - start)
+
+    def _pages(self, service, **params):
+        page_token = None
+        while True:
+            page = service.events().list(calendarId=self.calendar_id, pageToken=page_token, **params).execute()
+            self.counters["pages"] += 1
+            yield page
+            page_token = page.get("nextPageToken")
+            if not page_token:
+                return
+
+    def _full_sync(self, service):
+        time_min = datetime.datetime.now(self.tz) - datetime.timedelta(days=self.lookback_days)
+        events: Dict[str, Interval] = {}
+        sync_token = None
+        for page in self._pages(service, timeMin=time_min.isoformat(), singleEvents=True):
+            for event in page.get("items", []):
+                if blocks_time(event):
+                    events[event["id"]] = event_interval(event, self.tz)
+            sync_token = page.get("nextSyncToken", sync_token)
+        self._events = events
+        self.sync_token = sync_token
+        self._index = None
+        self.counters["full_syncs"] += 1
+
+    def _incremental_sync(self, service):
+        sync_token = self.sync_token
+        for page in self._pages(service, syncToken=self.sync_token, singleEvents=True):
+            for event in page.get("items", []):
+                if not blocks_time(event):
+                    self._events.pop(event["id"], None)
+                else:
+                    self._events[event["id"]] = event_interval(event, self.tz)
+            sync_token = page.get("nextSyncToken", sync_token)
+        self.sync_token = sync_token
+        self._index = None
+        self.counters["incremental_syncs"] += 1
+
+    def _build_index(self):
+        index = sorted((start, end, event_id) for event_id, (start, end) in self._events.items())
+        self._starts = [start for start, _, _ in index]
+        self._longest = max((end - start for start, end, _ in index), default=datetime.timedelta(0))
+        self._index = index
+
+    def busy_slots(self, start: datetime.datetime, end: datetime.datetime) -> List[Interval]:
+        """Busy intervals overlapping [start, end), sorted by start, read from memory."""
+        self.refresh_if_stale()
+        with self._lock:
+            if self._index is None:
+                self._build_index()
+            index, starts, longest = self._index, self._starts, self._longest
+        self.counters["reads"] += 1
+        # No event starting before start - longest can still overlap the window.
+        first = bisect.bisect_left(starts, start - longest)
+        last = bisect.bisect_left(starts, end)
+        return [(busy_start, busy_end) for busy_start, busy_end, _ in index[first:last] if busy_end > start]
+
+    def stats(self) -> dict:
+        return {
+            **self.counters,
+            "events": len(self._events),
+            "age_seconds": None if self.last_sync is None else self.clock() - self.last_sync,
+            "latency": self.latency.summary(),
+        }
@@ -0,0 +1,155 @@
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from uuid import UUID
+
+from langchain_core.caches import BaseCache
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models import BaseChatModel
+
+from bookinggpt.metrics import LatencyRecorder
+
+ModelFactory = Callable[..., BaseChatModel]
+
+
+def google_chat_model(model: str, **params) -> BaseChatModel:
+    from langchain_google_genai import ChatGoogleGenerativeAI
+
+    params.setdefault("google_api_key", os.getenv("GOOGLE_API_KEY"))
+    return ChatGoogleGenerativeAI(model=model, **params)
+
+
+def google_context_cached_model(model: str, **params) -> BaseChatModel:
+    """Gemini model that keeps the static prompt prefix in a context cache (needs a versioned model name)."""
+    from bookinggpt.agent.context_cache import ContextCachedGemini, GeminiContextCache
+
+    params.setdefault("google_api_key", os.getenv("GOOGLE_API_KEY"))
+    params.setdefault("context_cache", GeminiContextCache())
+    return ContextCachedGemini(model=model, **params)
+
+
+class ModelCallRecorder(BaseCallbackHandler):
+    """Counts and times the calls made through one registered model."""
+
+    run_inline = True
+
+    def __init__(self, name: str, latency: LatencyRecorder, counters: Dict[str, Dict[str, int]]):
+        self.name = name
+        self.latency = latency
+        self.counters = counters
+        self._started: Dict[UUID, float] = {}
+
+    def on_chat_model_start(self, serialized: dict, messages: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def on_llm_start(self, serialized: dict, prompts: list, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started[run_id] = time.perf_counter()
+
+    def _finish(self, run_id: UUID, outcome: str):
+        started = self._started.pop(run_id, None)
+        counters = self.counters.setdefault(self.name, {"calls": 0, "errors": 0})
+        counters[outcome] += 1
+        if started is not None and outcome == "calls":
+            self.latency.record(self.name, time.perf_counter() - started)
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "calls")
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id, "errors")
+
+
+class LLMRegistry:
+    """Shares chat model clients across the agent and its tools.
+
+    Clients are built once per (provider, model, parameters) and reused, so
+    the underlying API client and its connections stay open between calls.
+    A provider is a factory ``(model, **params) -> chat model``; swapping the
+    "google" provider, or registering a prebuilt model under a key, lets
+    offline tests serve local fake models through the same lookups. With a
+    ``cache`` set, every client answers repeated prompts from it.
+    """
+
+    def __init__(self, providers: Optional[Dict[str, ModelFactory]] = None, cache: Optional[BaseCache] = None):
+        self.providers: Dict[str, ModelFactory] = {
+            "google": google_chat_model, "google-cached": google_context_cached_model, **(providers or {}),
+        }
+        self.cache = cache
+        self.latency = LatencyRecorder()
+        self.counters = {"builds": 0, "reuses": 0}
+        self.calls: Dict[str, Dict[str, int]] = {}
+        self._clients: Dict[Tuple[Hashable, ...], BaseChatModel] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(model: str, provider: str, params: dict) -> Tuple[Hashable, ...]:
+        return (provider, model, tuple(sorted(params.items())))
+
+    def _track(self, model: str, client: BaseChatModel) -> BaseChatModel:
+        callbacks = [callback for callback in client.callbacks or [] if not isinstance(callback, ModelCallRecorder)]
+        client.callbacks = [*callbacks, ModelCallRecorder(model, self.latency, self.calls)]
+        if self.cache is not None:
+            client.cache = self.cache
+        return client
+
+    def get(self, model: str, provider: str = "google", **params) -> BaseChatModel:
+        key = self.key(model, provider, params)
+        with self._lock:
+            client = self._clients.get(key)
+            if client is not None:
+                self.counters["reuses"] += 1
+                return client
+            if provider not in self.providers:
+                raise ValueError(f"Unknown LLM provider: {provider!r}")
+            client = self._track(model, self.providers[provider](model, **params))
+            self._clients[key] = client
+            self.counters["builds"] += 1
+            return client
+
+    def register(self, model: str, client: BaseChatModel, provider: str = "google", **params) -> BaseChatModel:
+        """Serve ``client`` for ``get(model, provider, **params)``."""
+        with self._lock:
+            client = self._track(model, client)
+            self._clients[self.key(model, provider, params)] = client
+            return client
+
+    def register_provider(self, name: str, factory: ModelFactory):
+        with self._lock:
+            self.providers[name] = factory
+            # Clients built by the previous factory must not be served any more.
+            self._clients = {key: client for key, client in self._clients.items() if key[0] != name}
+
+    def set_cache(self, cache: Optional[BaseCache]):
+        """Use ``cache`` for every client, including those already built; None turns caching off."""
+        with self._lock:
+            self.cache = cache
+            for client in self._clients.values():
+                client.cache = cache
+
+    def clear(self):
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> dict:
+        latency = self.latency.summary()
+        return {
+            **self.counters,
+            "cache": self.cache.stats() if hasattr(self.cache, "stats") else None,
+            "models": {
+                name: {**counts, "latency": latency.get(name)} for name, counts in self.calls.items()
+            },
+        }
+
+
+_registry: Optional[LLMRegistry] = None
+_registry_lock = threading.Lock()
+
+
+def get_llm_registry() -> LLMRegistry:
+    global _registry
+    if _registry is None:
+        with _registry_lock:
+            if _registry is None:
+                _registry = LLMRegistry()
+    return _registry
@@ -0,0 +1,230 @@
+import asyncio
+import contextlib
+import json
+import time
+from typing import Optional
+
+from fastapi import FastAPI, WebSocket, WebSocketDisconnect
+from fastapi.responses import JSONResponse, StreamingResponse
+from pydantic import BaseModel
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.llm import get_llm_registry
+
+
+class Overloaded(Exception):
+    pass
+
+
+class TurnLimiter:
+    """Caps concurrent agent turns, queues a bounded number more and rejects the rest."""
+
+    def __init__(self, max_concurrency: int = 64, max_queue: int = 256, queue_timeout: float = 30.0):
+        self.max_concurrency = max_concurrency
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.accepting = True
+        self.in_flight = 0
+        self.waiting = 0
+        self.completed = 0
+        self.rejected = 0
+        self._semaphore = asyncio.Semaphore(max_concurrency)
+        self._idle = asyncio.Event()
+        self._idle.set()
+
+    @contextlib.asynccontextmanager
+    async def slot(self):
+        if not self.accepting:
+            self.rejected += 1
+            raise Overloaded("server is shutting down")
+        if self._semaphore.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise Overloaded("too many turns in flight")
+
+        self.waiting += 1
+        self._idle.clear()
+        try:
+            await asyncio.wait_for(self._semaphore.acquire(), self.queue_timeout)
+        except asyncio.TimeoutError:
+            self.waiting -= 1
+            self.rejected += 1
+            self._mark_idle()
+            raise Overloaded("timed out waiting for a free slot")
+        except BaseException:
+            self.waiting -= 1
+            self._mark_idle()
+            raise
+
+        self.waiting -= 1
+        self.in_flight += 1
+        try:
+            yield
+        finally:
+            self.in_flight -= 1
+            self.completed += 1
+            self._semaphore.release()
+            self._mark_idle()
+
+    def _mark_idle(self):
+        if self.in_flight == 0 and self.waiting == 0:
+            self._idle.set()
+        else:
+            self._idle.clear()
+
+    async def drain(self, timeout: Optional[float] = None) -> bool:
+        """Stop admitting turns and wait for the in-flight ones to finish."""
+        self.accepting = False
+        try:
+            await asyncio.wait_for(self._idle.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    def stats(self) -> dict:
+        return {
+            "accepting": self.accepting,
+            "in_flight": self.in_flight,
+            "waiting": self.waiting,
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "max_concurrency": self.max_concurrency,
+            "max_queue": self.max_queue,
+        }
+
+
+class ChatRequest(BaseModel):
+    session_id: str
+    message: str
+
+
+def create_app(
+    agent: BookingAgent,
+    max_concurrency: int = 64,
+    max_queue: int = 256,
+    queue_timeout: float = 30.0,
+    drain_timeout: float = 30.0,
+) -> FastAPI:
+    limiter = TurnLimiter(max_concurrency, max_queue, queue_timeout)
+
+    @contextlib.asynccontextmanager
+    async def lifespan(app: FastAPI):
+        yield
+        drained = await limiter.drain(drain_timeout)
+        if not drained:
+            print(f"Shutdown: {limiter.in_flight} turns still in flight after {drain_timeout}s")
+
+    app = FastAPI(title="Daisy Hair Salon booking assistant", lifespan=lifespan)
+    app.state.agent = agent
+    app.state.limiter = limiter
+
+    async def run_turn(session_id: str, message: str) -> dict:
+        async with limiter.slot():
+            start = time.perf_counter()
+            reply = await agent.acall_agent(message, session_id=session_id)
+            return {
+                "session_id": session_id,
+                "reply": reply,
+                "latency_seconds": time.perf_counter() - start,
+            }
+
+    async def stream_turn(session_id: str, message: str):
+        async with limiter.slot():
+            async for event in agent.astream_agent(message, session_id=session_id):
+                yield event
+
+    @app.post("/chat")
+    async def chat(request: ChatRequest):
+        try:
+            return await run_turn(request.session_id, request.message)
+        except Overloaded as error:
+            return JSONResponse({"error": str(error)}, status_code=503, headers={"Retry-After": "1"})
+
+    @app.post("/chat/stream")
+    async def chat_stream(request: ChatRequest):
+        events = stream_turn(request.session_id, request.message)
+        try:
+            # Admission happens before the first event, so overload is still a plain 503.
+            first = await events.__anext__()
+        except Overloaded as error:
+            return JSONResponse({"error": str(error)}, status_code=503, headers={"Retry-After": "1"})
+
+        async def ndjson():
+            yield json.dumps(first) + "\n"
+            async for event in events:
+                yield json.dumps(event) + "\n"
+
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
+
+    @app.websocket("/ws/{session_id}")
+    async def chat_socket(websocket: WebSocket, session_id: str):
+        """Streams token/tool events for each received message, ending with an "end" event."""
+        await websocket.accept()
+        try:
+            while True:
+                message = await websocket.receive_text()
+                try:
+                    async for event in stream_turn(session_id, message):
+                        await websocket.send_json(event)
+                except Overloaded as error:
+                    await websocket.send_json({"type": "error", "error": str(error)})
+        except WebSocketDisconnect:
+            pass
+
+    @app.get("/health")
+    async def health():
+        status = "ok" if limiter.accepting else "draining"
+        return {
+            "status": status,
+            "turns": limiter.stats(),
+            "sessions": agent.sessions.stats(),
+            "latency": agent.metrics.summary(),
+            "prompt_tokens": agent.usage_stats(),
+            "router": agent.router.stats() if agent.router is not None else None,
+            "tools": {tool.name: tool.stats() for tool in agent.tools if hasattr(tool, "stats")},
+            "llm": get_llm_registry().stats(),
+        }
+
+    return app
+
+
+def build_local_agent(llm_latency: float = 0.0, calendar=None, calendar_latency: float = 0.0,
+                      faults=None) -> BookingAgent:
+    """BookingAgent wired to the offline chat model and a local calendar backend (in-memory by default)."""
+    from bookinggpt.gcal.booking_index import BookingIndex
+    from bookinggpt.testing.fake_calendar import local_calendar_client
+    from bookinggpt.testing.fake_llm import ScriptedChatModel, demo_responder
+    from bookinggpt.tool.available_event import AvailableSlotsTool
+    from bookinggpt.tool.cancel_event import CancelEventTool
+    from bookinggpt.tool.create_event import CalendarTool
+    from bookinggpt.utils import AGENT_MODEL
+
+    calendar_client = local_calendar_client(calendar, latency=calendar_latency, faults=faults)
+    booking_index = BookingIndex(":memory:")
+    llm = get_llm_registry().register(
+        AGENT_MODEL, ScriptedChatModel(responder=demo_responder, latency=llm_latency), provider="local",
+    )
+    agent = BookingAgent(
+        llm,
+        tools=[
+            CalendarTool(calendar_client=calendar_client, booking_index=booking_index),
+            AvailableSlotsTool(calendar_client=calendar_client),
+            CancelEventTool(calendar_client=calendar_client, booking_index=booking_index),
+        ],
+    )
+    agent.verbose = False
+    return agent
+
+
+def serve(
+    agent: BookingAgent,
+    host: str = "127.0.0.1",
+    port: int = 8000,
+    max_concurrency: int = 64,
+    max_queue: int = 256,
+    queue_timeout: float = 30.0,
+    drain_timeout: float = 30.0,
+):
+    import uvicorn
+
+    app = create_app(agent, max_concurrency, max_queue, queue_timeout, drain_timeout)
+    uvicorn.run(app, host=host, port=port, timeout_graceful_shutdown=int(drain_timeout))
@@ -0,0 +1 @@
+"""Offline stand-ins for the external services used by BookingGPT."""
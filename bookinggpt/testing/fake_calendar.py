@@ -0,0 +1,424 @@
+import copy
+import datetime
+import json
+import random
+import threading
+import time
+import uuid
+from abc import ABC, abstractmethod
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import httplib2
+from googleapiclient.errors import BatchError, HttpError
+
+
+def http_error(status: int, message: str, uri: str = "fake://calendar") -> HttpError:
+    content = json.dumps({"error": {"code": status, "message": message}}).encode()
+    return HttpError(httplib2.Response({"status": status}), content, uri=uri)
+
+
+def parse_time(value: str) -> datetime.datetime:
+    parsed = datetime.datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+    return parsed
+
+
+def merge_patch(target: dict, patch: dict):
+    """Patch semantics: nested objects are merged, everything else is replaced."""
+    for key, value in patch.items():
+        if isinstance(value, dict) and isinstance(target.get(key), dict):
+            merge_patch(target[key], value)
+        else:
+            target[key] = copy.deepcopy(value)
+
+
+def matches_properties(event: dict, filters) -> bool:
+    if isinstance(filters, str):
+        filters = [filters]
+    private = event.get("extendedProperties", {}).get("private", {})
+    return all(private.get(key) == value for key, _, value in (item.partition("=") for item in filters))
+
+
+def event_bounds(event: dict):
+    start = event["start"].get("dateTime", event["start"].get("date"))
+    end = event["end"].get("dateTime", event["end"].get("date"))
+    return parse_time(start), parse_time(end)
+
+
+def event_matches(event: dict, q: Optional[str] = None, privateExtendedProperty=None) -> bool:
+    """The ``q`` and ``privateExtendedProperty`` filters of ``events().list``."""
+    if q and q.lower() not in (event.get("summary", "") + " " + event.get("description", "")).lower():
+        return False
+    return not privateExtendedProperty or matches_properties(event, privateExtendedProperty)
+
+
+def page_of(items: Sequence[dict], page_token: Optional[str], max_results: Optional[int], page_size: int,
+            sync_token: str) -> dict:
+    """One ``events().list`` page; the last page carries ``nextSyncToken``."""
+    offset = int(page_token) if page_token else 0
+    size = min(max_results or page_size, page_size)
+    result = {"kind": "calendar#events", "items": copy.deepcopy(list(items[offset:offset + size]))}
+    if offset + size < len(items):
+        result["nextPageToken"] = str(offset + size)
+    else:
+        result["nextSyncToken"] = sync_token
+    return result
+
+
+def merge_busy(bounds: Iterable[Tuple[datetime.datetime, datetime.datetime]], time_min: str,
+               time_max: str) -> List[dict]:
+    """Merged busy periods of sorted (start, end) pairs clipped to the window, as ``freebusy().query`` reports them."""
+    window_start, window_end = parse_time(time_min), parse_time(time_max)
+    periods = []
+    for start, end in bounds:
+        start, end = max(start, window_start), min(end, window_end)
+        if start >= end:
+            continue
+        if periods and start <= periods[-1][1]:
+            periods[-1][1] = max(periods[-1][1], end)
+        else:
+            periods.append([start, end])
+    utc = datetime.timezone.utc
+    return [
+        {"start": start.astimezone(utc).isoformat().replace("+00:00", "Z"),
+         "end": end.astimezone(utc).isoformat().replace("+00:00", "Z")}
+        for start, end in periods
+    ]
+
+
+class CalendarBackend(ABC):
+    """Storage for one calendar behind FakeCalendarService.
+
+    Implementations follow the Calendar API semantics the tools rely on:
+    generated ids, 404/409/410 errors raised as HttpError, paged listing
+    with time, text and private property filters, sync tokens with
+    cancelled tombstones, and busy periods for freebusy queries.
+    """
+
+    page_size: int
+    requests: int
+
+    @abstractmethod
+    def insert(self, calendar_id: str, body: dict) -> dict: ...
+
+    @abstractmethod
+    def get(self, calendar_id: str, event_id: str) -> dict: ...
+
+    @abstractmethod
+    def patch(self, calendar_id: str, event_id: str, body: dict) -> dict: ...
+
+    @abstractmethod
+    def delete(self, calendar_id: str, event_id: str) -> str: ...
+
+    @abstractmethod
+    def list(self, calendar_id: str, timeMin: Optional[str] = None, timeMax: Optional[str] = None,
+             q: Optional[str] = None, maxResults: Optional[int] = None, pageToken: Optional[str] = None,
+             singleEvents: bool = False, orderBy: Optional[str] = None, syncToken: Optional[str] = None,
+             privateExtendedProperty=None, **kwargs) -> dict: ...
+
+    @abstractmethod
+    def busy(self, time_min: str, time_max: str) -> List[dict]: ...
+
+    @abstractmethod
+    def invalidate_sync_tokens(self):
+        """Make every issued sync token expire, as the API does with 410 Gone."""
+
+
+class InMemoryCalendar(CalendarBackend):
+    """Event storage in process memory."""
+
+    def __init__(self, page_size: int = 250):
+        self.page_size = page_size
+        self.events: Dict[str, dict] = {}
+        self.requests = 0
+        self._lock = threading.Lock()
+        # Every change gets a sequence number; a sync token is the sequence it was issued at.
+        self._sequence = 0
+        self._versions: Dict[str, int] = {}
+        self._tombstones: Dict[str, int] = {}
+        self._oldest_valid_token = 0
+
+    def _touch(self, event_id: str):
+        self._sequence += 1
+        self._versions[event_id] = self._sequence
+
+    def invalidate_sync_tokens(self):
+        with self._lock:
+            self._oldest_valid_token = self._sequence + 1
+
+    def insert(self, calendar_id: str, body: dict) -> dict:
+        with self._lock:
+            self.requests += 1
+            event = copy.deepcopy(body)
+            event.setdefault("id", uuid.uuid4().hex)
+            if event["id"] in self.events:
+                raise http_error(409, "The requested identifier already exists.")
+            event.setdefault("status", "confirmed")
+            self.events[event["id"]] = event
+            self._tombstones.pop(event["id"], None)
+            self._touch(event["id"])
+            return copy.deepcopy(event)
+
+    def get(self, calendar_id: str, event_id: str) -> dict:
+        with self._lock:
+            self.requests += 1
+            if event_id not in self.events:
+                raise http_error(404, "Not Found")
+            return copy.deepcopy(self.events[event_id])
+
+    def patch(self, calendar_id: str, event_id: str, body: dict) -> dict:
+        with self._lock:
+            self.requests += 1
+            if event_id not in self.events:
+                raise http_error(404, "Not Found")
+            merge_patch(self.events[event_id], body)
+            self._touch(event_id)
+            return copy.deepcopy(self.events[event_id])
+
+    def delete(self, calendar_id: str, event_id: str) -> str:
+        with self._lock:
+            self.requests += 1
+            if event_id not in self.events:
+                raise http_error(410, "Resource has been deleted")
+            del self.events[event_id]
+            self._versions.pop(event_id, None)
+            self._sequence += 1
+            self._tombstones[event_id] = self._sequence
+            return ""
+
+    def list(self, calendar_id: str, timeMin: Optional[str] = None, timeMax: Optional[str] = None,
+             q: Optional[str] = None, maxResults: Optional[int] = None, pageToken: Optional[str] = None,
+             singleEvents: bool = False, orderBy: Optional[str] = None, syncToken: Optional[str] = None,
+             privateExtendedProperty=None, **kwargs) -> dict:
+        with self._lock:
+            self.requests += 1
+            if syncToken is not None:
+                return self._list_changes(int(syncToken), maxResults, pageToken)
+            events = list(self.events.values())
+            sync_token = str(self._sequence)
+        time_min = parse_time(timeMin) if timeMin else None
+        time_max = parse_time(timeMax) if timeMax else None
+        matched: List[dict] = []
+        for event in events:
+            start, end = event_bounds(event)
+            if time_min and end <= time_min:
+                continue
+            if time_max and start >= time_max:
+                continue
+            if event_matches(event, q, privateExtendedProperty):
+                matched.append(event)
+        if orderBy == "startTime":
+            matched.sort(key=lambda event: event_bounds(event)[0])
+        return page_of(matched, pageToken, maxResults, self.page_size, sync_token)
+
+    def busy(self, time_min: str, time_max: str) -> List[dict]:
+        with self._lock:
+            bounds = sorted(
+                event_bounds(event) for event in self.events.values()
+                if event.get("transparency") != "transparent"
+            )
+        return merge_busy(bounds, time_min, time_max)
+
+    def _list_changes(self, since: int, maxResults: Optional[int], pageToken: Optional[str]) -> dict:
+        if since < self._oldest_valid_token:
+            raise http_error(410, "Sync token is no longer valid, a full sync is required.")
+        changed = [
+            (version, self.events[event_id])
+            for event_id, version in self._versions.items() if version > since
+        ]
+        changed += [
+            (sequence, {"id": event_id, "status": "cancelled"})
+            for event_id, sequence in self._tombstones.items() if sequence > since
+        ]
+        changed.sort(key=lambda change: change[0])
+        return page_of([event for _, event in changed], pageToken, maxResults, self.page_size, str(self._sequence))
+
+
+class Faults:
+    """Latency and errors injected into fake Calendar calls.
+
+    Every round trip takes ``latency`` seconds more, plus up to ``jitter``.
+    Calls to ``operations`` ("list", "insert", "get", "patch", "delete",
+    "freebusy"; all when None) fail with HTTP ``status`` at ``error_rate``.
+    Draws come from a seeded generator, so a run can be repeated.
+    """
+
+    def __init__(self, error_rate: float = 0.0, status: int = 503, latency: float = 0.0, jitter: float = 0.0,
+                 operations: Optional[Iterable[str]] = None, seed: int = 0):
+        self.error_rate = error_rate
+        self.status = status
+        self.latency = latency
+        self.jitter = jitter
+        self.operations = frozenset(operations) if operations is not None else None
+        self.counters = {"calls": 0, "errors": 0}
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def delay(self) -> float:
+        with self._lock:
+            return self.latency + (self._rng.uniform(0, self.jitter) if self.jitter else 0.0)
+
+    def check(self, operation: str):
+        """Raise the injected error for this call, if it is one of the failing ones."""
+        with self._lock:
+            self.counters["calls"] += 1
+            if self.operations is not None and operation not in self.operations:
+                return
+            if not self.error_rate or self._rng.random() >= self.error_rate:
+                return
+            self.counters["errors"] += 1
+        raise http_error(self.status, "Backend Error" if self.status >= 500 else "Injected error")
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self.counters)
+
+
+class FakeRequest:
+    """A prepared call; ``execute`` costs one simulated HTTP round trip of ``latency`` seconds."""
+
+    def __init__(self, method, latency: float = 0.0, faults: Optional[Faults] = None,
+                 operation: Optional[str] = None, **kwargs):
+        self.method = method
+        self.latency = latency
+        self.faults = faults
+        self.operation = operation or method.__name__
+        self.kwargs = kwargs
+
+    def run(self):
+        if self.faults is not None:
+            self.faults.check(self.operation)
+        return self.method(**self.kwargs)
+
+    def execute(self, num_retries: int = 0):
+        latency = self.latency + (self.faults.delay() if self.faults is not None else 0.0)
+        if latency:
+            time.sleep(latency)
+        return self.run()
+
+
+class FakeEventsResource:
+    def __init__(self, calendar: CalendarBackend, latency: float = 0.0, faults: Optional[Faults] = None,
+                 calendars: Optional[Dict[str, CalendarBackend]] = None):
+        self.calendar = calendar
+        self.calendars = calendars or {}
+        self.latency = latency
+        self.faults = faults
+
+    def _request(self, method, **kwargs) -> FakeRequest:
+        return FakeRequest(method, self.latency, self.faults, **kwargs)
+
+    def _calendar(self, calendar_id: str) -> CalendarBackend:
+        return self.calendars.get(calendar_id, self.calendar)
+
+    def list(self, calendarId: str, **kwargs) -> FakeRequest:
+        return self._request(self._calendar(calendarId).list, calendar_id=calendarId, **kwargs)
+
+    def insert(self, calendarId: str, body: dict, **kwargs) -> FakeRequest:
+        return self._request(self._calendar(calendarId).insert, calendar_id=calendarId, body=body)
+
+    def get(self, calendarId: str, eventId: str, **kwargs) -> FakeRequest:
+        return self._request(self._calendar(calendarId).get, calendar_id=calendarId, event_id=eventId)
+
+    def patch(self, calendarId: str, eventId: str, body: dict, **kwargs) -> FakeRequest:
+        return self._request(self._calendar(calendarId).patch, calendar_id=calendarId, event_id=eventId, body=body)
+
+    def delete(self, calendarId: str, eventId: str, **kwargs) -> FakeRequest:
+        return self._request(self._calendar(calendarId).delete, calendar_id=calendarId, event_id=eventId)
+
+
+class FakeBatchHttpRequest:
+    """Runs queued requests in order on execute(), reporting each through its callback.
+
+    The whole batch costs one round trip of the service's latency.
+    """
+
+    MAX_CALLS = 1000
+
+    def __init__(self, service: "FakeCalendarService", callback=None):
+        self.service = service
+        self.callback = callback
+        self._requests = []
+
+    def add(self, request: FakeRequest, callback=None, request_id: Optional[str] = None):
+        if len(self._requests) >= self.MAX_CALLS:
+            raise BatchError(f"Exceeded maximum calls({self.MAX_CALLS}) in a single batch request.")
+        request_id = request_id or str(len(self._requests) + 1)
+        self._requests.append((request_id, request, callback or self.callback))
+
+    def execute(self):
+        self.service.batches += 1
+        faults = self.service.faults
+        latency = self.service.latency + (faults.delay() if faults is not None else 0.0)
+        if latency:
+            time.sleep(latency)
+        for request_id, request, callback in self._requests:
+            response, exception = None, None
+            try:
+                response = request.run()
+            except HttpError as error:
+                exception = error
+            if callback is not None:
+                callback(request_id, response, exception)
+
+
+class FakeFreeBusyResource:
+    def __init__(self, calendars: Dict[str, CalendarBackend], latency: float = 0.0, faults: Optional[Faults] = None):
+        self.calendars = calendars
+        self.latency = latency
+        self.faults = faults
+        self.requests = 0
+
+    def _query(self, body: dict) -> dict:
+        self.requests += 1
+        result = {}
+        for item in body.get("items", []):
+            calendar = self.calendars.get(item["id"])
+            if calendar is None:
+                result[item["id"]] = {"busy": [], "errors": [{"domain": "global", "reason": "notFound"}]}
+            else:
+                result[item["id"]] = {"busy": calendar.busy(body["timeMin"], body["timeMax"])}
+        return {"kind": "calendar#freeBusy", "timeMin": body["timeMin"], "timeMax": body["timeMax"],
+                "calendars": result}
+
+    def query(self, body: dict, **kwargs) -> FakeRequest:
+        return FakeRequest(self._query, self.latency, self.faults, operation="freebusy", body=body)
+
+
+class FakeCalendarService:
+    """Stand-in for the ``build("calendar", "v3")`` resource, backed by a CalendarBackend.
+
+    ``calendar`` (an InMemoryCalendar by default) is "primary" and serves
+    any unknown calendar id; ``events()`` and ``freebusy()`` also answer for
+    the additional ``calendars`` by id.
+    ``latency`` simulates each HTTP round trip; ``faults`` adds jitter and
+    errors on top.
+    """
+
+    def __init__(self, calendar: Optional[CalendarBackend] = None,
+                 calendars: Optional[Dict[str, CalendarBackend]] = None, latency: float = 0.0,
+                 faults: Optional[Faults] = None):
+        self.latency = latency
+        self.faults = faults
+        self.calendar = calendar if calendar is not None else InMemoryCalendar()
+        self.calendars = {"primary": self.calendar, **(calendars or {})}
+        self._freebusy = FakeFreeBusyResource(self.calendars, latency, faults)
+        self.batches = 0
+
+    def events(self) -> FakeEventsResource:
+        return FakeEventsResource(self.calendar, self.latency, self.faults, self.calendars)
+
+    def freebusy(self) -> FakeFreeBusyResource:
+        return self._freebusy
+
+    def new_batch_http_request(self, callback=None) -> FakeBatchHttpRequest:
+        return FakeBatchHttpRequest(self, callback)
+
+
+def local_calendar_client(calendar: Optional[CalendarBackend] = None, latency: float = 0.0,
+                          faults: Optional[Faults] = None):
+    """Calendar client for the tools that talks to ``calendar`` instead of the Calendar API."""
+    from bookinggpt.gcal.client import StaticCalendarClient
+
+    return StaticCalendarClient(FakeCalendarService(calendar, latency=latency, faults=faults))
@@ -0,0 +1,308 @@
+import asyncio
+import itertools
+import json
+import re
+import threading
+import time
+import uuid
+from typing import Any, AsyncIterator, Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+from uuid import UUID
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk, BaseMessage, HumanMessage, ToolMessage
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.pydantic_v1 import Field, PrivateAttr
+
+from bookinggpt.cache import normalize_text
+
+Response = Union[str, AIMessage]
+TAPE_VERSION = 1
+# Prompt lines that change on every call, like the extraction prompt's timestamp, are not part of a tape key.
+_VOLATILE_LINES = re.compile(r"^Current time:.*$", re.MULTILINE)
+
+
+class ScriptedChatModel(BaseChatModel):
+    """Chat model that answers from a script with simulated latency.
+
+    Each call returns the next entry of ``responses`` (cycling), or whatever
+    ``responder`` returns for the incoming messages. Tool binding is accepted
+    and ignored, so the model can drive a tool-calling AgentExecutor. When
+    streamed, ``latency`` passes before the first chunk and ``token_latency``
+    between word chunks.
+    """
+
+    responses: List[Response] = Field(default_factory=lambda: ["Hey there! 👋 How can I help you today?"])
+    responder: Optional[Callable[[List[BaseMessage]], Response]] = None
+    latency: float = 0.0
+    token_latency: float = 0.0
+    calls: int = 0
+    _cycle: Any = PrivateAttr(default=None)
+    _lock: Any = PrivateAttr(default_factory=threading.Lock)
+
+    @property
+    def _llm_type(self) -> str:
+        return "scripted-chat-model"
+
+    def _get_invocation_params(self, stop=None, **kwargs: Any) -> dict:
+        # The call counter is state, not a parameter; keep it out of cache keys.
+        params = super()._get_invocation_params(stop=stop, **kwargs)
+        params.pop("calls", None)
+        return params
+
+    def bind_tools(self, tools: Sequence[Any], **kwargs: Any) -> "ScriptedChatModel":
+        return self
+
+    def next_response(self, messages: List[BaseMessage]) -> AIMessage:
+        with self._lock:
+            self.calls += 1
+            if self.responder is not None:
+                response = self.responder(messages)
+            else:
+                if self._cycle is None:
+                    self._cycle = itertools.cycle(self.responses)
+                response = next(self._cycle)
+        if isinstance(response, str):
+            return AIMessage(content=response)
+        return response.copy()
+
+    def response_latency(self, message: AIMessage) -> float:
+        return self.latency
+
+    def _generate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self.next_response(messages)
+        if self.response_latency(message):
+            time.sleep(self.response_latency(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> ChatResult:
+        message = self.next_response(messages)
+        if self.response_latency(message):
+            await asyncio.sleep(self.response_latency(message))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    def _chunks(self, message: AIMessage) -> List[ChatGenerationChunk]:
+        if message.tool_calls:
+            tool_call_chunks = [
+                {"name": call["name"], "args": json.dumps(call["args"]), "id": call["id"], "index": index}
+                for index, call in enumerate(message.tool_calls)
+            ]
+            return [ChatGenerationChunk(
+                message=AIMessageChunk(content=message.content, tool_call_chunks=tool_call_chunks)
+            )]
+        words = re.findall(r"\S+\s*|\s+", str(message.content)) or [""]
+        return [ChatGenerationChunk(message=AIMessageChunk(content=word)) for word in words]
+
+    def _stream(self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any) -> Iterator[ChatGenerationChunk]:
+        message = self.next_response(messages)
+        if self.response_latency(message):
+            time.sleep(self.response_latency(message))
+        for index, chunk in enumerate(self._chunks(message)):
+            if index and self.token_latency:
+                time.sleep(self.token_latency)
+            if run_manager:
+                run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+    async def _astream(
+        self, messages: List[BaseMessage], stop=None, run_manager=None, **kwargs: Any
+    ) -> AsyncIterator[ChatGenerationChunk]:
+        message = self.next_response(messages)
+        if self.response_latency(message):
+            await asyncio.sleep(self.response_latency(message))
+        for index, chunk in enumerate(self._chunks(message)):
+            if index and self.token_latency:
+                await asyncio.sleep(self.token_latency)
+            if run_manager:
+                await run_manager.on_llm_new_token(chunk.text, chunk=chunk)
+            yield chunk
+
+
+SLOT_KEYWORDS = ("available", "slot", "free", "open", "lịch trống", "giờ trống", "còn trống")
+
+
+def last_tool_observation(messages: List[BaseMessage]) -> Optional[str]:
+    for message in reversed(messages):
+        if isinstance(message, ToolMessage):
+            return str(message.content)
+        if isinstance(message, HumanMessage):
+            return None
+        # Prompts that render agent_scratchpad as text carry the tool output inline.
+        if isinstance(message, AIMessage) and "ToolMessage(" in str(message.content):
+            return str(message.content)
+    return None
+
+
+def last_human_text(messages: List[BaseMessage]) -> str:
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            return str(message.content)
+    return ""
+
+
+def demo_responder(messages: List[BaseMessage]) -> AIMessage:
+    """Small salon script: checks availability when asked, otherwise chats."""
+    observation = last_tool_observation(messages)
+    if observation is not None:
+        return AIMessage(content=f"Here's what I found in our calendar 😊\n{observation}")
+    text = last_human_text(messages).lower()
+    if any(keyword in text for keyword in SLOT_KEYWORDS):
+        return AIMessage(
+            content="",
+            tool_calls=[{"name": "available_slots_tool", "args": {}, "id": f"call_{uuid.uuid4().hex[:8]}"}],
+        )
+    return AIMessage(content="Hey there! 👋 Want me to check our open slots at Daisy Hair Salon?")
+
+
+class ReplayMismatch(LookupError):
+    """A replayed model was asked something its tape has no recorded response for."""
+
+
+def tape_input(text: str) -> str:
+    return _VOLATILE_LINES.sub("", text).strip()
+
+
+def tape_key(messages: List[BaseMessage]) -> Tuple[str, int]:
+    """What a response answers: the last customer message and how many tool results followed it."""
+    steps = 0
+    for message in reversed(messages):
+        if isinstance(message, HumanMessage):
+            break
+        steps += isinstance(message, ToolMessage)
+    return normalize_text(tape_input(last_human_text(messages))), steps
+
+
+class Tape:
+    """Recorded model responses, replayed as a ScriptedChatModel responder.
+
+    Responses are keyed by ``tape_key``, so replay does not depend on
+    generated ids, booking codes or tool output in the prompt, and
+    interleaved sessions replay correctly. Responses recorded for the same
+    key replay in order and then cycle. Each exchange keeps the seconds the
+    model took, for replay at the recorded latency. Unknown keys raise
+    ReplayMismatch unless a ``fallback`` response is set.
+    """
+
+    def __init__(self, exchanges: Iterable[dict] = (), fallback: Optional[Response] = None):
+        self.exchanges: List[dict] = []
+        self.fallback = fallback
+        self._index: Dict[Tuple[str, int], List[dict]] = {}
+        self._cursors: Dict[Tuple[str, int], int] = {}
+        self._call_ids = itertools.count(1)
+        self._lock = threading.Lock()
+        for exchange in exchanges:
+            self._add(exchange)
+
+    def _add(self, exchange: dict):
+        self.exchanges.append(exchange)
+        key = (normalize_text(tape_input(exchange["input"])), exchange.get("step", 0))
+        self._index.setdefault(key, []).append(exchange)
+
+    def record(self, messages: List[BaseMessage], message: AIMessage, seconds: float = 0.0):
+        text, step = tape_key(messages)
+        with self._lock:
+            self._add({
+                "input": tape_input(last_human_text(messages)), "step": step, "seconds": round(seconds, 4),
+                "content": str(message.content),
+                "tool_calls": [{"name": call["name"], "args": call["args"]} for call in message.tool_calls],
+            })
+
+    def __call__(self, messages: List[BaseMessage]) -> AIMessage:
+        key = tape_key(messages)
+        with self._lock:
+            recorded = self._index.get(key)
+            if not recorded:
+                if self.fallback is None:
+                    raise ReplayMismatch(f"No recorded response for {key[0]!r} (step {key[1]})")
+                return self.fallback if isinstance(self.fallback, AIMessage) else AIMessage(content=self.fallback)
+            position = self._cursors.get(key, 0)
+            self._cursors[key] = position + 1
+            exchange = recorded[position % len(recorded)]
+            tool_calls = [{"name": call["name"], "args": call["args"], "id": f"call_{next(self._call_ids)}"}
+                          for call in exchange.get("tool_calls", [])]
+        return AIMessage(content=exchange.get("content", ""), tool_calls=tool_calls,
+                         response_metadata={"recorded_seconds": exchange.get("seconds", 0.0)})
+
+    def rewind(self):
+        with self._lock:
+            self._cursors.clear()
+            self._call_ids = itertools.count(1)
+
+    @classmethod
+    def load(cls, path: str, **options) -> "Tape":
+        with open(path, encoding="utf-8") as file:
+            data = json.load(file)
+        if data.get("version") != TAPE_VERSION:
+            raise ValueError(f"Unsupported tape version in {path}: {data.get('version')!r}")
+        return cls(data["exchanges"], **options)
+
+    def save(self, path: str):
+        with self._lock:
+            data = {"version": TAPE_VERSION, "exchanges": list(self.exchanges)}
+        with open(path, "w", encoding="utf-8") as file:
+            json.dump(data, file, ensure_ascii=False, indent=2)
+
+
+class TapeRecorder(BaseCallbackHandler):
+    """Records the responses of any chat model it is attached to (e.g. ChatGoogleGenerativeAI) onto a Tape."""
+
+    run_inline = True
+
+    def __init__(self, tape: Optional[Tape] = None):
+        self.tape = tape if tape is not None else Tape()
+        self._started: Dict[UUID, Tuple[List[BaseMessage], float]] = {}
+
+    def on_chat_model_start(self, serialized: dict, messages: List[List[BaseMessage]], *, run_id: UUID,
+                            **kwargs: Any) -> None:
+        self._started[run_id] = (messages[0] if messages else [], time.perf_counter())
+
+    def on_llm_end(self, response: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        started = self._started.pop(run_id, None)
+        generations = getattr(response, "generations", None)
+        if started is None or not generations or not generations[0]:
+            return
+        message = getattr(generations[0][0], "message", None)
+        if isinstance(message, AIMessage):
+            self.tape.record(started[0], message, time.perf_counter() - started[1])
+
+    def on_llm_error(self, error: BaseException, *, run_id: UUID, **kwargs: Any) -> None:
+        self._started.pop(run_id, None)
+
+
+class ReplayChatModel(ScriptedChatModel):
+    """ScriptedChatModel that replays a Tape.
+
+    Each response takes ``latency`` seconds, or the recorded time scaled by
+    ``latency_scale`` when ``recorded_latency`` is set.
+    """
+
+    tape: Any = None
+    recorded_latency: bool = False
+    latency_scale: float = 1.0
+
+    @property
+    def _llm_type(self) -> str:
+        return "replay-chat-model"
+
+    def _get_invocation_params(self, stop=None, **kwargs: Any) -> dict:
+        params = super()._get_invocation_params(stop=stop, **kwargs)
+        params.pop("tape", None)
+        return params
+
+    def next_response(self, messages: List[BaseMessage]) -> AIMessage:
+        with self._lock:
+            self.calls += 1
+        return self.tape(messages)
+
+    def response_latency(self, message: AIMessage) -> float:
+        if self.recorded_latency:
+            return message.response_metadata.get("recorded_seconds", 0.0) * self.latency_scale
+        return self.latency
+
+
+def replay_provider(tape: Tape, **options) -> Callable[..., ReplayChatModel]:
+    """LLMRegistry provider serving every model from ``tape``, in place of Gemini."""
+    def factory(model: str, **params) -> ReplayChatModel:
+        return ReplayChatModel(tape=tape, **options)
+
+    return factory
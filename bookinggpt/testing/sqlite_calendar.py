@@ -0,0 +1,165 @@
+import copy
+import datetime
+import json
+import sqlite3
+import threading
+import uuid
+from typing import List, Optional
+
+from bookinggpt.testing.fake_calendar import (
+    CalendarBackend, event_bounds, event_matches, http_error, merge_busy, merge_patch, page_of, parse_time,
+)
+
+_UTC = datetime.timezone.utc
+
+
+def _row_bounds(event: dict):
+    start, end = event_bounds(event)
+    return start.timestamp(), end.timestamp(), int(event.get("transparency") == "transparent")
+
+
+class SQLiteCalendar(CalendarBackend):
+    """Event storage in a SQLite file, so a local calendar survives restarts and can hold large loads.
+
+    Events are stored as JSON with their start and end as indexed epoch
+    seconds; time-range filters, ordering and busy periods run in SQL. The
+    change sequence behind sync tokens is stored too, so tokens stay valid
+    across restarts.
+    """
+
+    def __init__(self, path: str = ":memory:", page_size: int = 250):
+        self.path = path
+        self.page_size = page_size
+        self.requests = 0
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        with self._lock, self._connection:
+            if path != ":memory:":
+                self._connection.execute("PRAGMA journal_mode=WAL")
+            self._connection.executescript(
+                "CREATE TABLE IF NOT EXISTS events ("
+                " id TEXT PRIMARY KEY, body TEXT NOT NULL, start_ts REAL NOT NULL, end_ts REAL NOT NULL,"
+                " transparent INTEGER NOT NULL, version INTEGER NOT NULL);"
+                "CREATE INDEX IF NOT EXISTS events_start ON events (start_ts);"
+                "CREATE INDEX IF NOT EXISTS events_version ON events (version);"
+                "CREATE TABLE IF NOT EXISTS tombstones (id TEXT PRIMARY KEY, version INTEGER NOT NULL);"
+                "CREATE TABLE IF NOT EXISTS sequence (name TEXT PRIMARY KEY, value INTEGER NOT NULL);"
+                "INSERT OR IGNORE INTO sequence VALUES ('changes', 0), ('oldest_valid_token', 0);"
+            )
+
+    def _value(self, name: str) -> int:
+        return self._connection.execute("SELECT value FROM sequence WHERE name = ?", (name,)).fetchone()[0]
+
+    def _next_version(self) -> int:
+        self._connection.execute("UPDATE sequence SET value = value + 1 WHERE name = 'changes'")
+        return self._value("changes")
+
+    def _load(self, event_id: str) -> Optional[dict]:
+        row = self._connection.execute("SELECT body FROM events WHERE id = ?", (event_id,)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def _store(self, event: dict):
+        self._connection.execute(
+            # An upsert keeps the rowid, so a patched event keeps its place in unordered listings.
+            "INSERT INTO events (id, body, start_ts, end_ts, transparent, version) VALUES (?, ?, ?, ?, ?, ?)"
+            " ON CONFLICT (id) DO UPDATE SET body = excluded.body, start_ts = excluded.start_ts,"
+            " end_ts = excluded.end_ts, transparent = excluded.transparent, version = excluded.version",
+            (event["id"], json.dumps(event), *_row_bounds(event), self._next_version()),
+        )
+
+    def invalidate_sync_tokens(self):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "UPDATE sequence SET value = ? WHERE name = 'oldest_valid_token'", (self._value("changes") + 1,)
+            )
+
+    def insert(self, calendar_id: str, body: dict) -> dict:
+        event = copy.deepcopy(body)
+        event.setdefault("id", uuid.uuid4().hex)
+        event.setdefault("status", "confirmed")
+        with self._lock, self._connection:
+            self.requests += 1
+            if self._load(event["id"]) is not None:
+                raise http_error(409, "The requested identifier already exists.")
+            self._connection.execute("DELETE FROM tombstones WHERE id = ?", (event["id"],))
+            self._store(event)
+        return event
+
+    def get(self, calendar_id: str, event_id: str) -> dict:
+        with self._lock:
+            self.requests += 1
+            event = self._load(event_id)
+        if event is None:
+            raise http_error(404, "Not Found")
+        return event
+
+    def patch(self, calendar_id: str, event_id: str, body: dict) -> dict:
+        with self._lock, self._connection:
+            self.requests += 1
+            event = self._load(event_id)
+            if event is None:
+                raise http_error(404, "Not Found")
+            merge_patch(event, body)
+            self._store(event)
+        return event
+
+    def delete(self, calendar_id: str, event_id: str) -> str:
+        with self._lock, self._connection:
+            self.requests += 1
+            if self._connection.execute("DELETE FROM events WHERE id = ?", (event_id,)).rowcount == 0:
+                raise http_error(410, "Resource has been deleted")
+            self._connection.execute("INSERT OR REPLACE INTO tombstones VALUES (?, ?)",
+                                     (event_id, self._next_version()))
+        return ""
+
+    def list(self, calendar_id: str, timeMin: Optional[str] = None, timeMax: Optional[str] = None,
+             q: Optional[str] = None, maxResults: Optional[int] = None, pageToken: Optional[str] = None,
+             singleEvents: bool = False, orderBy: Optional[str] = None, syncToken: Optional[str] = None,
+             privateExtendedProperty=None, **kwargs) -> dict:
+        time_min = parse_time(timeMin).timestamp() if timeMin else None
+        time_max = parse_time(timeMax).timestamp() if timeMax else None
+        with self._lock:
+            self.requests += 1
+            if syncToken is not None:
+                return self._list_changes(int(syncToken), maxResults, pageToken)
+            rows = self._connection.execute(
+                "SELECT body FROM events WHERE (? IS NULL OR end_ts > ?) AND (? IS NULL OR start_ts < ?)"
+                + (" ORDER BY start_ts, rowid" if orderBy == "startTime" else " ORDER BY rowid"),
+                (time_min, time_min, time_max, time_max),
+            ).fetchall()
+            sync_token = str(self._value("changes"))
+        matched = [event for event in (json.loads(body) for body, in rows)
+                   if event_matches(event, q, privateExtendedProperty)]
+        return page_of(matched, pageToken, maxResults, self.page_size, sync_token)
+
+    def _list_changes(self, since: int, maxResults: Optional[int], pageToken: Optional[str]) -> dict:
+        if since < self._value("oldest_valid_token"):
+            raise http_error(410, "Sync token is no longer valid, a full sync is required.")
+        rows = self._connection.execute(
+            "SELECT version, body FROM events WHERE version > ? UNION ALL"
+            " SELECT version, json_object('id', id, 'status', 'cancelled') FROM tombstones WHERE version > ?"
+            " ORDER BY version",
+            (since, since),
+        ).fetchall()
+        changed = [json.loads(body) for _, body in rows]
+        return page_of(changed, pageToken, maxResults, self.page_size, str(self._value("changes")))
+
+    def busy(self, time_min: str, time_max: str) -> List[dict]:
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT start_ts, end_ts FROM events WHERE transparent = 0 AND end_ts > ? AND start_ts < ?"
+                " ORDER BY start_ts",
+                (parse_time(time_min).timestamp(), parse_time(time_max).timestamp()),
+            ).fetchall()
+        return merge_busy(
+            ((datetime.datetime.fromtimestamp(start, _UTC), datetime.datetime.fromtimestamp(end, _UTC))
+             for start, end in rows),
+            time_min, time_max,
+        )
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM events").fetchone()[0]
+
+    def close(self):
+        self._connection.close()
@@ -1,15 +1,38 @@
-import os
+import asyncio
 import datetime
+import itertools
+import threading
 from zoneinfo import ZoneInfo
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from typing import Any, Iterator, List, Optional, Type
 from pydantic import Field
 from langchain.tools import BaseTool
+from langchain_core.pydantic_v1 import BaseModel, Field as SchemaField, PrivateAttr, root_validator
 
-from bookinggpt.utils import SCOPES, CREDENTIALS_FILE, TOKEN_FILE
+from bookinggpt.availability.bitmap import BitmapAvailability
+from bookinggpt.availability.engine import AvailabilityEngine
+from bookinggpt.availability.search import iter_free_slots
+from bookinggpt.catalog import SERVICES, find_services, total_minutes
+from bookinggpt.gcal.busy import FreeBusyError, make_busy_source
+from bookinggpt.gcal.client import get_calendar_client
+from bookinggpt.gcal.mirror import EventMirror
+from bookinggpt.utils import AVAILABILITY_BACKEND
+
+
+class AvailableSlotsInput(BaseModel):
+    service: Optional[str] = SchemaField(
+        default=None,
+        description="Requested service or combination, e.g. 'hair cut' or 'wash+cut+styling'. Omit for hourly slots.",
+    )
+    count: Optional[int] = SchemaField(
+        default=None, description="Search beyond this week and return the next this many free start times.",
+    )
+    days: Optional[int] = SchemaField(
+        default=None, description="Search beyond this week: how many days ahead to look (default 14).",
+    )
+    start_date: Optional[str] = SchemaField(
+        default=None, description="Search beyond this week from this date (YYYY-MM-DD) instead of today.",
+    )
 
 
 class AvailableSlotsTool(BaseTool):
@@ -17,98 +40,167 @@ class AvailableSlotsTool(BaseTool):
     description = """
     A tool for showing available slots on Google Calendar for the current week, excluding Sundays.
     
-    Input: No input required. The tool will automatically use the current time and date.
+    Input: Optionally the requested service or combination of services (e.g. "wash+cut+styling").
+    The tool will automatically use the current time and date.
     
     Output: A string listing available time slots for each day of the current week (excluding Sunday),
-    starting from the current day until Saturday.
+    starting from the current day until Saturday. With a service, it lists start times at which the
+    whole service (total duration of all requested services) fits.
+    
+    For other weeks or dates (e.g. "next week", "two weeks from now"), pass count, days and/or
+    start_date to get the next free start times within that range instead.
     
     Note: This tool checks for available slots between 9:00 AM and 6:00 PM on weekdays and Saturdays.
     """
 
+    args_schema: Type[BaseModel] = AvailableSlotsInput
     slot_duration: int = 60  # Set slot duration as a class attribute
+    slot_step: Optional[int] = None  # Minutes between candidate starts; defaults to slot_duration
+    service_step: int = 15  # Minutes between candidate starts for a specific service
+    busy_backend: str = AVAILABILITY_BACKEND  # "events" (events().list), "freebusy" or "mirror" (an EventMirror)
+    calendar_ids: List[str] = SchemaField(default_factory=lambda: ['primary'])  # Calendars whose events block a slot
+    busy_source: Optional[Any] = None  # Explicit busy source; overrides busy_backend
+    page_size: int = 250  # Events per events().list page
+    default_count: int = 5  # Slots returned by a range search
+    default_days: int = 14  # Days covered by a range search
+    max_search_days: int = 90
+    calendar_client: Optional[Any] = None  # Defaults to the shared CalendarClient
+    event_mirror: Optional[Any] = None  # Optional EventMirror; busy slots are then read from memory
+    _mirror_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)
+
+    @root_validator(skip_on_failure=True)
+    def check_mirror_calendars(cls, values):
+        # An EventMirror syncs one calendar; other calendars' events would silently stop blocking slots.
+        mirror, calendar_ids = values.get("event_mirror"), values.get("calendar_ids")
+        if mirror is not None and calendar_ids != [mirror.calendar_id]:
+            raise ValueError(f"event_mirror tracks calendar {mirror.calendar_id!r} but calendar_ids is {calendar_ids}")
+        if values.get("busy_backend") == "mirror" and len(calendar_ids) != 1:
+            raise ValueError("The 'mirror' availability backend tracks exactly one calendar")
+        return values
+
+    def get_event_mirror(self) -> Optional[EventMirror]:
+        """The attached EventMirror; with the "mirror" backend, one is built on first use and kept."""
+        if self.event_mirror is None and self.busy_backend == "mirror":
+            with self._mirror_lock:
+                if self.event_mirror is None:
+                    self.event_mirror = EventMirror(self.calendar_client, calendar_id=self.calendar_ids[0])
+        return self.event_mirror
 
-    def get_credentials(self):
-        creds = None
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    print(f"Error refreshing credentials: {e}")
-                    creds = None
-            if not creds:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    CREDENTIALS_FILE, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-            with open(TOKEN_FILE, "w") as token:
-                token.write(creds.to_json())
-        return creds
+    def get_service(self):
+        return (self.calendar_client or get_calendar_client()).service()
+
+    def availability_engine(self) -> AvailabilityEngine:
+        return AvailabilityEngine(slot_minutes=self.slot_duration, step_minutes=self.slot_step)
+
+    def service_availability(self) -> BitmapAvailability:
+        return BitmapAvailability(step_minutes=self.service_step)
+
+    def get_busy_source(self):
+        return self.busy_source or make_busy_source(self.busy_backend, self.calendar_ids, page_size=self.page_size)
+
+    def iter_busy_slots(self, service, start_time, end_time) -> Iterator:
+        """Busy intervals ordered by start, fetched lazily as they are consumed."""
+        mirror = self.get_event_mirror()
+        if mirror is not None:
+            return iter(mirror.busy_slots(start_time, end_time))
+        return self.get_busy_source().iter_busy(service, start_time, end_time)
 
     def get_busy_slots(self, service, start_time, end_time):
         try:
-            events_result = service.events().list(
-                calendarId='primary',
-                timeMin=start_time.isoformat(),
-                timeMax=end_time.isoformat(),
-                singleEvents=True,
-                orderBy='startTime'
-            ).execute()
-            events = events_result.get('items', [])
-            busy_slots = [(datetime.datetime.fromisoformat(event['start'].get('dateTime', event['start'].get('date'))),
-                           datetime.datetime.fromisoformat(event['end'].get('dateTime', event['end'].get('date'))))
-                          for event in events]
-            return busy_slots
-        except HttpError as error:
+            return list(self.iter_busy_slots(service, start_time, end_time))
+        except (HttpError, FreeBusyError) as error:
             print(f"An error occurred while fetching events: {error}")
             return []
 
-    def get_available_slots(self, current_time):
+    def get_available_slots(self, current_time, minutes: Optional[int] = None):
         try:
-            creds = self.get_credentials()
-            if not creds:
-                return "Failed to obtain valid credentials."
-            
-            service = build("calendar", "v3", credentials=creds)
+            service = None
+            if self.get_event_mirror() is None:
+                service = self.get_service()
+                if service is None:
+                    return "Failed to obtain valid credentials."
             
             start_time = current_time.replace(hour=0, minute=0, second=0, microsecond=0)
             end_time = start_time + datetime.timedelta(days=(6 - start_time.weekday()))
             
             busy_slots = self.get_busy_slots(service, start_time, end_time)
             
-            available_slots = {}
-            current_date = start_time.date()
-            while current_date <= end_time.date():
-                if current_date.weekday() != 6:  # Skip Sunday
-                    day_start = datetime.datetime.combine(current_date, datetime.time(9, 0)).replace(tzinfo=ZoneInfo("Asia/Ho_Chi_Minh"))
-                    day_end = datetime.datetime.combine(current_date, datetime.time(18, 0)).replace(tzinfo=ZoneInfo("Asia/Ho_Chi_Minh"))
-                    
-                    if current_date == current_time.date():
-                        day_start = max(day_start, current_time)
-                    
-                    available_slots[current_date] = []
-                    current_slot = day_start
-                    while current_slot < day_end:
-                        slot_end = current_slot + datetime.timedelta(minutes=self.slot_duration)
-                        if all(slot_end <= busy_start or current_slot >= busy_end for busy_start, busy_end in busy_slots):
-                            available_slots[current_date].append(current_slot)
-                        current_slot += datetime.timedelta(minutes=self.slot_duration)
-                
-                current_date += datetime.timedelta(days=1)
-            
-            return available_slots
+            if minutes is not None:
+                return self.service_availability().available_slots(busy_slots, current_time, end_time, minutes)
+            return self.availability_engine().available_slots(busy_slots, current_time, end_time)
 
         except HttpError as error:
             return f"An error occurred: {error}"
 
-    def _run(self, *args, **kwargs) -> str:
+    def find_slots(self, start_time, minutes: Optional[int] = None, count: int = 5,
+                   days: int = 14) -> List[datetime.datetime]:
+        """The first ``count`` free start times within ``days`` days of ``start_time``.
+
+        Events are fetched page by page and the search stops as soon as enough
+        slots are found, so a long range costs no more than the pages it needs.
+        """
+        service = None
+        if self.get_event_mirror() is None:
+            service = self.get_service()
+            if service is None:
+                raise ValueError("Failed to obtain valid credentials.")
+        days = max(1, min(days, self.max_search_days))
+        day_start = start_time.replace(hour=0, minute=0, second=0, microsecond=0)
+        end_time = day_start + datetime.timedelta(days=days)
+        if minutes is None:
+            engine = self.availability_engine()
+        else:
+            engine = AvailabilityEngine(slot_minutes=minutes, step_minutes=self.service_step)
+        busy = self.iter_busy_slots(service, day_start, end_time)
+        slots = iter_free_slots(engine, busy, start_time, end_time - datetime.timedelta(days=1))
+        return list(itertools.islice(slots, count))
+
+    def search_range(self, current_time, minutes, label, count, days, start_date) -> str:
+        start_time = current_time
+        if start_date:
+            try:
+                day = datetime.date.fromisoformat(start_date)
+            except ValueError:
+                return f"Invalid start_date '{start_date}', expected YYYY-MM-DD."
+            start_time = max(current_time, datetime.datetime.combine(day, datetime.time(), tzinfo=current_time.tzinfo))
+        count = count or self.default_count
+        days = days or self.default_days
+        try:
+            slots = self.find_slots(start_time, minutes, count, days)
+        except (HttpError, FreeBusyError, ValueError) as error:
+            return f"An error occurred: {error}"
+        window = f"within {days} days from {start_time.strftime('%A, %B %d')}"
+        if not slots:
+            return f"No available slots{label} {window}."
+        by_day = {}
+        for slot in slots:
+            by_day.setdefault(slot.date(), []).append(slot)
+        result = f"Next {len(slots)} available start times{label} {window}:\n"
+        for date, day_slots in by_day.items():
+            result += f"\n{date.strftime('%A, %B %d')}: " + ", ".join(slot.strftime('%I:%M %p') for slot in day_slots)
+        return result
+
+    def _run(self, service: Optional[str] = None, count: Optional[int] = None, days: Optional[int] = None,
+             start_date: Optional[str] = None, *args, **kwargs) -> str:
         current_time = datetime.datetime.now(ZoneInfo("Asia/Ho_Chi_Minh"))
-        available_slots = self.get_available_slots(current_time)
+        header = "Available slots for the current week:\n"
+        minutes = None
+        label = ""
+        if service:
+            services = find_services(service)
+            if not services:
+                known = ", ".join(f"{item.name} ({item.minutes} minutes)" for item in SERVICES)
+                return f"Unknown service '{service}'. Available services: {known}."
+            minutes = total_minutes(services)
+            names = " + ".join(item.name for item in services)
+            label = f" for {names} ({minutes} minutes)"
+            header = f"Available start times this week{label}:\n"
+        if count or days or start_date:
+            return self.search_range(current_time, minutes, label, count, days, start_date)
+        available_slots = self.get_available_slots(current_time, minutes)
         
         if isinstance(available_slots, dict):
-            result = "Available slots for the current week:\n"
+            result = header
             for date, slots in available_slots.items():
                 result += f"\n{date.strftime('%A, %B %d')}: "
                 if slots:
@@ -119,3 +211,7 @@ class AvailableSlotsTool(BaseTool):
             return result.strip()  # Remove trailing newline
         else:
             return available_slots
+
+    async def _arun(self, *args, **kwargs) -> str:
+        # googleapiclient is blocking; run the Calendar round-trip in a worker thread.
+        return await asyncio.to_thread(self._run, *args, **kwargs)
@@ -1,13 +1,12 @@
-import os
+import asyncio
 import json
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
+from typing import Any, Optional
 from googleapiclient.errors import HttpError
 from langchain.tools import BaseTool
 
-from bookinggpt.utils import SCOPES, CREDENTIALS_FILE, TOKEN_FILE
+from bookinggpt.gcal.booking_index import get_booking_index
+from bookinggpt.gcal.bookings import find_booking_event, normalize_phone, parse_booking
+from bookinggpt.gcal.client import get_calendar_client
 
 class CancelEventTool(BaseTool):
     name = "cancel_event_tool"
@@ -27,47 +26,64 @@ class CancelEventTool(BaseTool):
     Do not proceed with cancellation unless both pieces of information are provided.
     """
 
-    def get_credentials(self):
-        creds = None
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    print(f"Error refreshing credentials: {e}")
-                    creds = None
-            if not creds:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    CREDENTIALS_FILE, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-            with open(TOKEN_FILE, "w") as token:
-                token.write(creds.to_json())
-        return creds
+    calendar_client: Optional[Any] = None  # Defaults to the shared CalendarClient
+    booking_index: Optional[Any] = None  # Defaults to the shared BookingIndex
+    search_calendar_on_miss: bool = True  # Fall back to a calendar lookup for bookings not in the index
+
+    def get_service(self):
+        return (self.calendar_client or get_calendar_client()).service()
+
+    def get_booking_index(self):
+        return self.booking_index if self.booking_index is not None else get_booking_index()
+
+    def search_calendar(self, service, booking_code: str, customer_phone: str) -> Optional[str]:
+        event_id = find_booking_event(service, booking_code, customer_phone)
+        if event_id is None:
+            # Events created before booking fields moved to extendedProperties.
+            event_id = self.search_descriptions(service, booking_code, customer_phone)
+        return event_id
+
+    def search_descriptions(self, service, booking_code: str, customer_phone: str) -> Optional[str]:
+        phone = normalize_phone(customer_phone)
+        page_token = None
+        while True:
+            events_result = service.events().list(calendarId='primary', q=booking_code, pageToken=page_token).execute()
+            for event in events_result.get('items', []):
+                if parse_booking(event) == (booking_code, phone):
+                    return event['id']
+            page_token = events_result.get('nextPageToken')
+            if not page_token:
+                return None
 
     def cancel_event(self, booking_code: str, customer_phone: str):
         try:
-            creds = self.get_credentials()
-            if not creds:
+            service = self.get_service()
+            if service is None:
                 return "Unable to obtain valid credentials."
 
-            service = build("calendar", "v3", credentials=creds)
-
-            # Search for the event
-            events_result = service.events().list(calendarId='primary', q=booking_code).execute()
-            events = events_result.get('items', [])
+            not_found = f"No event found with booking code {booking_code} and phone number {customer_phone}. lets try again or check the booking code again"
+            index = self.get_booking_index()
+            found = index.lookup(booking_code, customer_phone)
+            if found is not None:
+                calendar_id, event_id = found
+            elif self.search_calendar_on_miss:
+                calendar_id, event_id = 'primary', self.search_calendar(service, booking_code, customer_phone)
+            else:
+                event_id = None
 
-            for event in events:
-                description = event.get('description', '')
-                if (f"Booking Code: {booking_code}" in description and
-                    f"Phone: {customer_phone}" in description):
-                    # Cancel the event
-                    service.events().delete(calendarId='primary', eventId=event['id']).execute()
-                    return f"Event with booking code {booking_code} has been successfully canceled."
+            if event_id is not None:
+                try:
+                    service.events().delete(calendarId=calendar_id, eventId=event_id).execute()
+                except HttpError as error:
+                    # 404/410: the event is already gone, so the index entry was stale.
+                    if error.resp.status not in (404, 410):
+                        raise
+                    index.remove_event(event_id)
+                    return not_found
+                index.remove_event(event_id)
+                return f"Event with booking code {booking_code} has been successfully canceled."
 
-            return f"No event found with booking code {booking_code} and phone number {customer_phone}. lets try again or check the booking code again"
+            return not_found
 
         except HttpError as error:
             return f"An error occurred: {error}"
@@ -88,3 +104,7 @@ class CancelEventTool(BaseTool):
             return "Invalid input format. Please provide a valid JSON object."
         except Exception as e:
             return f"An error occurred: {str(e)}"
+
+    async def _arun(self, query: str) -> str:
+        # googleapiclient is blocking; run the Calendar round-trip in a worker thread.
+        return await asyncio.to_thread(self._run, query)
@@ -1,31 +1,32 @@
-import os
+import asyncio
+import sqlite3
 import datetime
+import threading
+import time
 import uuid
 from zoneinfo import ZoneInfo
 
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
 from pydantic import BaseModel, Field
 from langchain.tools import BaseTool
 from langchain.agents import create_tool_calling_agent
-from langchain_google_genai import ChatGoogleGenerativeAI
 from langchain.prompts import PromptTemplate
 from langchain_core.output_parsers import PydanticOutputParser
-from typing import Optional
-from dotenv import load_dotenv
+from typing import Any, Optional, Tuple, Type
 from langchain.agents import AgentExecutor
 from langchain.prompts import ChatPromptTemplate
+from langchain_core.pydantic_v1 import BaseModel as SchemaModel, Field as SchemaField, PrivateAttr
 
-from bookinggpt.utils import SCOPES, CREDENTIALS_FILE, TOKEN_FILE
+from bookinggpt.catalog import find_services, total_minutes
+from bookinggpt.dates import resolve_date, resolve_time
+from bookinggpt.gcal.booking_index import get_booking_index
+from bookinggpt.gcal.bookings import booking_properties
+from bookinggpt.gcal.client import get_calendar_client
+from bookinggpt.llm import get_llm_registry
+from bookinggpt.metrics import LatencyRecorder
+from bookinggpt.utils import EXTRACTION_MODEL, TIMEZONE
 from bookinggpt.agent.prompt import PROMPT_TEMPLATE
 
-# Load environment variables
-load_dotenv()
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
-
 
 def generate_booking_code():
     return str(uuid.uuid4())[:8]
@@ -39,6 +40,32 @@ class EventInfo(BaseModel):
     end_time: str = Field(description="End time of the event in 24-hour format (HH:MM)")
     booking_code: Optional[str] = Field(description="Unique booking code")
     customer_service: str = Field(description="Service requested by the customer")
+    date: Optional[str] = Field(default=None, description="Date of the appointment (YYYY-MM-DD)")
+
+
+class BookingInput(SchemaModel):
+    customer_name: str = SchemaField(description="Customer's name")
+    customer_phone: str = SchemaField(description="Customer's phone number")
+    service: str = SchemaField(description="Requested service or services, e.g. 'Hair cut' or 'Hair wash + Hair cut'")
+    date: str = SchemaField(description="Appointment date as YYYY-MM-DD, or as the customer said it (e.g. 'tomorrow', 'thứ Sáu')")
+    start_time: str = SchemaField(description="Start time, e.g. '14:00', '2pm' or '2 giờ chiều'")
+    end_time: Optional[str] = SchemaField(
+        default=None, description="End time in 24-hour format (HH:MM); defaults to start time plus the service duration",
+    )
+
+
+def parse_clock(value: Optional[str]) -> Optional[datetime.time]:
+    try:
+        return datetime.datetime.strptime(value.strip(), "%H:%M").time() if value else None
+    except ValueError:
+        return None
+
+
+def parse_date(value: Optional[str]) -> Optional[datetime.date]:
+    try:
+        return datetime.date.fromisoformat(value.strip()) if value else None
+    except ValueError:
+        return None
 
 
 class CalendarTool(BaseTool):
@@ -46,14 +73,13 @@ class CalendarTool(BaseTool):
     description = """
     A Google Calendar scheduling tool for creating new events, including hair salon appointments.
     
-    Input: JSON object containing customer information and preferred appointment time.
+    Input: customer name, phone number, service, date and start time (end time is optional).
     Example input: {
         "customer_name": "John Doe",
-        "phone": "1234567890",
+        "customer_phone": "1234567890",
         "service": "Hair wash",
-        "start_time": "14:00",
-        "end_time": "15:00",
-        "date": "tomorrow"
+        "date": "2024-07-19",
+        "start_time": "14:00"
     }
     
     Output: JSON object with booking details.
@@ -64,46 +90,40 @@ class CalendarTool(BaseTool):
     }
     """
 
-    def get_credentials(self):
-        creds = None
-        if os.path.exists(TOKEN_FILE):
-            creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-        if not creds or not creds.valid:
-            if creds and creds.expired and creds.refresh_token:
-                try:
-                    creds.refresh(Request())
-                except Exception as e:
-                    print(f"Error refreshing credentials: {e}")
-                    creds = None
-            if not creds:
-                flow = InstalledAppFlow.from_client_secrets_file(
-                    CREDENTIALS_FILE, SCOPES
-                )
-                creds = flow.run_local_server(port=0)
-            with open(TOKEN_FILE, "w") as token:
-                token.write(creds.to_json())
-        return creds
+    args_schema: Type[SchemaModel] = BookingInput
+    calendar_client: Optional[Any] = None  # Defaults to the shared CalendarClient
+    booking_index: Optional[Any] = None  # Defaults to the shared BookingIndex
+    extraction_llm: Optional[Any] = None  # Model for the extraction fallback; defaults to the shared EXTRACTION_MODEL
+    default_duration: int = 60  # Minutes booked when the service is not in the catalog
+    counters: dict = SchemaField(default_factory=lambda: {"fast_path": 0, "extraction": 0})
+    latency: LatencyRecorder = SchemaField(default_factory=LatencyRecorder)
+    _counters_lock: threading.Lock = PrivateAttr(default_factory=threading.Lock)  # The tool is shared across threads
+
+    def get_service(self):
+        return (self.calendar_client or get_calendar_client()).service()
+
+    def get_booking_index(self):
+        return self.booking_index if self.booking_index is not None else get_booking_index()
 
     def create_event(self, event_info: EventInfo, current_time: datetime.datetime):
         try:
-            creds = self.get_credentials()
-            if not creds:
+            service = self.get_service()
+            if service is None:
                 return "Unable to obtain valid credentials."
 
-            service = build("calendar", "v3", credentials=creds)
-
-            start_time = current_time.replace(
-                hour=int(event_info.start_time.split(":")[0]),
-                minute=int(event_info.start_time.split(":")[1]),
-                second=0,
-                microsecond=0
-            ) + datetime.timedelta(days=1)
-            end_time = current_time.replace(
-                hour=int(event_info.end_time.split(":")[0]),
-                minute=int(event_info.end_time.split(":")[1]),
-                second=0,
-                microsecond=0
-            ) + datetime.timedelta(days=1)
+            day = parse_date(event_info.date)
+            if day is None:
+                return "Please provide the date of the appointment."
+            start, end = parse_clock(event_info.start_time), parse_clock(event_info.end_time)
+            if start is None or end is None:
+                return "Please provide the start and end time of the appointment (HH:MM)."
+            start_time = datetime.datetime.combine(day, start, tzinfo=current_time.tzinfo)
+            end_time = datetime.datetime.combine(day, end, tzinfo=current_time.tzinfo)
+            if end_time <= start_time:
+                # An end before the start, or a service duration that runs past midnight.
+                return (f"The appointment must end after it starts on the same day "
+                        f"(start {event_info.start_time}, end {event_info.end_time}). "
+                        f"Please choose an earlier start time or a different end time.")
 
             event = {
                 'summary': f"{event_info.customer_name} - {event_info.customer_service}",
@@ -118,9 +138,19 @@ class CalendarTool(BaseTool):
                     'dateTime': end_time.isoformat(),
                     'timeZone': 'Asia/Ho_Chi_Minh',
                 },
+                'extendedProperties': {
+                    'private': booking_properties(event_info.booking_code, event_info.customer_phone,
+                                                  event_info.customer_service),
+                },
             }
 
             event = service.events().insert(calendarId='primary', body=event).execute()
+            try:
+                self.get_booking_index().add(event_info.booking_code, event_info.customer_phone, event['id'],
+                                             start_time=start_time.isoformat())
+            except sqlite3.Error as error:
+                # The booking exists either way; cancellation falls back to searching the calendar.
+                print(f"Could not index booking {event_info.booking_code}: {error}")
             return (f"Event created successfully. "
                     f"Booking code: {event_info.booking_code}, "
                     f"Event ID: {event.get('id')}")
@@ -128,11 +158,12 @@ class CalendarTool(BaseTool):
         except HttpError as error:
             return f"An error occurred: {error}"
 
-    def _run(self, query: str) -> str:
+    def _extraction_chain(self):
         parser = PydanticOutputParser(pydantic_object=EventInfo)
         prompt = PromptTemplate(
             template="Extract the following information from the user query. "
                      "If the query mentions 'tomorrow' or 'mai', use the next day's date. "
+                     "Write the date as YYYY-MM-DD. "
                      "Convert time to 24-hour format (HH:MM):\n"
                      "{format_instructions}\n"
                      "User query: {query}\n"
@@ -141,20 +172,90 @@ class CalendarTool(BaseTool):
             partial_variables={"format_instructions": parser.get_format_instructions()}
         )
 
-        llm = ChatGoogleGenerativeAI(
-            model="gemini-1.5-pro",
-            temperature=0,
-            google_api_key=GOOGLE_API_KEY
+        llm = self.extraction_llm or get_llm_registry().get(EXTRACTION_MODEL, temperature=0)
+        return prompt | llm | parser
+
+    def event_info_from_args(self, customer_name: str, customer_phone: str, service: str, date: str,
+                             start_time: str, end_time: Optional[str] = None,
+                             today: Optional[datetime.date] = None) -> Optional[EventInfo]:
+        """EventInfo built straight from the tool call, or None when the date or times need the model."""
+        today = today or datetime.datetime.now(ZoneInfo(TIMEZONE)).date()
+        day, start = resolve_date(date, today), resolve_time(start_time)
+        end = resolve_time(end_time)
+        if day is None or start is None or (end_time and end is None):
+            return None
+        if end is None:
+            minutes = total_minutes(find_services(service)) or self.default_duration
+            end = (datetime.datetime.combine(day, start) + datetime.timedelta(minutes=minutes)).time()
+        return EventInfo(
+            event_name=service,
+            customer_name=customer_name,
+            customer_phone=customer_phone,
+            start_time=start.strftime("%H:%M"),
+            end_time=end.strftime("%H:%M"),
+            booking_code=None,
+            customer_service=service,
+            date=day.isoformat(),
         )
-        chain = prompt | llm | parser
 
-        current_time = datetime.datetime.now(ZoneInfo("Asia/Ho_Chi_Minh"))
-        event_info = chain.invoke({
-            "query": query,
-            "current_time": current_time.isoformat()
-        })
+    @staticmethod
+    def extraction_query(**fields) -> str:
+        return "Book an appointment: " + ", ".join(f"{name}: {value}" for name, value in fields.items() if value)
+
+    def resolve_booking(self, current_time: datetime.datetime, **fields) -> Tuple[Optional[EventInfo], Optional[dict]]:
+        """EventInfo built from the tool arguments, or else the inputs for the extraction chain."""
+        event_info = self.event_info_from_args(**fields, today=current_time.date())
+        with self._counters_lock:
+            self.counters["fast_path" if event_info is not None else "extraction"] += 1
+        if event_info is not None:
+            return event_info, None
+        # Only dates/times the rules cannot read cost a second model call.
+        return None, {"query": self.extraction_query(**fields), "current_time": current_time.isoformat()}
 
+    @staticmethod
+    def with_booking_code(event_info: EventInfo) -> EventInfo:
         if not event_info.booking_code:
             event_info.booking_code = generate_booking_code()
+        return event_info
 
-        return self.create_event(event_info, current_time)
\ No newline at end of file
+    def stats(self) -> dict:
+        """Share of bookings resolved without the extraction model, and the model time that saved."""
+        with self._counters_lock:
+            counters = dict(self.counters)
+        resolved = counters["fast_path"] + counters["extraction"]
+        extraction = self.latency.summary().get("extraction")
+        saved = extraction["p50"] * counters["fast_path"] if extraction else None
+        return {
+            **counters,
+            "fast_path_rate": counters["fast_path"] / resolved if resolved else None,
+            "saved_seconds": saved,
+            "saved_per_booking": saved / resolved if saved is not None else None,
+            "latency": self.latency.summary(),
+        }
+
+    def _run(self, customer_name: str, customer_phone: str, service: str, date: str, start_time: str,
+             end_time: Optional[str] = None, **kwargs) -> str:
+        current_time = datetime.datetime.now(ZoneInfo(TIMEZONE))
+        event_info, extraction_inputs = self.resolve_booking(
+            current_time, customer_name=customer_name, customer_phone=customer_phone, service=service, date=date,
+            start_time=start_time, end_time=end_time,
+        )
+        if event_info is None:
+            began = time.perf_counter()
+            event_info = self._extraction_chain().invoke(extraction_inputs)
+            self.latency.record("extraction", time.perf_counter() - began)
+        return self.create_event(self.with_booking_code(event_info), current_time)
+
+    async def _arun(self, customer_name: str, customer_phone: str, service: str, date: str, start_time: str,
+                    end_time: Optional[str] = None, **kwargs) -> str:
+        current_time = datetime.datetime.now(ZoneInfo(TIMEZONE))
+        event_info, extraction_inputs = self.resolve_booking(
+            current_time, customer_name=customer_name, customer_phone=customer_phone, service=service, date=date,
+            start_time=start_time, end_time=end_time,
+        )
+        if event_info is None:
+            began = time.perf_counter()
+            event_info = await self._extraction_chain().ainvoke(extraction_inputs)
+            self.latency.record("extraction", time.perf_counter() - began)
+        # googleapiclient is blocking; run the Calendar round-trip in a worker thread.
+        return await asyncio.to_thread(self.create_event, self.with_booking_code(event_info), current_time)
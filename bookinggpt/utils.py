@@ -1,3 +1,12 @@
 SCOPES = ['https://www.googleapis.com/auth/calendar']
 CREDENTIALS_FILE = 'E:\\chatbot\\SaleGPT\\security\\credentials.json'
-TOKEN_FILE = 'token.json'
\ No newline at end of file
+TOKEN_FILE = 'token.json'
+TIMEZONE = 'Asia/Ho_Chi_Minh'
+AVAILABILITY_BACKEND = 'events'  # 'events' (events().list), 'freebusy' (freebusy().query) or 'mirror' (EventMirror)
+BOOKING_INDEX_FILE = 'bookings.sqlite3'
+AGENT_MODEL = 'gemini-1.5-flash'
+EXTRACTION_MODEL = 'gemini-1.5-pro'
+CONTEXT_CACHE_MODEL = 'gemini-1.5-flash-001'  # Context caching needs a versioned model
+LLM_CACHE_FILE = 'llm_cache.sqlite3'
+LLM_CACHE_MAX_ENTRIES = 1024
+LLM_CACHE_TTL = 3600  # seconds
\ No newline at end of file
@@ -1,25 +1,42 @@
-import os
+import argparse
 from dotenv import load_dotenv
 from bookinggpt.agent.booking_agent import BookingAgent
-from langchain_core.language_models.base import BaseLanguageModel
-from langchain_google_genai import ChatGoogleGenerativeAI
+from bookinggpt.cache import make_llm_cache
+from bookinggpt.llm import get_llm_registry
+from bookinggpt.utils import AGENT_MODEL, CONTEXT_CACHE_MODEL, EXTRACTION_MODEL
 
 # Load environment variables
 load_dotenv()
 
-# Get API keys from environment variables
-GOOGLE_API_KEY = os.getenv("GOOGLE_API_KEY")
 
-def main():
-    # Initialize language model
-    llm: BaseLanguageModel = ChatGoogleGenerativeAI(
-        model="gemini-1.5-flash",  
-        google_api_key=GOOGLE_API_KEY,
-        temperature=0.3
-    )
-    
-    # Create BookingAgent instance
-    booking_agent = BookingAgent(llm)
+def create_agent(llm_cache_file=None, context_cache=False, replay=None, llm_latency=0.0) -> BookingAgent:
+    registry = get_llm_registry()
+    if replay:
+        from bookinggpt.testing.fake_llm import Tape, replay_provider
+
+        # Every model, the booking tool's extraction model included, answers from the recorded tape.
+        registry.register_provider("google", replay_provider(Tape.load(replay), latency=llm_latency))
+    # Repeated questions ("what services do you have?") are answered from the cache.
+    registry.set_cache(make_llm_cache(llm_cache_file))
+    # Build the shared clients up front so the first turn and first booking skip client setup.
+    registry.get(EXTRACTION_MODEL, temperature=0)
+    if context_cache:
+        # Only takes effect once the system prompt and tool definitions reach Gemini's 32,768-token cache
+        # minimum; the current prefix is about 1.1k tokens, so requests are sent uncached with a warning.
+        return BookingAgent(registry.get(CONTEXT_CACHE_MODEL, provider="google-cached", temperature=0.3))
+    return BookingAgent(registry.get(AGENT_MODEL, temperature=0.3))
+
+
+def chat(args):
+    booking_agent = create_agent(replay=args.replay, llm_latency=args.llm_latency)
+    recorder = None
+    if args.record:
+        from bookinggpt.testing.fake_llm import TapeRecorder
+
+        recorder = TapeRecorder()
+        # Record the agent model and the booking tool's extraction model alike.
+        for llm in (booking_agent.llm, get_llm_registry().get(EXTRACTION_MODEL, temperature=0)):
+            llm.callbacks = [*(llm.callbacks or []), recorder]
 
     while True:
         user_input = input("Bạn: ")
@@ -28,6 +45,119 @@ def main():
             break
         response = booking_agent.call_agent(user_input)
         print(f"Trợ lý: {response}")
+    if recorder is not None:
+        recorder.tape.save(args.record)
+        print(f"Recorded {len(recorder.tape.exchanges)} model responses to {args.record}")
+
+
+def serve(args):
+    from bookinggpt.server import build_local_agent, serve as run_server
+
+    if args.local:
+        from bookinggpt.testing.fake_calendar import Faults
+        from bookinggpt.testing.sqlite_calendar import SQLiteCalendar
+
+        calendar = SQLiteCalendar(args.calendar_file) if args.calendar_file else None
+        faults = Faults(error_rate=args.calendar_error_rate) if args.calendar_error_rate else None
+        booking_agent = build_local_agent(llm_latency=args.llm_latency, calendar=calendar,
+                                          calendar_latency=args.calendar_latency, faults=faults)
+    else:
+        booking_agent = create_agent(args.llm_cache_file, args.context_cache, args.replay, args.llm_latency)
+        booking_agent.verbose = False
+    run_server(
+        booking_agent,
+        host=args.host,
+        port=args.port,
+        max_concurrency=args.max_concurrency,
+        max_queue=args.max_queue,
+        queue_timeout=args.queue_timeout,
+        drain_timeout=args.drain_timeout,
+    )
+
+
+def rebuild_index(args):
+    from bookinggpt.gcal.booking_index import BookingIndex
+    from bookinggpt.gcal.client import get_calendar_client
+    from bookinggpt.utils import BOOKING_INDEX_FILE
+
+    service = get_calendar_client().service()
+    if service is None:
+        print("Unable to obtain valid credentials.")
+        return
+    index = BookingIndex(args.index_file or BOOKING_INDEX_FILE)
+    count = index.rebuild(service, calendar_id=args.calendar_id, time_min=args.since)
+    print(f"Indexed {count} bookings from calendar {args.calendar_id} into {index.path}")
+
+
+def migrate_bookings(args):
+    from bookinggpt.gcal.client import get_calendar_client
+    from bookinggpt.gcal.migrations import backfill_booking_properties
+
+    service = get_calendar_client().service()
+    if service is None:
+        print("Unable to obtain valid credentials.")
+        return
+    result = backfill_booking_properties(service, calendar_id=args.calendar_id, batch_size=args.batch_size,
+                                         dry_run=args.dry_run)
+    for event_id, error in result.pop("failures"):
+        print(f"Failed to update {event_id}: {error}")
+    print(", ".join(f"{name}={count}" for name, count in result.items()))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Daisy Hair Salon booking assistant")
+    subparsers = parser.add_subparsers(dest="command")
+    chat_parser = subparsers.add_parser("chat", help="interactive chat in the terminal (default)")
+    chat_parser.add_argument("--record", help="save the model responses of the session to this tape (JSON)")
+    chat_parser.add_argument("--replay", help="answer from a recorded tape instead of calling Gemini")
+    chat_parser.add_argument("--llm-latency", type=float, default=0.0,
+                             help="simulated model latency in seconds for --replay")
+    serve_parser = subparsers.add_parser("serve", help="run the HTTP/WebSocket chat server")
+    serve_parser.add_argument("--host", default="127.0.0.1")
+    serve_parser.add_argument("--port", type=int, default=8000)
+    serve_parser.add_argument("--max-concurrency", type=int, default=64,
+                              help="agent turns processed at the same time")
+    serve_parser.add_argument("--max-queue", type=int, default=256,
+                              help="turns allowed to wait for a slot; 0 rejects as soon as saturated")
+    serve_parser.add_argument("--queue-timeout", type=float, default=30.0)
+    serve_parser.add_argument("--drain-timeout", type=float, default=30.0,
+                              help="seconds to let in-flight turns finish on shutdown")
+    serve_parser.add_argument("--local", action="store_true",
+                              help="use the offline chat model and in-memory calendar")
+    serve_parser.add_argument("--llm-latency", type=float, default=0.0,
+                              help="simulated model latency in seconds for --local and --replay")
+    serve_parser.add_argument("--calendar-file",
+                              help="keep the --local calendar in this SQLite file instead of in memory")
+    serve_parser.add_argument("--calendar-latency", type=float, default=0.0,
+                              help="simulated Calendar API round trip in seconds for --local")
+    serve_parser.add_argument("--calendar-error-rate", type=float, default=0.0,
+                              help="share of --local calendar calls that fail with 503")
+    serve_parser.add_argument("--llm-cache-file",
+                              help="also keep cached model responses in this SQLite file (e.g. LLM_CACHE_FILE)")
+    serve_parser.add_argument("--context-cache", action="store_true",
+                              help="keep the static prompt prefix in a Gemini context cache; needs a prefix of "
+                                   "at least 32,768 tokens, so it has no effect with the current ~1.1k-token prompt")
+    serve_parser.add_argument("--replay", help="answer from a recorded tape instead of calling Gemini")
+    index_parser = subparsers.add_parser("rebuild-index",
+                                         help="rebuild the booking code index from the calendar")
+    index_parser.add_argument("--calendar-id", default="primary")
+    index_parser.add_argument("--since", help="only index events ending after this RFC3339 time")
+    index_parser.add_argument("--index-file", help="SQLite file (default: BOOKING_INDEX_FILE)")
+    migrate_parser = subparsers.add_parser("migrate-bookings",
+                                           help="copy booking fields of older events into extendedProperties")
+    migrate_parser.add_argument("--calendar-id", default="primary")
+    migrate_parser.add_argument("--batch-size", type=int, default=50)
+    migrate_parser.add_argument("--dry-run", action="store_true", help="only count the events to update")
+    args = parser.parse_args()
+
+    if args.command == "serve":
+        serve(args)
+    elif args.command == "rebuild-index":
+        rebuild_index(args)
+    elif args.command == "migrate-bookings":
+        migrate_bookings(args)
+    else:
+        chat(args if args.command == "chat" else chat_parser.parse_args([]))
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,42 @@
+import datetime
+from zoneinfo import ZoneInfo
+
+import pytest
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from bookinggpt.agent.booking_agent import BookingAgent
+
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+MONDAY = datetime.date(2026, 10, 19)
+
+
+def at(hour, minute=0, day=MONDAY):
+    return datetime.datetime.combine(day, datetime.time(hour, minute), tzinfo=TZ)
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def make_agent():
+    """Build a quiet BookingAgent; without an llm it gets an offline Gemini client that is never called."""
+
+    def make(llm=None, tools=None, router=True):
+        llm = llm if llm is not None else ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key="offline")
+        agent = BookingAgent(llm) if tools is None else BookingAgent(llm, tools=list(tools))
+        agent.verbose = False
+        if not router:
+            agent.router = None
+        return agent
+
+    return make
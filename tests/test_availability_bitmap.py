@@ -0,0 +1,60 @@
+import datetime
+import random
+
+from bookinggpt.availability.bitmap import BitmapAvailability
+from bookinggpt.availability.engine import AvailabilityEngine
+from bookinggpt.catalog import find_services, total_minutes
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from tests.conftest import MONDAY, at
+
+
+def test_find_services_handles_combinations_and_vietnamese():
+    assert [s.name for s in find_services("wash+cut+styling")] == ["Hair wash", "Hair cut", "Hair styling"]
+    assert [s.name for s in find_services("Cắt tóc và gội đầu")] == ["Hair cut", "Hair wash"]
+    assert [s.name for s in find_services("a beard trim and a haircut")] == ["Beard trim", "Hair cut"]
+    assert total_minutes(find_services("wash+cut+styling")) == 80
+    assert find_services("something else") == []
+
+
+def test_service_fits_only_in_long_enough_gaps():
+    availability = BitmapAvailability(step_minutes=15)
+    busy = [(at(9), at(10)), (at(11), at(12)), (at(12, 30), at(17, 30))]
+    slots = availability.available_slots(busy, at(0), at(23), 45)[MONDAY]
+    assert [slot.strftime("%H:%M") for slot in slots] == ["10:00", "10:15"]
+
+
+def test_partial_minutes_and_past_times_are_excluded():
+    availability = BitmapAvailability(step_minutes=5)
+    busy = [(at(9, 10) + datetime.timedelta(seconds=30), at(9, 19))]
+    slots = availability.available_slots(busy, at(9) + datetime.timedelta(seconds=1), at(23), 5)[MONDAY]
+    assert [slot.strftime("%H:%M") for slot in slots[:3]] == ["09:05", "09:20", "09:25"]
+
+
+def test_matches_sweep_engine_on_random_calendars():
+    rng = random.Random(11)
+    sunday = MONDAY + datetime.timedelta(days=6)
+    for minutes, step in ((60, 60), (80, 15), (45, 5), (10, 5)):
+        engine = AvailabilityEngine(slot_minutes=minutes, step_minutes=step)
+        availability = BitmapAvailability(step_minutes=step)
+        for _ in range(20):
+            busy = []
+            for _ in range(rng.randint(0, 60)):
+                start = at(8, day=MONDAY + datetime.timedelta(days=rng.randrange(7)))
+                start += datetime.timedelta(minutes=rng.randrange(0, 11 * 60, 5))
+                busy.append((start, start + datetime.timedelta(minutes=rng.choice([10, 15, 30, 60, 90]))))
+            begin = at(rng.randrange(8, 12))
+            assert availability.available_slots(busy, begin, at(0, day=sunday), minutes) == \
+                engine.available_slots(busy, begin, at(0, day=sunday))
+
+
+def test_tool_uses_the_combined_service_duration():
+    calendar = InMemoryCalendar()
+    tool = AvailableSlotsTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)))
+    calendar.insert("primary", {"start": {"dateTime": at(10, 30).isoformat()}, "end": {"dateTime": at(18).isoformat()}})
+    slots = tool.get_available_slots(at(8), minutes=80)[MONDAY]
+    assert [slot.strftime("%H:%M") for slot in slots] == ["09:00"]
+
+    assert "(80 minutes)" in tool.run({"service": "wash+cut+styling"})
+    assert tool.run({"service": "tattoo"}).startswith("Unknown service 'tattoo'")
@@ -0,0 +1,50 @@
+import datetime
+import random
+
+from bookinggpt.availability.engine import AvailabilityEngine, merge_intervals
+from tests.conftest import MONDAY, at
+
+
+def brute_force(engine, busy, day):
+    day_open, day_close = engine.opening_hours(day)
+    slots, candidate = [], day_open
+    while candidate + engine.slot <= day_close:
+        end = candidate + engine.slot
+        if all(end <= busy_start or candidate >= busy_end for busy_start, busy_end in busy):
+            slots.append(candidate)
+        candidate += engine.step
+    return slots
+
+
+def test_merge_intervals():
+    merged = merge_intervals([(at(11), at(12)), (at(9), at(10)), (at(9, 30), at(10, 30)), (at(12), at(13))])
+    assert merged == [(at(9), at(10, 30)), (at(11), at(13))]
+
+
+def test_free_slots_skip_busy_time_and_past_times():
+    engine = AvailabilityEngine(slot_minutes=60, step_minutes=30)
+    busy = [(at(10), at(11)), (at(10, 30), at(12)), (at(15), at(15, 20))]
+    slots = engine.available_slots(busy, at(9, 10), at(18))[MONDAY]
+    assert [slot.strftime("%H:%M") for slot in slots] == [
+        "12:00", "12:30", "13:00", "13:30", "14:00", "15:30", "16:00", "16:30", "17:00",
+    ]
+
+
+def test_closed_days_are_skipped():
+    engine = AvailabilityEngine()
+    sunday = MONDAY - datetime.timedelta(days=1)
+    result = engine.available_slots([], at(0, day=sunday), at(0, day=MONDAY))
+    assert list(result) == [MONDAY]
+    assert len(result[MONDAY]) == 9
+
+
+def test_matches_brute_force_on_random_calendars():
+    rng = random.Random(7)
+    for slot, step in ((60, None), (30, 15), (45, 5)):
+        engine = AvailabilityEngine(slot_minutes=slot, step_minutes=step)
+        for _ in range(50):
+            busy = []
+            for _ in range(rng.randint(0, 20)):
+                start = at(8) + datetime.timedelta(minutes=rng.randrange(0, 11 * 60, 5))
+                busy.append((start, start + datetime.timedelta(minutes=rng.choice([10, 15, 30, 60, 90]))))
+            assert engine.available_slots(busy, at(0), at(23))[MONDAY] == brute_force(engine, busy, MONDAY)
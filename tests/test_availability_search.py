@@ -0,0 +1,52 @@
+import datetime
+
+from bookinggpt.availability.engine import AvailabilityEngine
+from bookinggpt.availability.search import iter_free_slots
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from tests.conftest import MONDAY, at
+
+
+def busy_month():
+    busy = []
+    for offset in range(30):
+        day = MONDAY + datetime.timedelta(days=offset)
+        busy += [(at(9, day=day), at(12, day=day)), (at(13, day=day), at(17, day=day))]
+    return busy
+
+
+def make_tool(busy, page_size=5):
+    calendar = InMemoryCalendar(page_size=page_size)
+    for start, end in busy:
+        calendar.insert("primary", {"start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}})
+    return calendar, AvailableSlotsTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)))
+
+
+def test_lazy_search_matches_the_full_computation():
+    engine = AvailabilityEngine(slot_minutes=30, step_minutes=15)
+    busy = busy_month() + [(at(8, day=MONDAY + datetime.timedelta(days=3)), at(10, day=MONDAY + datetime.timedelta(days=4)))]
+    end = at(0, day=MONDAY + datetime.timedelta(days=29))
+    expected = [slot for slots in engine.available_slots(busy, at(10), end).values() for slot in slots]
+    assert list(iter_free_slots(engine, sorted(busy), at(10), end)) == expected
+
+
+def test_range_search_stops_fetching_once_enough_slots_are_found():
+    calendar, tool = make_tool(busy_month())
+    requests = calendar.requests
+    slots = tool.find_slots(at(8), minutes=60, count=3, days=30)
+    assert [slot.strftime("%a %H:%M") for slot in slots] == ["Mon 12:00", "Mon 17:00", "Tue 12:00"]
+    # 60 events over 12 pages, but two days are covered by the first page.
+    assert calendar.requests - requests == 1
+
+    requests = calendar.requests
+    assert tool.find_slots(at(8), minutes=90, count=3, days=30) == []
+    assert calendar.requests - requests == 12
+
+
+def test_range_search_starts_at_a_later_date():
+    calendar, tool = make_tool(busy_month())
+    later = MONDAY + datetime.timedelta(days=14)
+    slots = tool.find_slots(at(0, day=later), count=2, days=7)
+    assert slots == [at(12, day=later), at(17, day=later)]
+    assert "Invalid start_date" in tool.run({"start_date": "next week"})
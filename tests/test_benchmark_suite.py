@@ -0,0 +1,40 @@
+import copy
+import json
+
+from benchmarks import suite
+
+TINY = dict(suite.SIZES["quick"], slot_runs=2, histories=[50], lookups=5, cancels=5, bookings=5, turns=10)
+
+
+def test_suite_writes_comparable_json_results(tmp_path):
+    results = suite.run_suite(TINY, only={"available_slots", "cancel_lookup", "create_event", "memory_growth"},
+                              log=lambda line: None)
+    assert set(results["cases"]) == {
+        "available_slots/sparse", "available_slots/sparse_60min", "available_slots/dense",
+        "available_slots/dense_60min", "cancel_lookup/index_50", "cancel_lookup/cancel_50",
+        "create_event/structured", "memory_growth/buffer", "memory_growth/budgeted",
+    }
+    assert results["cases"]["create_event/structured"]["booked"] == 5
+    buffer, budgeted = results["cases"]["memory_growth/buffer"], results["cases"]["memory_growth/budgeted"]
+    assert buffer["turn10_bytes"] > buffer["turn1_bytes"] and budgeted["turn10_bytes"] < buffer["turn10_bytes"]
+
+    path = tmp_path / "results.json"
+    path.write_text(json.dumps(results))
+    assert suite.main(["compare", str(path), str(path)]) == 0
+
+
+def test_compare_flags_metrics_that_grew_past_the_threshold():
+    baseline = {"cases": {
+        "create_event/structured": {"runs": 10, "p50_ms": 1.0, "p95_ms": 2.0, "max_ms": 3.0},
+        "memory_growth/buffer": {"turn100_bytes": 1000, "turn100_prompt_tokens": 500},
+        "cancel_lookup/index_100": {"p50_ms": 0.01},
+    }}
+    current = copy.deepcopy(baseline)
+    current["cases"]["create_event/structured"].update(runs=50, p50_ms=1.5, p95_ms=2.1, max_ms=30.0)
+    current["cases"]["memory_growth/buffer"]["turn100_bytes"] = 1300
+    current["cases"]["cancel_lookup/index_100"]["p50_ms"] = 0.03  # Slower, but below the noise floor.
+    current["cases"]["available_slots/dense"] = {"p50_ms": 9.0}  # No baseline to compare against.
+    assert suite.compare(baseline, current, threshold=0.2) == [
+        ("create_event/structured", "p50_ms", 1.0, 1.5),
+        ("memory_growth/buffer", "turn100_bytes", 1000, 1300),
+    ]
@@ -0,0 +1,63 @@
+import asyncio
+
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+
+
+def test_executor_is_built_once(make_agent):
+    agent = make_agent()
+    first = agent.agent_executor
+    assert agent.agent_executor is first
+    assert agent.setup_stats["builds"] == 1
+
+
+def test_executor_rebuilds_when_tools_change(make_agent):
+    agent = make_agent()
+    first = agent.agent_executor
+    agent.tools = agent.tools[:2]
+    assert agent.agent_executor is not first
+    assert agent.setup_stats["builds"] == 2
+
+
+def test_invalidate_executor(make_agent):
+    agent = make_agent()
+    first = agent.agent_executor
+    agent.invalidate_executor()
+    assert agent.agent_executor is not first
+
+
+def test_acall_agent_keeps_sessions_separate(make_agent):
+    agent = make_agent(ScriptedChatModel(responses=["Hey there!"], latency=0.01))
+
+    async def run():
+        return await asyncio.gather(*(agent.acall_agent("hi", session_id=f"s{i}") for i in range(20)))
+
+    assert asyncio.run(run()) == ["Hey there!"] * 20
+    assert agent.sessions.stats()["sessions"] == 20
+    assert agent.sessions.get("s3").turns == 1
+
+
+def test_stream_agent_yields_tokens_then_end(make_agent):
+    agent = make_agent(ScriptedChatModel(responses=["Hey there, Alex!"]))
+    events = list(agent.stream_agent("hi"))
+    assert [event["text"] for event in events[:-1]] == ["Hey ", "there, ", "Alex!"]
+    assert events[-1]["type"] == "end"
+    assert events[-1]["output"] == "Hey there, Alex!"
+    assert 0 < events[-1]["ttft_seconds"] <= events[-1]["latency_seconds"]
+    assert agent.metrics.summary()["time_to_first_token"]["count"] == 1
+
+
+def test_sync_and_async_turns_on_one_session_do_not_overlap(make_agent):
+    seen = []
+
+    def responder(messages):
+        seen.append(len(messages))
+        return "ok"
+
+    agent = make_agent(ScriptedChatModel(responder=responder, latency=0.1), tools=[], router=False)
+
+    async def both_turns():
+        await asyncio.gather(asyncio.to_thread(agent.call_agent, "first", "shared"),
+                             agent.acall_agent("second", "shared"))
+
+    asyncio.run(both_turns())
+    assert sorted(seen) == [2, 4]  # The later turn saw the earlier one in its history.
@@ -0,0 +1,89 @@
+import datetime
+import json
+from zoneinfo import ZoneInfo
+
+from bookinggpt.gcal.booking_index import BookingIndex, normalize_phone
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.tool.cancel_event import CancelEventTool
+from bookinggpt.tool.create_event import CalendarTool, EventInfo
+
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+
+
+def make_tools(index=None):
+    calendar = InMemoryCalendar(page_size=3)
+    client = StaticCalendarClient(FakeCalendarService(calendar))
+    index = index or BookingIndex(":memory:")
+    return calendar, index, CalendarTool(calendar_client=client, booking_index=index), \
+        CancelEventTool(calendar_client=client, booking_index=index)
+
+
+def booking(code, phone="0901234567"):
+    return EventInfo(event_name="Hair cut", customer_name="Lan", customer_phone=phone, start_time="10:00",
+                     end_time="10:30", booking_code=code, customer_service="Hair cut", date="2026-10-19")
+
+
+def cancel(tool, code, phone):
+    return tool.run(json.dumps({"booking_code": code, "customer_phone": phone}))
+
+
+def test_normalize_phone():
+    assert normalize_phone("+84 90-123 4567") == "0901234567"
+    assert normalize_phone("090.123.4567") == "0901234567"
+
+
+def test_created_bookings_are_cancelled_through_the_index():
+    calendar, index, create_tool, cancel_tool = make_tools()
+    create_tool.create_event(booking("abc12345"), datetime.datetime.now(TZ))
+    assert index.lookup("abc12345", "0901234567") is not None
+
+    requests = calendar.requests
+    assert "successfully canceled" in cancel(cancel_tool, "abc12345", "+84 901 234 567")
+    # A single delete: no calendar search was needed.
+    assert calendar.requests == requests + 1
+    assert len(calendar.events) == 0
+    assert len(index) == 0
+
+
+def test_wrong_phone_is_rejected():
+    calendar, index, create_tool, cancel_tool = make_tools()
+    create_tool.create_event(booking("abc12345"), datetime.datetime.now(TZ))
+    assert "No event found" in cancel(cancel_tool, "abc12345", "0999999999")
+    assert len(calendar.events) == 1
+
+
+def test_unindexed_bookings_fall_back_to_a_calendar_search():
+    calendar, index, create_tool, cancel_tool = make_tools()
+    for number in range(5):
+        create_tool.create_event(booking(f"code{number}"), datetime.datetime.now(TZ))
+    index.remove_event(next(iter(calendar.events)))
+    assert "successfully canceled" in cancel(cancel_tool, "code0", "0901234567")
+
+    cancel_tool.search_calendar_on_miss = False
+    index.remove_event(next(iter(calendar.events)))
+    assert "No event found" in cancel(cancel_tool, "code1", "0901234567")
+
+
+def test_stale_entries_are_dropped():
+    calendar, index, create_tool, cancel_tool = make_tools()
+    create_tool.create_event(booking("abc12345"), datetime.datetime.now(TZ))
+    calendar.delete("primary", next(iter(calendar.events)))
+    assert "No event found" in cancel(cancel_tool, "abc12345", "0901234567")
+    assert len(index) == 0
+
+
+def test_rebuild_indexes_every_page_and_persists(tmp_path):
+    calendar, _, create_tool, _ = make_tools()
+    for number in range(7):
+        create_tool.create_event(booking(f"code{number}", phone=f"+84 90000000{number}"), datetime.datetime.now(TZ))
+    calendar.insert("primary", {"summary": "Staff meeting", "start": {"dateTime": "2026-10-19T08:00:00+07:00"},
+                                "end": {"dateTime": "2026-10-19T09:00:00+07:00"}})
+
+    path = str(tmp_path / "bookings.sqlite3")
+    index = BookingIndex(path)
+    assert index.rebuild(FakeCalendarService(calendar)) == 7
+    index.close()
+    reopened = BookingIndex(path)
+    assert reopened.lookup("code3", "0900000003") is not None
+    assert reopened.stats()["bookings"] == 7
@@ -0,0 +1,95 @@
+import datetime
+import json
+from zoneinfo import ZoneInfo
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.gcal.bookings import find_booking_event, parse_booking
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.gcal.migrations import backfill_booking_properties
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar, http_error
+from bookinggpt.tool.cancel_event import CancelEventTool
+from bookinggpt.tool.create_event import CalendarTool, EventInfo
+
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+
+
+def legacy_event(code, phone="0901234567"):
+    return {
+        "summary": "Lan - Hair cut",
+        "description": f"Service: Hair cut\nPhone: {phone}\nBooking Code: {code}",
+        "start": {"dateTime": "2026-10-19T10:00:00+07:00"},
+        "end": {"dateTime": "2026-10-19T10:30:00+07:00"},
+    }
+
+
+def create(calendar, code, phone="+84 901 234 567"):
+    tool = CalendarTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)),
+                        booking_index=BookingIndex(":memory:"))
+    tool.create_event(EventInfo(event_name="Hair cut", customer_name="Lan", customer_phone=phone, start_time="10:00",
+                                end_time="10:30", booking_code=code, customer_service="Hair cut", date="2026-10-19"),
+                      datetime.datetime.now(TZ))
+
+
+def test_new_bookings_carry_private_properties():
+    calendar = InMemoryCalendar()
+    create(calendar, "abc12345")
+    event = next(iter(calendar.events.values()))
+    assert event["extendedProperties"]["private"] == {
+        "bookingCode": "abc12345", "phone": "0901234567", "service": "Hair cut",
+    }
+    service = FakeCalendarService(calendar)
+    assert find_booking_event(service, "abc12345", "0901 234 567") == event["id"]
+    assert find_booking_event(service, "abc12345", "0999999999") is None
+
+
+def test_cancel_without_index_entry_uses_the_property_filter():
+    calendar = InMemoryCalendar()
+    create(calendar, "abc12345")
+    calendar.insert("primary", legacy_event("old00001"))
+    tool = CancelEventTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)),
+                           booking_index=BookingIndex(":memory:"))
+    requests = calendar.requests
+    reply = tool.run(json.dumps({"booking_code": "abc12345", "customer_phone": "0901234567"}))
+    assert "successfully canceled" in reply
+    assert calendar.requests == requests + 2  # one filtered list, one delete
+
+    # Description-only events are still found until they are migrated.
+    reply = tool.run(json.dumps({"booking_code": "old00001", "customer_phone": "0901234567"}))
+    assert "successfully canceled" in reply
+
+
+def test_backfill_migrates_description_only_bookings_in_batches():
+    calendar = InMemoryCalendar(page_size=3)
+    for number in range(5):
+        calendar.insert("primary", legacy_event(f"old{number:05d}"))
+    create(calendar, "new00001")
+    calendar.insert("primary", {"summary": "Staff meeting", "start": {"dateTime": "2026-10-19T08:00:00+07:00"},
+                                "end": {"dateTime": "2026-10-19T09:00:00+07:00"}})
+    service = FakeCalendarService(calendar)
+
+    result = backfill_booking_properties(service, batch_size=2, dry_run=True)
+    assert result["patched"] == 5 and service.batches == 0
+
+    result = backfill_booking_properties(service, batch_size=2)
+    assert result == {"scanned": 7, "up_to_date": 1, "not_bookings": 1, "patched": 5, "failed": 0, "failures": []}
+    assert service.batches == 3
+    event_id = find_booking_event(service, "old00003", "+84901234567")
+    assert parse_booking(calendar.events[event_id]) == ("old00003", "0901234567")
+    assert backfill_booking_properties(service)["patched"] == 0
+
+
+def test_backfill_reports_failed_patches():
+    calendar = InMemoryCalendar()
+    broken = calendar.insert("primary", legacy_event("old00001"))["id"]
+    calendar.insert("primary", legacy_event("old00002"))
+    patch = calendar.patch
+
+    def flaky_patch(calendar_id, event_id, body):
+        if event_id == broken:
+            raise http_error(503, "Backend Error")
+        return patch(calendar_id, event_id, body)
+
+    calendar.patch = flaky_patch
+    result = backfill_booking_properties(FakeCalendarService(calendar))
+    assert (result["patched"], result["failed"]) == (1, 1)
+    assert result["failures"][0][0] == broken
@@ -0,0 +1,104 @@
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+from bookinggpt.tool.create_event import CalendarTool
+
+
+def make_tool(calendar, responses=("{}",)):
+    llm = ScriptedChatModel(responses=list(responses))
+    tool = CalendarTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)),
+                        booking_index=BookingIndex(":memory:"), extraction_llm=llm)
+    return tool, llm
+
+
+def only_event(calendar):
+    (event,) = calendar.events.values()
+    return event
+
+
+def test_structured_args_book_without_a_model_call():
+    calendar = InMemoryCalendar()
+    tool, llm = make_tool(calendar)
+    reply = tool.run({"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+                      "date": "2026-10-23", "start_time": "14:00", "end_time": "14:45"})
+    assert "Event created successfully" in reply
+    assert llm.calls == 0
+    event = only_event(calendar)
+    assert event["start"]["dateTime"] == "2026-10-23T14:00:00+07:00"
+    assert event["end"]["dateTime"] == "2026-10-23T14:45:00+07:00"
+
+
+def test_end_time_defaults_to_the_catalog_duration():
+    calendar = InMemoryCalendar()
+    tool, _ = make_tool(calendar)
+    tool.run({"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair wash + Hair cut",
+              "date": "2026-10-23", "start_time": "9:30"})
+    event = only_event(calendar)
+    assert event["start"]["dateTime"] == "2026-10-23T09:30:00+07:00"
+    assert event["end"]["dateTime"] == "2026-10-23T10:20:00+07:00"
+
+
+def test_unresolved_date_falls_back_to_extraction():
+    calendar = InMemoryCalendar()
+    extracted = {"event_name": "Hair cut", "customer_name": "Lan", "customer_phone": "0901234567",
+                 "start_time": "14:00", "end_time": "14:30", "booking_code": None,
+                 "customer_service": "Hair cut", "date": "2026-10-18"}
+    tool, llm = make_tool(calendar, [json.dumps(extracted)])
+    reply = tool.run({"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+                      "date": "the day after my exam", "start_time": "after lunch"})
+    assert "Event created successfully" in reply
+    assert llm.calls == 1
+    assert tool.stats()["extraction"] == 1
+    assert only_event(calendar)["start"]["dateTime"] == "2026-10-18T14:00:00+07:00"
+
+
+def test_missing_date_is_not_guessed():
+    calendar = InMemoryCalendar()
+    extracted = {"event_name": "Hair cut", "customer_name": "Lan", "customer_phone": "0901234567",
+                 "start_time": "14:00", "end_time": "14:30", "booking_code": None, "customer_service": "Hair cut"}
+    tool, _ = make_tool(calendar, [json.dumps(extracted)])
+    reply = tool.run({"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+                      "date": "whenever", "start_time": "14:00"})
+    assert "date" in reply
+    assert not calendar.events
+
+
+def test_relative_dates_and_12_hour_times_skip_the_model():
+    calendar = InMemoryCalendar()
+    tool, llm = make_tool(calendar)
+    tool.run({"customer_name": "Lan", "customer_phone": "0901234567", "service": "cắt tóc",
+              "date": "thứ Sáu tuần sau", "start_time": "2 giờ chiều"})
+    assert llm.calls == 0
+    assert only_event(calendar)["start"]["dateTime"].endswith("T14:00:00+07:00")
+    stats = tool.stats()
+    assert stats["fast_path_rate"] == 1.0
+    # No extraction was timed, so there is no model time to compare against yet.
+    assert stats["saved_seconds"] is None and stats["saved_per_booking"] is None
+
+
+def test_end_times_not_after_the_start_are_rejected():
+    calendar = InMemoryCalendar()
+    tool, llm = make_tool(calendar)
+    booking = {"customer_name": "Lan", "customer_phone": "0901234567", "date": "2026-10-23"}
+    for args in ({"service": "Hair cut", "start_time": "14:00", "end_time": "13:30"},
+                 {"service": "Hair cut", "start_time": "14:00", "end_time": "14:00"},
+                 {"service": "Hair coloring", "start_time": "23:30"}):  # 60 minutes would end after midnight
+        reply = tool.run({**booking, **args})
+        assert reply.startswith("The appointment must end after it starts"), reply
+    assert calendar.events == {} and llm.calls == 0
+
+
+def test_counters_stay_exact_across_threads():
+    tool, _ = make_tool(InMemoryCalendar())
+
+    def book(number):
+        return tool.run({"customer_name": "Lan", "customer_phone": f"09{number:08d}", "service": "Hair cut",
+                         "date": "2026-10-23", "start_time": f"{9 + number % 9}:00"})
+
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(book, range(200)))
+    assert tool.stats()["fast_path"] == 200
@@ -0,0 +1,98 @@
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.gcal.bookings import booking_properties
+from bookinggpt.gcal.bulk import BulkCalendarOperations
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar, http_error
+
+
+def walk_in(number):
+    return {
+        "summary": f"Walk-in {number} - Hair cut",
+        "start": {"dateTime": "2026-10-19T10:00:00+07:00"},
+        "end": {"dateTime": "2026-10-19T10:30:00+07:00"},
+        "extendedProperties": {"private": booking_properties(f"walk{number:04d}", f"09000{number:05d}")},
+    }
+
+
+def make_bulk(calendar, **kwargs):
+    service = FakeCalendarService(calendar)
+    delays = []
+    bulk = BulkCalendarOperations(StaticCalendarClient(service), sleep=delays.append, **kwargs)
+    return service, bulk, delays
+
+
+def test_creates_and_deletes_in_batches_and_keeps_the_index_in_sync():
+    calendar, index = InMemoryCalendar(), BookingIndex(":memory:")
+    service, bulk, _ = make_bulk(calendar, booking_index=index)
+    results = bulk.create_events([walk_in(number) for number in range(120)])
+    assert all(result.ok for result in results)
+    assert service.batches == 3
+    assert len(calendar.events) == 120 and len(index) == 120
+    assert index.lookup("walk0007", "0900000007") == ("primary", results[7].response["id"])
+
+    event_ids = [result.response["id"] for result in results[:60]] + ["missing"]
+    results = bulk.delete_events(event_ids)
+    assert [result.ok for result in results] == [True] * 60 + [False]
+    assert results[-1].status == 410 and results[-1].attempts == 1
+    assert len(calendar.events) == 60 and len(index) == 60
+
+
+def test_retryable_failures_are_retried_with_backoff():
+    calendar = InMemoryCalendar()
+    insert, failures = calendar.insert, {}
+
+    def flaky_insert(calendar_id, body):
+        number = int(body["summary"].split()[1])
+        if number % 3 == 0 and failures.get(number, 0) < 2:
+            failures[number] = failures.get(number, 0) + 1
+            raise http_error(503, "Backend Error")
+        if number == 4:
+            raise http_error(400, "Invalid time zone")
+        return insert(calendar_id, body)
+
+    calendar.insert = flaky_insert
+    _, bulk, delays = make_bulk(calendar, batch_size=4, backoff=0.1)
+    results = bulk.create_events([walk_in(number) for number in range(10)])
+    assert [result.ok for result in results] == [number != 4 for number in range(10)]
+    assert [results[number].attempts for number in (0, 1, 4)] == [3, 1, 1]
+    assert results[4].status == 400
+    assert delays == [0.1, 0.2]
+    assert bulk.stats()["retries"] == 4 + 4
+    assert bulk.stats()["failed"] == 1
+
+
+def test_retried_insert_that_already_landed_counts_as_created():
+    calendar = InMemoryCalendar()
+    insert, lost = calendar.insert, set()
+
+    def insert_then_time_out(calendar_id, body):
+        event = insert(calendar_id, body)
+        if body["id"] not in lost:
+            lost.add(body["id"])
+            raise http_error(503, "Backend Error")
+        return event
+
+    calendar.insert = insert_then_time_out
+    _, bulk, _ = make_bulk(calendar)
+    results = bulk.create_events([walk_in(number) for number in range(3)])
+    assert all(result.ok and result.status == 409 for result in results)
+    assert len(calendar.events) == 3
+
+
+def test_failed_batch_request_is_resent():
+    calendar = InMemoryCalendar()
+    service, bulk, _ = make_bulk(calendar, batch_size=2)
+    new_batch, broken = service.new_batch_http_request, [True]
+
+    def new_batch_http_request(callback=None):
+        batch = new_batch(callback)
+        if broken.pop() if broken else False:
+            def fail():
+                raise http_error(502, "Bad Gateway")
+            batch.execute = fail
+        return batch
+
+    service.new_batch_http_request = new_batch_http_request
+    results = bulk.create_events([walk_in(number) for number in range(3)])
+    assert all(result.ok for result in results)
+    assert [result.attempts for result in results] == [2, 2, 1]
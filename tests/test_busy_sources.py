@@ -0,0 +1,69 @@
+import datetime
+
+import pytest
+
+from bookinggpt.gcal.busy import EventsListBusySource, FreeBusyError, FreeBusySource, make_busy_source
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from tests.conftest import MONDAY, at
+
+
+def book(calendar, start, end, **extra):
+    calendar.insert("primary", {"summary": "Booking", "description": "Phone: 0901234567",
+                                "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}, **extra})
+
+
+def make_service():
+    primary, stylist = InMemoryCalendar(page_size=2), InMemoryCalendar()
+    book(primary, at(9), at(10))
+    book(primary, at(9, 30), at(11))
+    book(primary, at(14), at(15))
+    book(primary, at(16), at(17), transparency="transparent")
+    book(stylist, at(12), at(13))
+    return FakeCalendarService(primary, calendars={"stylist": stylist})
+
+
+def test_freebusy_returns_merged_busy_intervals_from_one_query():
+    service = make_service()
+    source = FreeBusySource(["primary", "stylist"])
+    busy = list(source.iter_busy(service, at(0), at(23)))
+    assert busy == [(at(9), at(11)), (at(12), at(13)), (at(14), at(15))]
+    assert service.freebusy().requests == 1
+
+
+def test_freebusy_splits_long_ranges_and_calendar_lists():
+    service = make_service()
+    source = FreeBusySource(["primary", "stylist"], max_calendars=1, max_range_days=1)
+    end = at(0, day=MONDAY + datetime.timedelta(days=3))
+    assert list(source.iter_busy(service, at(0), end)) == [(at(9), at(11)), (at(12), at(13)), (at(14), at(15))]
+    assert service.freebusy().requests == 3 * 2
+
+
+def test_freebusy_reports_calendar_errors():
+    with pytest.raises(FreeBusyError, match="notFound"):
+        FreeBusySource(["missing"]).query(make_service(), at(0), at(23))
+
+
+def test_events_list_source_merges_calendars_in_start_order():
+    primary, stylist = InMemoryCalendar(page_size=2), InMemoryCalendar()
+    for start, end in ((at(9), at(10)), (at(9, 30), at(11)), (at(14), at(15))):
+        book(primary, start, end)
+    book(primary, at(16), at(17), transparency="transparent")
+    for start, end in ((at(9, 15), at(9, 45)), (at(12), at(13)), (at(14, 30), at(15, 30))):
+        book(stylist, start, end)
+    service = FakeCalendarService(primary, calendars={"stylist": stylist})
+    busy = list(EventsListBusySource(["primary", "stylist"]).iter_busy(service, at(0), at(23)))
+    assert busy == [(at(9), at(10)), (at(9, 15), at(9, 45)), (at(9, 30), at(11)), (at(12), at(13)),
+                    (at(14), at(15)), (at(14, 30), at(15, 30))]
+    with pytest.raises(ValueError):
+        make_busy_source("carrier-pigeon")
+
+
+@pytest.mark.parametrize("backend", ["events", "freebusy"])
+def test_tool_gives_the_same_slots_with_either_backend(backend):
+    service = make_service()
+    tool = AvailableSlotsTool(calendar_client=StaticCalendarClient(service), busy_backend=backend)
+    slots = tool.get_available_slots(at(8))[MONDAY]
+    assert [slot.strftime("%H:%M") for slot in slots] == ["11:00", "12:00", "13:00", "15:00", "16:00", "17:00"]
+    assert tool.find_slots(at(8), minutes=30, count=2) == [at(11), at(11, 15)]
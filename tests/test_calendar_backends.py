@@ -0,0 +1,133 @@
+import datetime
+import json
+import time
+from zoneinfo import ZoneInfo
+
+import pytest
+from googleapiclient.errors import HttpError
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.testing.fake_calendar import FakeCalendarService, Faults, InMemoryCalendar, local_calendar_client
+from bookinggpt.testing.sqlite_calendar import SQLiteCalendar
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from bookinggpt.tool.cancel_event import CancelEventTool
+from bookinggpt.tool.create_event import CalendarTool
+
+TZ = ZoneInfo("Asia/Ho_Chi_Minh")
+MONDAY = datetime.date(2026, 10, 19)
+BACKENDS = [InMemoryCalendar, SQLiteCalendar]
+
+
+def event(hour, minutes=60, summary="Booking", day=MONDAY, **extra):
+    start = datetime.datetime.combine(day, datetime.time(hour), tzinfo=TZ)
+    return {"summary": summary, "start": {"dateTime": start.isoformat()},
+            "end": {"dateTime": (start + datetime.timedelta(minutes=minutes)).isoformat()}, **extra}
+
+
+def list_all(service, **params):
+    items, page_token = [], None
+    while True:
+        response = service.events().list(calendarId="primary", pageToken=page_token, **params).execute()
+        items += response["items"]
+        page_token = response.get("nextPageToken")
+        if page_token is None:
+            return items, response["nextSyncToken"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_list_pages_filters_and_orders(backend):
+    calendar = backend(page_size=2)
+    for hour in (15, 9, 12, 10, 17):
+        calendar.insert("primary", event(hour, summary=f"Lan {hour}h"))
+    service = FakeCalendarService(calendar)
+    items, _ = list_all(service, timeMin=event(10)["start"]["dateTime"], orderBy="startTime", singleEvents=True)
+    assert [item["summary"] for item in items] == ["Lan 10h", "Lan 12h", "Lan 15h", "Lan 17h"]
+    assert [item["summary"] for item in list_all(service, q="lan 9h")[0]] == ["Lan 9h"]
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_sync_tokens_report_changes_and_expire(backend):
+    calendar = backend()
+    first = calendar.insert("primary", event(9))
+    second = calendar.insert("primary", event(11))
+    service = FakeCalendarService(calendar)
+    _, sync_token = list_all(service)
+
+    calendar.delete("primary", first["id"])
+    calendar.patch("primary", second["id"], {"summary": "Moved"})
+    third = calendar.insert("primary", event(14))
+    changes, sync_token = list_all(service, syncToken=sync_token)
+    assert [(item["id"], item.get("status"), item.get("summary")) for item in changes] == [
+        (first["id"], "cancelled", None), (second["id"], "confirmed", "Moved"), (third["id"], "confirmed", "Booking"),
+    ]
+    assert list_all(service, syncToken=sync_token)[0] == []
+
+    calendar.invalidate_sync_tokens()
+    with pytest.raises(HttpError) as error:
+        list_all(service, syncToken=sync_token)
+    assert error.value.resp.status == 410
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_errors_and_freebusy_follow_the_api(backend):
+    calendar = backend()
+    created = calendar.insert("primary", event(9, id="fixed"))
+    calendar.insert("primary", event(9, minutes=90))
+    calendar.insert("primary", event(13, transparency="transparent"))
+    for call, status in ((lambda: calendar.insert("primary", event(9, id="fixed")), 409),
+                         (lambda: calendar.get("primary", "missing"), 404),
+                         (lambda: calendar.delete("primary", "missing"), 410)):
+        with pytest.raises(HttpError) as error:
+            call()
+        assert error.value.resp.status == status
+    assert calendar.get("primary", created["id"])["status"] == "confirmed"
+    busy = FakeCalendarService(calendar).freebusy().query(body={
+        "timeMin": "2026-10-19T00:00:00Z", "timeMax": "2026-10-20T00:00:00Z", "items": [{"id": "primary"}],
+    }).execute()
+    assert busy["calendars"]["primary"]["busy"] == [{"start": "2026-10-19T02:00:00Z", "end": "2026-10-19T03:30:00Z"}]
+
+
+def test_tools_run_unchanged_on_the_sqlite_calendar(tmp_path):
+    calendar = SQLiteCalendar(str(tmp_path / "calendar.sqlite3"))
+    client, index = local_calendar_client(calendar), BookingIndex(":memory:")
+    reply = CalendarTool(calendar_client=client, booking_index=index).run({
+        "customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+        "date": MONDAY.isoformat(), "start_time": "10:00",
+    })
+    assert "successfully" in reply
+    code = reply.split("Booking code: ")[1].split(",")[0]
+    calendar.close()
+
+    calendar = SQLiteCalendar(str(tmp_path / "calendar.sqlite3"))  # Bookings survive a restart.
+    client = local_calendar_client(calendar)
+    slots = AvailableSlotsTool(calendar_client=client).find_slots(
+        datetime.datetime.combine(MONDAY, datetime.time(9), tzinfo=TZ), minutes=60, count=2, days=1)
+    assert [slot.strftime("%H:%M") for slot in slots] == ["09:00", "10:30"]
+    reply = CancelEventTool(calendar_client=client, booking_index=index).run(
+        json.dumps({"booking_code": code, "customer_phone": "0901234567"}))
+    assert "successfully canceled" in reply and len(calendar) == 0
+
+
+def test_faults_inject_latency_and_errors():
+    faults = Faults(error_rate=0.5, latency=0.01, operations=["insert"], seed=3)
+    service = FakeCalendarService(faults=faults)
+    began, failed = time.perf_counter(), 0
+    for hour in range(9, 19):
+        try:
+            service.events().insert(calendarId="primary", body=event(hour)).execute()
+        except HttpError as error:
+            assert error.resp.status == 503
+            failed += 1
+    assert time.perf_counter() - began >= 0.1
+    assert 0 < failed < 10 and faults.stats() == {"calls": 10, "errors": failed}
+    assert len(list_all(service)[0]) == 10 - failed  # list is not in the failing operations
+
+    replay = Faults(error_rate=0.5, operations=["insert"], seed=3)
+    outcomes = []
+    for _ in range(10):
+        try:
+            replay.check("insert")
+            outcomes.append(True)
+        except HttpError:
+            outcomes.append(False)
+    assert outcomes.count(False) == failed
@@ -0,0 +1,41 @@
+import threading
+
+from google.oauth2.credentials import Credentials
+
+from bookinggpt.gcal.client import CalendarClient
+
+
+class StubProvider:
+    def __init__(self):
+        self.credentials = Credentials(token="token")
+
+    def get(self):
+        return self.credentials
+
+
+def test_service_is_reused_within_a_thread():
+    client = CalendarClient(credential_provider=StubProvider())
+    first = client.service()
+    assert client.service() is first
+    assert client.stats()["builds"] == 1
+    assert client.stats()["reuses"] == 1
+    assert hasattr(first, "events")
+
+
+def test_each_thread_gets_its_own_service():
+    client = CalendarClient(credential_provider=StubProvider())
+    services = []
+    threads = [threading.Thread(target=lambda: services.append(client.service())) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len({id(service) for service in services}) == 3
+
+
+def test_new_credentials_rebuild_the_service():
+    provider = StubProvider()
+    client = CalendarClient(credential_provider=provider)
+    first = client.service()
+    provider.credentials = Credentials(token="other")
+    assert client.service() is not first
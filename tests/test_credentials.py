@@ -0,0 +1,59 @@
+import datetime
+import json
+import threading
+import time
+
+from google.oauth2.credentials import Credentials
+
+from bookinggpt.gcal.credentials import CredentialProvider
+
+
+def write_token(path, expires_in):
+    expiry = datetime.datetime.now(datetime.timezone.utc) + datetime.timedelta(seconds=expires_in)
+    path.write_text(json.dumps({
+        "token": "old-token",
+        "refresh_token": "refresh",
+        "client_id": "client",
+        "client_secret": "secret",
+        "expiry": expiry.strftime("%Y-%m-%dT%H:%M:%SZ"),
+    }))
+
+
+def fake_refresh(calls):
+    def refresh(self, request):
+        calls.append(threading.get_ident())
+        time.sleep(0.05)
+        self.token = "new-token"
+        self.expiry = datetime.datetime.utcnow() + datetime.timedelta(hours=1)
+    return refresh
+
+
+def test_token_file_is_read_once(tmp_path):
+    token_file = tmp_path / "token.json"
+    write_token(token_file, expires_in=3600)
+    provider = CredentialProvider(token_file=str(token_file))
+    first = provider.get()
+    assert provider.get() is first
+    assert provider.stats()["loads"] == 1
+    assert provider.stats()["hits"] == 1
+
+
+def test_single_flight_refresh_before_expiry(tmp_path, monkeypatch):
+    token_file = tmp_path / "token.json"
+    write_token(token_file, expires_in=60)
+    calls = []
+    monkeypatch.setattr(Credentials, "refresh", fake_refresh(calls))
+    provider = CredentialProvider(token_file=str(token_file), refresh_margin=300)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(provider.get())) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert len(calls) == 1
+    assert {creds.token for creds in results} == {"new-token"}
+    assert json.loads(token_file.read_text())["token"] == "new-token"
+    assert list(tmp_path.iterdir()) == [token_file]
+    assert provider.stats()["refreshes"] == 1
@@ -0,0 +1,62 @@
+import datetime
+
+import pytest
+
+from bookinggpt.dates import resolve_date, resolve_time
+
+SATURDAY = datetime.date(2026, 10, 17)
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("2026-10-23", datetime.date(2026, 10, 23)),
+    ("23/10", datetime.date(2026, 10, 23)),
+    ("5/1", datetime.date(2027, 1, 5)),
+    ("today", SATURDAY),
+    ("hôm nay", SATURDAY),
+    ("tomorrow", datetime.date(2026, 10, 18)),
+    ("mai", datetime.date(2026, 10, 18)),
+    ("sáng mai", datetime.date(2026, 10, 18)),
+    ("ngày mốt", datetime.date(2026, 10, 19)),
+    ("Saturday", SATURDAY),
+    ("Friday", datetime.date(2026, 10, 23)),
+    ("next Monday", datetime.date(2026, 10, 19)),
+    ("thứ Sáu", datetime.date(2026, 10, 23)),
+    ("thu 6", datetime.date(2026, 10, 23)),
+    ("chủ nhật", datetime.date(2026, 10, 18)),
+    ("thứ Hai tuần sau", datetime.date(2026, 10, 19)),
+])
+def test_resolve_date(text, expected):
+    assert resolve_date(text, SATURDAY) == expected
+
+
+def test_next_weekday_is_in_the_following_week():
+    wednesday = datetime.date(2026, 10, 21)
+    assert resolve_date("Friday", wednesday) == datetime.date(2026, 10, 23)
+    assert resolve_date("next Friday", wednesday) == datetime.date(2026, 10, 30)
+
+
+@pytest.mark.parametrize("text", ["whenever", "next week", "today or tomorrow", "31/2", ""])
+def test_unresolved_dates(text):
+    assert resolve_date(text, SATURDAY) is None
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("14:00", datetime.time(14)),
+    ("9:30", datetime.time(9, 30)),
+    ("2pm", datetime.time(14)),
+    ("2:30 p.m.", datetime.time(14, 30)),
+    ("12pm", datetime.time(12)),
+    ("14h30", datetime.time(14, 30)),
+    ("10 giờ", datetime.time(10)),
+    ("2 giờ chiều", datetime.time(14)),
+    ("9h rưỡi sáng", datetime.time(9, 30)),
+    ("1h trưa", datetime.time(13)),
+    ("7 giờ tối", datetime.time(19)),
+])
+def test_resolve_time(text, expected):
+    assert resolve_time(text) == expected
+
+
+@pytest.mark.parametrize("text", ["2", "2:00", "after lunch", "13pm", "25:00", "3h chiều hoặc 4h chiều"])
+def test_unresolved_times(text):
+    assert resolve_time(text) is None
@@ -0,0 +1,99 @@
+import datetime
+
+import pytest
+
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.gcal.mirror import EventMirror
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar, local_calendar_client
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from tests.conftest import TZ
+
+
+def event(start, minutes=60, summary="Booking"):
+    end = start + datetime.timedelta(minutes=minutes)
+    return {"summary": summary, "start": {"dateTime": start.isoformat()}, "end": {"dateTime": end.isoformat()}}
+
+
+def make_mirror(page_size=2, **kwargs):
+    calendar = InMemoryCalendar(page_size=page_size)
+    mirror = EventMirror(StaticCalendarClient(FakeCalendarService(calendar)), **kwargs)
+    return calendar, mirror
+
+
+def tomorrow_at(hour):
+    day = datetime.datetime.now(TZ).date() + datetime.timedelta(days=1)
+    return datetime.datetime.combine(day, datetime.time(hour), tzinfo=TZ)
+
+
+def test_bootstrap_reads_every_page():
+    calendar, mirror = make_mirror()
+    for hour in range(9, 14):
+        calendar.insert("primary", event(tomorrow_at(hour)))
+    mirror.sync()
+    assert len(mirror) == 5
+    assert mirror.stats()["pages"] == 3
+    assert mirror.busy_slots(tomorrow_at(10), tomorrow_at(12)) == [
+        (tomorrow_at(10), tomorrow_at(11)),
+        (tomorrow_at(11), tomorrow_at(12)),
+    ]
+
+
+def test_incremental_sync_applies_inserts_and_deletes(clock):
+    calendar, mirror = make_mirror(max_staleness=10, clock=clock)
+    first = calendar.insert("primary", event(tomorrow_at(9)))
+    mirror.sync()
+    calendar.delete("primary", first["id"])
+    calendar.insert("primary", event(tomorrow_at(15)))
+
+    # Still within max_staleness: served from memory without seeing the changes.
+    assert len(mirror.busy_slots(tomorrow_at(0), tomorrow_at(23))) == 1
+    requests = calendar.requests
+    clock.now = 11
+    busy = mirror.busy_slots(tomorrow_at(0), tomorrow_at(23))
+    assert busy == [(tomorrow_at(15), tomorrow_at(16))]
+    assert calendar.requests == requests + 1
+    assert mirror.stats()["incremental_syncs"] == 1
+
+
+def test_expired_sync_token_falls_back_to_full_sync():
+    calendar, mirror = make_mirror()
+    calendar.insert("primary", event(tomorrow_at(9)))
+    mirror.sync()
+    calendar.invalidate_sync_tokens()
+    calendar.insert("primary", event(tomorrow_at(11)))
+    mirror.sync()
+    assert len(mirror) == 2
+    assert mirror.stats()["expired_tokens"] == 1
+    assert mirror.stats()["full_syncs"] == 2
+
+
+def test_available_slots_tool_reads_the_mirror():
+    calendar, mirror = make_mirror()
+    calendar.insert("primary", event(tomorrow_at(10), minutes=120))
+    tool = AvailableSlotsTool(event_mirror=mirror)
+    slots = tool.get_available_slots(tomorrow_at(0))
+    tomorrow = tomorrow_at(0).date()
+    assert tomorrow_at(10) not in slots.get(tomorrow, [])
+    assert tomorrow_at(11) not in slots.get(tomorrow, [])
+    requests = calendar.requests
+    tool.get_available_slots(tomorrow_at(0))
+    assert calendar.requests == requests
+
+
+def test_mirror_backend_builds_one_mirror_from_the_tool_client():
+    calendar = InMemoryCalendar()
+    calendar.insert("primary", event(tomorrow_at(10)))
+    tool = AvailableSlotsTool(calendar_client=local_calendar_client(calendar), busy_backend="mirror")
+    assert tomorrow_at(10) not in tool.get_available_slots(tomorrow_at(0)).get(tomorrow_at(0).date(), [])
+    mirror = tool.event_mirror
+    assert mirror.calendar_id == "primary" and mirror.stats()["full_syncs"] == 1
+    tool.find_slots(tomorrow_at(0), count=1)
+    assert tool.event_mirror is mirror
+
+
+def test_mirror_must_cover_the_tool_calendars():
+    _, mirror = make_mirror()
+    with pytest.raises(ValueError, match="tracks calendar 'primary'"):
+        AvailableSlotsTool(event_mirror=mirror, calendar_ids=["primary", "stylist"])
+    with pytest.raises(ValueError, match="exactly one calendar"):
+        AvailableSlotsTool(busy_backend="mirror", calendar_ids=["primary", "stylist"])
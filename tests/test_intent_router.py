@@ -0,0 +1,54 @@
+import asyncio
+
+from bookinggpt.agent.router import IntentRouter
+from bookinggpt.availability.engine import AvailabilityEngine
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+
+
+def test_static_questions_are_answered_from_the_catalog():
+    router = IntentRouter()
+    services = router.route("What services do you offer?")
+    assert services.intent == "services" and "10. Manicure (30 minutes)" in services.answer
+    assert router.route("what are your hours").answer == "We're open from 9 AM to 6 PM, closed on Sunday 🕘"
+    engine = AvailabilityEngine()  # The hours given out are the hours slots are offered in.
+    assert (engine.open_time, engine.close_time, tuple(engine.closed_weekdays)) == (*router.hours, router.closed_weekdays)
+    assert router.route("How long does a haircut take?").answer.startswith("Hair cut takes about 30 minutes")
+    assert router.route("Do you do hair coloring?").answer.startswith("Yes! We do Hair coloring (60 minutes)")
+
+
+def test_vietnamese_questions_get_vietnamese_answers():
+    router = IntentRouter()
+    assert "9:00 đến 18:00, nghỉ Chủ nhật" in router.route("Mấy giờ salon mở cửa?").answer
+    assert "1. Hair wash (20 phút)" in router.route("dich vu cua salon co gi").answer
+    assert "tổng cộng khoảng 50 phút" in router.route("cắt tóc và gội đầu mất bao lâu").answer
+
+
+def test_booking_availability_and_cancel_go_to_the_agent():
+    router = IntentRouter()
+    for message in ("I want to book a haircut", "any free slots?", "Are you open on Sunday?", "hi",
+                    "Hủy lịch hẹn giúp mình", "đặt lịch cắt tóc", "What services do you have? Tomorrow 3pm ok?",
+                    "My number is 0901 234 567", "How much is a haircut?", "Có gì mới không?",
+                    "Salon có những gì hay ho?"):
+        assert not router.route(message).bypassed, message
+
+
+def test_routed_turns_skip_the_llm_but_stay_in_memory(make_agent):
+    llm = ScriptedChatModel(responses=["Hey there! 👋"])
+    agent = make_agent(llm, tools=[])
+    assert agent.call_agent("what services do you have?").startswith("Here's what we offer")
+    assert agent.call_agent("hi") == "Hey there! 👋"
+    assert llm.calls == 1
+    assert len(agent.sessions.get("default").messages()) == 4
+    stats = agent.router.stats()
+    assert (stats["routed"], stats["bypassed"], stats["bypass_rate"]) == (2, 1, 0.5)
+    assert stats["latency"]["faq"]["count"] == 1 and stats["latency"]["agent"]["count"] == 1
+
+
+def test_routed_answers_stream_as_one_token(make_agent):
+    llm = ScriptedChatModel(responses=["Hey there! 👋"])
+    agent = make_agent(llm, tools=[])
+    events = list(agent.stream_agent("what are your opening hours?"))
+    assert [event["type"] for event in events] == ["token", "end"]
+    assert events[0]["text"] == events[1]["output"] == "We're open from 9 AM to 6 PM, closed on Sunday 🕘"
+    assert asyncio.run(agent.acall_agent("how long is a facial?", session_id="s2")).startswith("Facial takes")
+    assert llm.calls == 0
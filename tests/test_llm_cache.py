@@ -0,0 +1,86 @@
+import uuid
+
+from langchain_core.messages import AIMessage
+
+from bookinggpt.cache import LLMResponseCache, MemoryTier, SQLiteTier, make_llm_cache, normalize_text
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.llm import LLMRegistry
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.testing.fake_llm import ScriptedChatModel, last_tool_observation
+from bookinggpt.tool.create_event import CalendarTool
+
+
+def test_normalize_text():
+    assert normalize_text("  What   SERVICES do you have?? ") == "what services do you have"
+
+
+def test_repeated_questions_are_answered_from_the_cache(make_agent):
+    cache = LLMResponseCache()
+    llm = ScriptedChatModel(responses=["We offer cuts, colour and more!"], latency=0.01, cache=cache)
+    agent = make_agent(llm, tools=[], router=False)
+    assert agent.call_agent("What services do you have?", session_id="a") == "We offer cuts, colour and more!"
+    assert agent.call_agent("what services do you have", session_id="b") == "We offer cuts, colour and more!"
+    assert llm.calls == 1
+    stats = cache.stats()
+    assert (stats["hits"], stats["misses"], stats["hit_ratio"]) == (1, 1, 0.5)
+    assert stats["saved_seconds"] >= 0.01
+
+
+def test_turns_with_side_effect_tools_are_not_cached(make_agent):
+    def responder(messages):
+        if last_tool_observation(messages) is not None:
+            return AIMessage(content="Booked! 🎉")
+        args = {"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+                "date": "2026-10-23", "start_time": "14:00"}
+        return AIMessage(content="", tool_calls=[{"name": "calendar_tool", "args": args,
+                                                  "id": f"call_{uuid.uuid4().hex[:8]}"}])
+
+    calendar = InMemoryCalendar()
+    tool = CalendarTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)),
+                        booking_index=BookingIndex(":memory:"))
+    cache = LLMResponseCache()
+    llm = ScriptedChatModel(responder=responder, cache=cache)
+    agent = make_agent(llm, [tool], router=False)
+    agent.call_agent("Book me a cut Friday 2pm", session_id="a")
+    agent.call_agent("Book me a cut Friday 2pm", session_id="b")
+    assert len(calendar.events) == 2
+    assert llm.calls == 4
+    assert cache.stats()["stored"] == 0
+    assert cache.stats()["bypassed"] == 2
+
+
+def test_memory_tier_is_lru_with_ttl(monkeypatch):
+    tier = MemoryTier(max_entries=2, ttl=10)
+    tier.put("a", ("A", 0.1))
+    tier.put("b", ("B", 0.1))
+    assert tier.get("a") == ("A", 0.1)
+    tier.put("c", ("C", 0.1))
+    assert tier.get("b") is None and len(tier) == 2
+    now = __import__("time").monotonic()
+    monkeypatch.setattr("bookinggpt.cache.time.monotonic", lambda: now + 11)
+    assert tier.get("a") is None
+
+
+def test_sqlite_tier_survives_restarts_and_fills_memory(tmp_path):
+    path = str(tmp_path / "llm_cache.sqlite3")
+    first = ScriptedChatModel(responses=["Open 9:00-18:00, Monday to Saturday."], cache=make_llm_cache(path))
+    first.invoke("What are your hours?")
+
+    cache = make_llm_cache(path)
+    second = ScriptedChatModel(responses=["Open 9:00-18:00, Monday to Saturday."], cache=cache)
+    assert second.invoke("what are your hours").content == "Open 9:00-18:00, Monday to Saturday."
+    assert second.calls == 0
+    assert cache.stats()["entries"] == [1, 1]
+    assert isinstance(cache.tiers[1], SQLiteTier)
+
+
+def test_registry_cache_applies_to_all_clients():
+    registry = LLMRegistry(providers={"google": lambda model, **params: ScriptedChatModel(responses=["hi"])})
+    before = registry.get("gemini-1.5-flash")
+    cache = LLMResponseCache()
+    registry.set_cache(cache)
+    assert before.cache is cache and registry.get("gemini-1.5-pro").cache is cache
+    before.invoke("hello")
+    before.invoke("Hello!")
+    assert registry.stats()["cache"]["hits"] == 1
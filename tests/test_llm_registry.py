@@ -0,0 +1,57 @@
+import pytest
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.gcal.client import StaticCalendarClient
+from bookinggpt.llm import LLMRegistry, get_llm_registry
+from bookinggpt.testing.fake_calendar import FakeCalendarService, InMemoryCalendar
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+from bookinggpt.tool.create_event import CalendarTool
+from bookinggpt.utils import AGENT_MODEL, EXTRACTION_MODEL
+
+
+def scripted(model, **params):
+    return ScriptedChatModel(responses=[f"{model} says hi"])
+
+
+def test_clients_are_shared_per_model_and_parameters():
+    registry = LLMRegistry(providers={"google": scripted})
+    first = registry.get("gemini-1.5-flash", temperature=0.3)
+    assert registry.get("gemini-1.5-flash", temperature=0.3) is first
+    assert registry.get("gemini-1.5-flash", temperature=0) is not first
+    assert registry.get("gemini-1.5-pro", temperature=0.3) is not first
+    assert (registry.stats()["builds"], registry.stats()["reuses"]) == (3, 1)
+
+
+def test_calls_are_counted_and_timed_per_model():
+    registry = LLMRegistry(providers={"google": scripted})
+    flash, pro = registry.get("gemini-1.5-flash"), registry.get("gemini-1.5-pro")
+    flash.invoke("hi")
+    flash.invoke("hi again")
+    assert pro.invoke("hi").content == "gemini-1.5-pro says hi"
+    models = registry.stats()["models"]
+    assert models["gemini-1.5-flash"]["calls"] == 2
+    assert models["gemini-1.5-flash"]["latency"]["count"] == 2
+    assert models["gemini-1.5-pro"]["calls"] == 1
+
+
+def test_registered_fake_is_served_and_provider_swap_drops_old_clients():
+    registry = LLMRegistry()
+    fake = registry.register("gemini-1.5-flash", ScriptedChatModel(), temperature=0.3)
+    assert registry.get("gemini-1.5-flash", temperature=0.3) is fake
+    registry.register_provider("google", scripted)
+    assert registry.get("gemini-1.5-flash", temperature=0.3) is not fake
+    with pytest.raises(ValueError):
+        registry.get("gpt", provider="unknown")
+
+
+def test_agent_and_tools_use_the_shared_registry(monkeypatch):
+    registry = LLMRegistry(providers={"google": scripted})
+    monkeypatch.setattr("bookinggpt.llm._registry", registry)
+    assert get_llm_registry() is registry
+    calendar = InMemoryCalendar()
+    tool = CalendarTool(calendar_client=StaticCalendarClient(FakeCalendarService(calendar)),
+                        booking_index=BookingIndex(":memory:"))
+    agent = BookingAgent(tools=[tool])
+    assert agent.llm is registry.get(AGENT_MODEL, temperature=0.3)
+    assert tool._extraction_chain().steps[1] is registry.get(EXTRACTION_MODEL, temperature=0)
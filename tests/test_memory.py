@@ -0,0 +1,42 @@
+from langchain_core.agents import AgentAction
+
+from bookinggpt.agent.memory import BudgetedSummaryMemory, make_memory_factory
+
+
+def run_turns(memory, turns, text="I would like to book a haircut for Friday afternoon please"):
+    for i in range(turns):
+        memory.save_context({"input": f"{i} {text}"}, {"output": f"{i} Sure thing! {text}"})
+
+
+def test_keeps_recent_turns_verbatim():
+    memory = BudgetedSummaryMemory(window_turns=2, max_token_limit=10_000)
+    run_turns(memory, 5)
+    messages = memory.chat_memory.messages
+    assert len(messages) == 4
+    assert messages[0].content.startswith("3 ")
+    assert "Customer: 0 " in memory.summary
+    assert memory.load_memory_variables({})["chat_history"][0].content.startswith("Summary")
+
+
+def test_history_stays_within_budget():
+    memory = BudgetedSummaryMemory(window_turns=4, max_token_limit=120)
+    for turns in range(1, 40):
+        run_turns(memory, 1, text="blah " * turns)
+        assert memory.history_tokens() <= 120
+
+
+def test_tool_observations_are_compacted():
+    memory = BudgetedSummaryMemory(observation_chars=20)
+    action = AgentAction(tool="available_slots_tool", tool_input={}, log="")
+    memory.save_context(
+        {"input": "any slots?"},
+        {"output": "We have 10 AM free!", "intermediate_steps": [(action, "Available slots " + "x" * 500)]},
+    )
+    stored = memory.chat_memory.messages[1].content
+    assert stored.startswith("[available_slots_tool: Available slots xxxx...]")
+    assert len(stored) < 100
+
+
+def test_memory_factory_modes():
+    assert isinstance(make_memory_factory("budgeted", max_token_limit=50)(), BudgetedSummaryMemory)
+    assert make_memory_factory("buffer")().memory_key == "chat_history"
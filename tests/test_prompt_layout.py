@@ -0,0 +1,86 @@
+from langchain_core.messages import AIMessage, HumanMessage, SystemMessage, ToolMessage
+from langchain_google_genai import ChatGoogleGenerativeAI
+
+from bookinggpt.agent.booking_agent import BookingAgent
+from bookinggpt.agent.context_cache import ContextCachedGemini, GeminiContextCache, PromptUsage
+from bookinggpt.agent.prompt import PROMPT_TEMPLATE, SYSTEM_PROMPT, prompt_history
+from bookinggpt.testing.fake_llm import ScriptedChatModel
+from bookinggpt.tool.create_event import CalendarTool
+
+SUMMARY = SystemMessage(content="Summary of the earlier conversation:\nLan wants a hair cut.")
+
+
+def format_turn(history, query="book it", scratchpad=()):
+    return PROMPT_TEMPLATE.format_messages(chat_history=prompt_history(history), input=query,
+                                           agent_scratchpad=list(scratchpad))
+
+
+def test_system_prompt_is_a_static_prefix():
+    first = format_turn([], "hi")
+    later = format_turn([SUMMARY, HumanMessage(content="hi"), AIMessage(content="Hey!")], "book it")
+    assert first[0] == later[0] == SystemMessage(content=SYSTEM_PROMPT)
+    assert [type(message) for message in later] == [SystemMessage, HumanMessage, AIMessage, HumanMessage]
+    assert later[1].content.startswith("Summary of the earlier conversation")
+
+
+def test_prompt_history_only_keeps_a_leading_system_message_for_gemini():
+    assert prompt_history([SUMMARY]) == [HumanMessage(content=SUMMARY.content)]
+    assert prompt_history("") == []
+    scratchpad = [AIMessage(content="", tool_calls=[{"name": "calendar_tool", "args": {}, "id": "call_1"}]),
+                  ToolMessage(content="Event created successfully.", tool_call_id="call_1")]
+    messages = format_turn([SUMMARY, HumanMessage(content="hi"), AIMessage(content="Hey!")], scratchpad=scratchpad)
+    llm = ChatGoogleGenerativeAI(model="gemini-1.5-flash", google_api_key="offline")
+    request = llm._prepare_request(messages, tools=[CalendarTool()])
+    assert request.system_instruction.parts[0].text == SYSTEM_PROMPT
+    assert [content.role for content in request.contents] == ["user", "model", "user", "model", "user"]
+
+
+def test_context_cache_replaces_the_prefix_with_a_reference():
+    created = []
+
+    def create(model, system_instruction, tools, ttl_seconds, api_key):
+        created.append(model)
+        return f"cachedContents/{len(created)}", 40_000
+
+    clock = [0.0]
+    cache = GeminiContextCache(ttl_seconds=600, min_tokens=100, create=create, clock=lambda: clock[0])
+    llm = ContextCachedGemini(model="gemini-1.5-flash-001", google_api_key="offline", context_cache=cache)
+    request = llm._prepare_request(format_turn([]), tools=[CalendarTool()])
+    assert request.cached_content == "cachedContents/1"
+    assert "system_instruction" not in request and not request.tools
+    assert [content.role for content in request.contents] == ["user"]
+
+    llm._prepare_request(format_turn([HumanMessage(content="hi"), AIMessage(content="Hey!")]), tools=[CalendarTool()])
+    assert created == ["models/gemini-1.5-flash-001"]
+    clock[0] = 590  # About to expire: renewed.
+    assert llm._prepare_request(format_turn([]), tools=[CalendarTool()]).cached_content == "cachedContents/2"
+    assert cache.stats()["cached_tokens"] == 40_000
+
+
+def test_small_prefix_is_sent_uncached_with_one_warning(capsys):
+    cache = GeminiContextCache(create=lambda *args: ("cachedContents/1", 0))
+    llm = ContextCachedGemini(model="gemini-1.5-flash-001", google_api_key="offline", context_cache=cache)
+    request = llm._prepare_request(format_turn([]), tools=[CalendarTool()])
+    assert not request.cached_content and request.system_instruction.parts[0].text == SYSTEM_PROMPT
+    llm._prepare_request(format_turn([]), tools=[CalendarTool()])
+    assert cache.stats()["too_small"] == 2
+    assert capsys.readouterr().out.count("context cache not used") == 1
+
+
+def test_turns_report_cached_and_uncached_input_tokens():
+    agent = BookingAgent(ScriptedChatModel(responses=["Hey there!"]), tools=[])
+    agent.verbose = False
+    agent.call_agent("hi", session_id="lan")
+    usage = agent.sessions.get("lan").last_usage
+    assert usage["llm_calls"] == 1
+    assert usage["input_tokens"] > usage["prefix_tokens"] > 0
+    assert usage["cached_input_tokens"] == 0 and usage["uncached_input_tokens"] == usage["input_tokens"]
+
+    class ActiveCache:
+        active, cached_tokens = True, 500
+
+    recorder = PromptUsage(context_cache=ActiveCache())
+    agent.usage_handler = lambda session: recorder
+    agent.call_agent("do you have parking?", session_id="lan")
+    assert recorder.summary()["cached_input_tokens"] == 500
+    assert agent.usage_stats()["turns"] == 2 and agent.usage_stats()["cached_input_tokens"] == 500
@@ -0,0 +1,92 @@
+import json
+
+import pytest
+from langchain_core.messages import HumanMessage
+
+from bookinggpt.gcal.booking_index import BookingIndex
+from bookinggpt.llm import LLMRegistry
+from bookinggpt.testing.fake_calendar import InMemoryCalendar, local_calendar_client
+from bookinggpt.testing.fake_llm import (
+    ReplayChatModel, ReplayMismatch, ScriptedChatModel, Tape, TapeRecorder, demo_responder, replay_provider,
+)
+from bookinggpt.tool.available_event import AvailableSlotsTool
+from bookinggpt.tool.create_event import CalendarTool
+from bookinggpt.utils import AGENT_MODEL, EXTRACTION_MODEL
+
+BOOKING = {"customer_name": "Lan", "customer_phone": "0901234567", "service": "Hair cut",
+           "date": "2026-10-19", "start_time": "10:00"}
+
+
+def booking_tools(llm, calendar):
+    client = local_calendar_client(calendar)
+    return [CalendarTool(calendar_client=client, booking_index=BookingIndex(":memory:"), extraction_llm=llm),
+            AvailableSlotsTool(calendar_client=client)]
+
+
+def test_recorded_conversation_replays_the_same_turns(tmp_path, make_agent):
+    recorder = TapeRecorder()
+    llm = ScriptedChatModel(responder=demo_responder, callbacks=[recorder])
+    recording = make_agent(llm, booking_tools(llm, InMemoryCalendar()))
+    replies = [recording.call_agent(message) for message in ("hi", "any free slots?")]
+    recorder.tape.save(str(tmp_path / "tape.json"))
+    assert [(exchange["step"], bool(exchange["tool_calls"])) for exchange in recorder.tape.exchanges] == [
+        (0, False), (0, True), (1, False),
+    ]
+
+    calendar = InMemoryCalendar()
+    replay = ReplayChatModel(tape=Tape.load(str(tmp_path / "tape.json")))
+    agent = make_agent(replay, booking_tools(replay, calendar))
+    assert [agent.call_agent(message, session_id="replay") for message in ("Hi", "Any free slots")] == replies
+    assert replay.calls == 3 and calendar.requests > 0  # The tool call ran against the calendar again.
+
+
+def test_tape_replays_tool_calls_in_order_and_cycles(make_agent):
+    tape = Tape([
+        {"input": "Yes, book it", "step": 0, "content": "", "tool_calls": [{"name": "calendar_tool", "args": BOOKING}]},
+        {"input": "yes, book it", "step": 1, "content": "Booked! 🎉"},
+    ])
+    calendar = InMemoryCalendar()
+    replay = ReplayChatModel(tape=tape)
+    agent = make_agent(replay, booking_tools(replay, calendar))
+    assert agent.call_agent("YES, book it!") == "Booked! 🎉"
+    assert agent.call_agent("yes, book it", session_id="again") == "Booked! 🎉"
+    assert len(calendar.events) == 2
+    with pytest.raises(ReplayMismatch):
+        agent.call_agent("something new")
+    assert Tape(fallback="Sorry?")([]).content == "Sorry?"
+
+
+def test_replay_latency_is_fixed_or_recorded():
+    tape = Tape([{"input": "hi", "content": "Hey!", "seconds": 0.8}])
+    message = tape([HumanMessage(content="hi")])
+    recorded = ReplayChatModel(tape=tape, recorded_latency=True, latency_scale=0.5)
+    assert recorded.response_latency(message) == 0.4
+    assert ReplayChatModel(tape=tape, latency=0.1).response_latency(message) == 0.1
+
+
+def test_replay_provider_serves_the_agent_and_extraction_models():
+    tape = Tape([{"input": "hi", "content": "Hey!"}])
+    registry = LLMRegistry(providers={"google": replay_provider(tape, latency=0.0)})
+    agent_model = registry.get(AGENT_MODEL, temperature=0.3)
+    assert isinstance(agent_model, ReplayChatModel)
+    assert registry.get(EXTRACTION_MODEL, temperature=0).tape is agent_model.tape
+    assert agent_model.invoke("hi").content == "Hey!"
+
+
+def test_extraction_calls_replay_although_the_prompt_has_the_current_time():
+    args = dict(BOOKING, date="the day after my birthday")  # Not readable by the date rules
+    extracted = json.dumps({"event_name": "Hair cut", "customer_name": "Lan", "customer_phone": "0901234567",
+                            "start_time": "10:00", "end_time": "10:30", "booking_code": None,
+                            "customer_service": "Hair cut", "date": "2026-10-19"})
+    recorder = TapeRecorder()
+    recording = CalendarTool(calendar_client=local_calendar_client(InMemoryCalendar()),
+                             booking_index=BookingIndex(":memory:"),
+                             extraction_llm=ScriptedChatModel(responses=[extracted], callbacks=[recorder]))
+    assert "successfully" in recording.run(args)
+    assert "Current time" not in recorder.tape.exchanges[0]["input"]
+
+    calendar = InMemoryCalendar()
+    replaying = CalendarTool(calendar_client=local_calendar_client(calendar), booking_index=BookingIndex(":memory:"),
+                             extraction_llm=ReplayChatModel(tape=Tape(recorder.tape.exchanges)))
+    assert "successfully" in replaying.run(args)
+    assert replaying.stats()["extraction"] == 1 and len(calendar.events) == 1
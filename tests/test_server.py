@@ -0,0 +1,76 @@
+import asyncio
+import json
+
+import pytest
+from fastapi.testclient import TestClient
+
+from bookinggpt.server import Overloaded, TurnLimiter, build_local_agent, create_app
+
+
+def test_chat_and_health():
+    app = create_app(build_local_agent())
+    with TestClient(app) as client:
+        response = client.post("/chat", json={"session_id": "alice", "message": "hi"})
+        assert response.status_code == 200
+        assert response.json()["reply"].startswith("Hey there")
+
+        response = client.post("/chat", json={"session_id": "alice", "message": "any free slots?"})
+        assert "calendar" in response.json()["reply"]
+
+        health = client.get("/health").json()
+        assert health["status"] == "ok"
+        assert health["turns"]["completed"] == 2
+        assert health["sessions"]["sessions"] == 1
+
+
+def test_websocket_routes_to_session():
+    app = create_app(build_local_agent())
+    with TestClient(app) as client:
+        with client.websocket_connect("/ws/bob") as websocket:
+            websocket.send_text("hello")
+            events = [websocket.receive_json()]
+            while events[-1]["type"] != "end":
+                events.append(websocket.receive_json())
+        assert events[0]["type"] == "token"
+        assert "".join(event["text"] for event in events[:-1]) == events[-1]["output"]
+        assert app.state.agent.sessions.get("bob").turns == 1
+
+
+def test_http_stream_reports_time_to_first_token():
+    app = create_app(build_local_agent())
+    with TestClient(app) as client:
+        response = client.post("/chat/stream", json={"session_id": "carol", "message": "any free slots?"})
+        events = [json.loads(line) for line in response.text.splitlines()]
+    assert [event["type"] for event in events[:2]] == ["tool_start", "tool_end"]
+    assert events[-1]["type"] == "end"
+    assert events[-1]["ttft_seconds"] is not None
+    assert client.app.state.agent.metrics.summary()["time_to_first_token"]["count"] == 1
+
+
+def test_limiter_rejects_when_saturated():
+    async def run():
+        limiter = TurnLimiter(max_concurrency=1, max_queue=0, queue_timeout=0.5)
+        release = asyncio.Event()
+
+        async def hold():
+            async with limiter.slot():
+                await release.wait()
+
+        holder = asyncio.create_task(hold())
+        await asyncio.sleep(0.01)
+        with pytest.raises(Overloaded):
+            async with limiter.slot():
+                pass
+        assert limiter.stats()["rejected"] == 1
+
+        drained = asyncio.create_task(limiter.drain(timeout=1))
+        await asyncio.sleep(0.01)
+        assert not drained.done()
+        release.set()
+        assert await drained
+        await holder
+        with pytest.raises(Overloaded):
+            async with limiter.slot():
+                pass
+
+    asyncio.run(run())
@@ -0,0 +1,49 @@
+from bookinggpt.agent.session import SessionStore
+
+
+def add_turn(store, session_id, text="hello"):
+    session = store.get(session_id)
+    session.memory.save_context({"input": text}, {"output": text})
+    store.record_turn(session)
+    return session
+
+
+def test_sessions_are_isolated():
+    store = SessionStore()
+    add_turn(store, "a", "first")
+    add_turn(store, "b", "second")
+    assert store.get("a").messages()[0].content == "first"
+    assert store.get("b").messages()[0].content == "second"
+    assert store.get("a").turns == 1
+
+
+def test_lru_eviction():
+    store = SessionStore(max_sessions=2)
+    store.get("a")
+    store.get("b")
+    store.get("a")
+    store.get("c")
+    assert "b" not in store
+    assert "a" in store and "c" in store
+    assert store.stats()["evictions"]["lru"] == 1
+
+
+def test_ttl_eviction(clock):
+    store = SessionStore(ttl_seconds=60, clock=clock)
+    store.get("a")
+    clock.now = 30
+    store.get("b")
+    clock.now = 70
+    assert store.evict_expired() == 1
+    assert "a" not in store and "b" in store
+    assert store.stats()["evictions"]["ttl"] == 1
+
+
+def test_memory_cap_eviction():
+    store = SessionStore(max_memory_bytes=5_000)
+    add_turn(store, "a", "x" * 2_000)
+    add_turn(store, "b", "y" * 2_000)
+    assert "a" not in store
+    assert store.stats()["evictions"]["memory"] == 1
+    assert store.stats()["memory_bytes"] == store.get("b").memory_bytes
+    assert store.session_stats()["b"]["memory_bytes"] > 4_000